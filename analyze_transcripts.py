@@ -11,14 +11,16 @@ import json
 import os
 import re
 import sys
-import time
 import zipfile
 from datetime import datetime
 from pathlib import Path
 
 from docx import Document
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from src.realtime.gatekeeper import Priority, get_gatekeeper
+from src.realtime.http_clients import get_openai_client
+from src.realtime.token_budget import estimate_tokens
 
 load_dotenv()
 
@@ -29,12 +31,14 @@ OUTPUT_DIR = Path("knowledge_base")
 FULL_ANALYSIS_PATH = OUTPUT_DIR / "full_transcript_analysis.json"
 INSIGHTS_PATH = OUTPUT_DIR / "closing_patterns.md"
 
-# GitHub gpt-4o-mini
-client = OpenAI(
+# GitHub gpt-4o-mini (pooled keep-alive client shared with the rest of the process)
+client = get_openai_client(
     base_url="https://models.github.ai/inference",
-    api_key=os.getenv("GITHUB_TOKEN"),
+    api_key=os.getenv("GITHUB_TOKEN") or "",
 )
 MODEL = os.getenv("GITHUB_MODEL", "gpt-4o-mini")
+# Shared rate limiter: GitHub free tier allows ~15 req/min (override with LLM_RATE_LIMIT_GITHUB_RPM)
+gatekeeper = get_gatekeeper("github")
 
 # ── Known closes from transcript_analysis.json (to seed outcome data) ─────────
 KNOWN_CLOSES = {
@@ -144,6 +148,8 @@ Return ONLY valid JSON."""
     user = f"Prospect: {prospect_name}\nDate: {date}\n\n{content}"
 
     try:
+        estimated_tokens = estimate_tokens(system) + estimate_tokens(user) + 1200
+        gatekeeper.acquire(Priority.BATCH, tokens=estimated_tokens)
         resp = client.chat.completions.create(
             model=MODEL,
             messages=[
@@ -153,6 +159,8 @@ Return ONLY valid JSON."""
             max_tokens=1200,
             temperature=0.1,
         )
+        if resp.usage:
+            gatekeeper.record_usage(estimated_tokens, resp.usage.total_tokens)
         raw = resp.choices[0].message.content or ""
         # Strip markdown fences
         raw = re.sub(r"```json\s*", "", raw)
@@ -419,9 +427,6 @@ def main():
                     "calls": sorted(analyses, key=lambda x: x.get("date", ""), reverse=True),
                 }, f, indent=2)
 
-            # Rate limit: GitHub gpt-4o-mini allows ~15 req/min on free tier
-            time.sleep(4.5)
-
         except Exception as e:
             print(f" → FAIL: {e}")
             error_count += 1
@@ -0,0 +1,222 @@
+"""
+Packed, memory-mappable knowledge base artifact.
+
+``python src/rag/build.py`` writes one file holding everything the RAG
+layer needs at startup: the chunk texts and metadata of each collection,
+their embedding matrix, the embedding model id, and a checksum record
+(SHA-256, size, mtime) for every knowledge base source file. Opening it
+reads a small JSON header and memory-maps the matrix, so cold start skips
+chunking, store loading and the full-file hashing of the integrity check,
+and every worker process shares the same page-cache pages.
+
+Layout (little endian):
+
+    magic    8 bytes   b"SRAGPACK"
+    version  uint32    ARTIFACT_VERSION
+    reserved uint32
+    length   uint64    header size in bytes
+    header   JSON      model, dim, rows, matrix offset, sources, collections
+    padding            up to a 64-byte boundary
+    matrix   float32   (rows, dim), C order; collections are row ranges
+
+A source is current when its size and mtime match the record; only a file
+whose stat changed is rehashed and compared with the recorded checksum.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .embeddings import DEFAULT_EMBEDDING_MODEL
+from .integrity import _checksum_from_stat, _compute_file_checksum
+
+logger = logging.getLogger(__name__)
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+ARTIFACT_PATH = os.getenv("RAG_ARTIFACT_PATH", os.path.join(_ROOT, "data", "knowledge_base.ragpack"))
+ARTIFACT_VERSION = 1
+
+_MAGIC = b"SRAGPACK"
+_PREFIX = struct.Struct("<8sIIQ")
+_ALIGNMENT = 64
+
+
+def knowledge_base_files(kb_dir: str | Path, *extra: str | Path) -> list[Path]:
+    """The source files an artifact records: ``*.md``/``*.txt`` in ``kb_dir`` plus any ``extra`` paths."""
+    kb_dir = Path(kb_dir)
+    files = {path.resolve(): path for path in sorted(kb_dir.glob("*.md")) + sorted(kb_dir.glob("*.txt"))}
+    for path in map(Path, extra):
+        if path.exists():
+            files.setdefault(path.resolve(), path)
+    return list(files.values())
+
+
+def source_record(path: Path) -> dict:
+    stat = path.stat()
+    return {"sha256": _compute_file_checksum(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def checksum_from_record(path: Path, record: Optional[dict]) -> str:
+    """The file's SHA-256, taken from ``record`` when size and mtime still match, else recomputed."""
+    return _checksum_from_stat(path, record) or _compute_file_checksum(path)
+
+
+@dataclass
+class ArtifactCollection:
+    """One collection's rows of the shared matrix, with their chunks."""
+
+    name: str
+    ids: list[str]
+    documents: list[str]
+    metadatas: list[dict]
+    matrix: np.ndarray
+
+    @property
+    def chunks(self) -> list[dict]:
+        return [
+            {"id": chunk_id, "text": text, "metadata": dict(metadata)}
+            for chunk_id, text, metadata in zip(self.ids, self.documents, self.metadatas)
+        ]
+
+
+class KnowledgeBaseArtifact:
+    """An opened artifact: parsed header plus the memory-mapped embedding matrix."""
+
+    def __init__(self, path: str, header: dict, matrix: np.ndarray) -> None:
+        self.path = path
+        self.header = header
+        self.matrix = matrix
+        self.embedding_model: str = header["embedding_model"]
+        self.sources: dict[str, dict] = header["sources"]
+        self.collections: dict[str, ArtifactCollection] = {
+            name: ArtifactCollection(
+                name,
+                entry["ids"],
+                entry["documents"],
+                entry["metadatas"],
+                matrix[entry["start"] : entry["stop"]],
+            )
+            for name, entry in header["collections"].items()
+        }
+
+    @classmethod
+    def open(cls, path: str = ARTIFACT_PATH) -> "KnowledgeBaseArtifact":
+        """Read the header and map the matrix read-only. Raises ``ValueError`` for a foreign or other-version file."""
+        header = read_header(path)
+        rows, dim = header["rows"], header["dim"]
+        if rows and dim:
+            matrix = np.memmap(path, dtype="<f4", mode="r", offset=header["matrix_offset"], shape=(rows, dim))
+        else:
+            matrix = np.zeros((0, dim), dtype=np.float32)
+        return cls(path, header, matrix)
+
+    def stale_sources(self, files: list[Path]) -> list[str]:
+        """Why the artifact no longer matches ``files`` (added, missing or changed sources); empty if current."""
+        current = {path.name: path for path in files}
+        problems = [f"{name} is new" for name in sorted(current.keys() - self.sources.keys())]
+        problems += [f"{name} is missing" for name in sorted(self.sources.keys() - current.keys())]
+        for name in sorted(current.keys() & self.sources.keys()):
+            if checksum_from_record(current[name], self.sources[name]) != self.sources[name]["sha256"]:
+                problems.append(f"{name} changed")
+        return problems
+
+
+def read_header(path: str) -> dict:
+    """Just the JSON header (sources, collections, model) without touching the matrix."""
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size:
+            raise ValueError(f"{path} is not a knowledge base artifact")
+        magic, version, _, length = _PREFIX.unpack(prefix)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a knowledge base artifact")
+        if version != ARTIFACT_VERSION:
+            raise ValueError(f"{path} is artifact version {version}, expected {ARTIFACT_VERSION} (rebuild it)")
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+def load_source_records(path: str = ARTIFACT_PATH) -> dict[str, dict]:
+    """Recorded source checksums of the artifact at ``path``; empty if there is no readable artifact."""
+    try:
+        return read_header(path)["sources"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def write_artifact(
+    path: str,
+    collections: dict[str, dict],
+    sources: list[Path],
+    embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+) -> dict:
+    """Pack collections and source checksums into one artifact, atomically replacing ``path``.
+
+    Args:
+        collections: name → ``{"chunks": [...], "matrix": (n, dim) array}``, rows in chunk order.
+        sources: Knowledge base files to record checksums for.
+        embedding_model: Model id the matrix was embedded with.
+
+    Returns:
+        The header that was written.
+    """
+    blocks, entries, start, dim = [], {}, 0, 0
+    for name, collection in collections.items():
+        chunks = collection["chunks"]
+        matrix = np.ascontiguousarray(collection["matrix"], dtype="<f4")
+        if matrix.shape[0] != len(chunks):
+            raise ValueError(f"{name}: {matrix.shape[0]} embedding rows for {len(chunks)} chunks")
+        if matrix.size:
+            if dim and matrix.shape[1] != dim:
+                raise ValueError(f"{name}: embedding dim {matrix.shape[1]} differs from {dim}")
+            dim = matrix.shape[1]
+            blocks.append(matrix)
+        entries[name] = {
+            "start": start,
+            "stop": start + len(chunks),
+            "ids": [chunk["id"] for chunk in chunks],
+            "documents": [chunk["text"] for chunk in chunks],
+            "metadatas": [dict(chunk.get("metadata") or {}) for chunk in chunks],
+        }
+        start += len(chunks)
+
+    header = {
+        "version": ARTIFACT_VERSION,
+        "embedding_model": embedding_model,
+        "built_at": time.time(),
+        "rows": start,
+        "dim": dim,
+        "matrix_offset": 0,
+        "sources": {path.name: source_record(path) for path in sources},
+        "collections": entries,
+    }
+    # The offset is part of the header, so size the header with room for the offset's digits
+    encoded = b""
+    for _ in range(3):
+        encoded = json.dumps(header).encode("utf-8")
+        offset = -(-(_PREFIX.size + len(encoded)) // _ALIGNMENT) * _ALIGNMENT
+        if header["matrix_offset"] == offset:
+            break
+        header["matrix_offset"] = offset
+    encoded = json.dumps(header).encode("utf-8")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(_MAGIC, ARTIFACT_VERSION, 0, len(encoded)))
+        f.write(encoded)
+        f.write(b"\0" * (header["matrix_offset"] - _PREFIX.size - len(encoded)))
+        for block in blocks:
+            f.write(block.tobytes())
+    # Readers that already mapped the old file keep its inode; new readers see the new one
+    os.replace(tmp, path)
+    logger.info(f"RAG: Wrote knowledge base artifact {path} ({start} chunks, {len(sources)} sources)")
+    return header
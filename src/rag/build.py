@@ -6,14 +6,27 @@ Run this once after changing the sales script, like a database migration.
 The app will load the pre-built embeddings from disk instead of
 re-embedding on every startup.
 
+Builds are incremental: each collection has a manifest
+(``<collection>.manifest.json`` in the store directory) recording the
+embedding model and a content hash per chunk id. Only new or changed
+chunks are embedded, removed ids are deleted, and unchanged chunks are
+left alone. A different embedding model rebuilds the collection.
+
+With the numpy backend the build also writes the packed knowledge base
+artifact (``rag/artifact.py``) the app memory-maps at startup.
+
 Usage:
-    python src/rag/build.py              # Build embeddings
-    python src/rag/build.py --force      # Rebuild from scratch
+    python src/rag/build.py                    # Build embeddings (RAG_VECTOR_BACKEND, default numpy)
+    python src/rag/build.py --force            # Rebuild from scratch
+    python src/rag/build.py --backend chroma   # Build the ChromaDB store instead
+    python src/rag/build.py --artifact PATH    # Write the packed artifact elsewhere (numpy backend)
     python -m rag.build                  # If src/ is in PYTHONPATH
 """
 # ruff: noqa: E402
 
 import argparse
+import hashlib
+import json
 import os
 import shutil
 import sys
@@ -24,8 +37,10 @@ src_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
+from rag.artifact import ARTIFACT_PATH, KnowledgeBaseArtifact, knowledge_base_files, write_artifact
 from rag.chunker import chunk_methodology, chunk_script
-from rag.store import EmbeddingStore
+from rag.embeddings import DEFAULT_EMBEDDING_MODEL
+from rag.pipeline import VECTOR_BACKENDS, default_persist_dir, get_store_class, get_vector_backend
 
 # Default paths
 SCRIPT_PATH = os.path.normpath(
@@ -34,39 +49,156 @@ SCRIPT_PATH = os.path.normpath(
 METHODOLOGY_PATH = os.path.normpath(
     os.path.join(os.path.dirname(__file__), "..", "..", "knowledge_base", "hardly_selling_methodology.md")
 )
-PERSIST_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "chromadb"))
 
 
-def _sync_collection(store: EmbeddingStore, chunks: list[dict], collection_name: str, force: bool) -> bool:
-    """Ensure one collection contains exactly the chunk count expected."""
-    existing = store.count()
-    if existing > 0 and not force:
-        if existing == len(chunks):
-            print(f"         {collection_name} already has {existing} chunks (up to date)")
-            return False
-        print(f"         {collection_name} has {existing} chunks but source has {len(chunks)} — rebuilding...")
+def chunk_fingerprint(chunk: dict) -> str:
+    """Content hash of a chunk: text and metadata, independent of key order."""
+    payload = json.dumps({"text": chunk["text"], "metadata": chunk.get("metadata") or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def manifest_path(persist_dir: str, collection_name: str) -> str:
+    return os.path.join(persist_dir, f"{collection_name}.manifest.json")
+
+
+def load_manifest(persist_dir: str, collection_name: str) -> dict | None:
+    """The last build's manifest for a collection, or None if missing or unreadable."""
+    try:
+        with open(manifest_path(persist_dir, collection_name), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest.get("chunks"), dict) else None
+
+
+def save_manifest(persist_dir: str, collection_name: str, embedding_model: str, chunks: list[dict]) -> None:
+    path = manifest_path(persist_dir, collection_name)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "collection": collection_name,
+                "embedding_model": embedding_model,
+                "chunks": {chunk["id"]: chunk_fingerprint(chunk) for chunk in chunks},
+            },
+            f,
+            indent=1,
+            sort_keys=True,
+        )
+    os.replace(path + ".tmp", path)
+
+
+def _clear_collection(store, collection_name: str) -> None:
+    if hasattr(store, "clear"):
+        store.clear()
+    else:
         store._client.delete_collection(collection_name)
         store._collection = store._client.get_or_create_collection(
             name=collection_name,
             embedding_function=store._embedding_fn,
         )
 
-    store.add_chunks(chunks)
+
+def _open_store(store_cls, collection_name: str, persist_dir: str):
+    try:
+        return store_cls(collection_name=collection_name, persist_dir=persist_dir)
+    except ValueError as e:
+        # The NumPy store refuses vectors from another embedding model; drop them and start over
+        print(f"         {e} — rebuilding {collection_name}")
+        for name in os.listdir(persist_dir):
+            if name.startswith(f"{collection_name}."):
+                os.remove(os.path.join(persist_dir, name))
+        return store_cls(collection_name=collection_name, persist_dir=persist_dir)
+
+
+def _sync_collection(store, chunks: list[dict], collection_name: str, force: bool, persist_dir: str) -> bool:
+    """Bring one collection in line with the source chunks; returns True if anything changed.
+
+    Diffs the chunks against the collection's manifest: new and changed
+    chunks are embedded, ids no longer in the source are deleted. Without
+    a usable manifest (first build, older store, another embedding model)
+    or with ``force``, the collection is rebuilt from scratch.
+    """
+    embedding_model = getattr(store, "embedding_key", DEFAULT_EMBEDDING_MODEL)
+    manifest = None if force else load_manifest(persist_dir, collection_name)
+    existing = store.count()
+
+    if manifest is not None and manifest.get("embedding_model") != embedding_model:
+        print(f"         {collection_name} was built with {manifest.get('embedding_model')} — rebuilding...")
+        manifest = None
+    elif manifest is not None and existing != len(manifest["chunks"]):
+        print(
+            f"         {collection_name} has {existing} chunks but its manifest lists {len(manifest['chunks'])} — rebuilding..."
+        )
+        manifest = None
+
+    if manifest is None:
+        if existing > 0:
+            if not force:
+                print(f"         {collection_name} has no usable build manifest — rebuilding...")
+            _clear_collection(store, collection_name)
+        store.add_chunks(chunks)
+        save_manifest(persist_dir, collection_name, embedding_model, chunks)
+        return True
+
+    built = manifest["chunks"]
+    source_ids = {chunk["id"] for chunk in chunks}
+    upserts = [chunk for chunk in chunks if built.get(chunk["id"]) != chunk_fingerprint(chunk)]
+    removed = [chunk_id for chunk_id in built if chunk_id not in source_ids]
+    if not upserts and not removed:
+        print(f"         {collection_name} already has {existing} chunks (up to date)")
+        return False
+
+    added = sum(1 for chunk in upserts if chunk["id"] not in built)
+    print(
+        f"         {collection_name}: {added} new, {len(upserts) - added} changed, {len(removed)} removed, "
+        f"{len(chunks) - len(upserts)} unchanged"
+    )
+    if removed:
+        store.delete(removed)
+    store.add_chunks(upserts)
+    save_manifest(persist_dir, collection_name, embedding_model, chunks)
+    return True
+
+
+def _sync_artifact(artifact_path: str, collections: dict[str, tuple], sources: list, changed: bool) -> bool:
+    """Rewrite the packed artifact if the stores changed or it no longer matches the sources."""
+    if not changed:
+        try:
+            stale = KnowledgeBaseArtifact.open(artifact_path).stale_sources(sources)
+        except (OSError, ValueError, KeyError) as e:
+            stale = [str(e)]
+        if not stale:
+            return False
+        print(f"         Artifact out of date ({'; '.join(stale)})")
+    write_artifact(
+        artifact_path,
+        {
+            name: {"chunks": chunks, "matrix": store.vectors_for([c["id"] for c in chunks])}
+            for name, (store, chunks) in collections.items()
+        },
+        sources,
+    )
+    print(f"         Packed {sum(len(chunks) for _, chunks in collections.values())} chunks into {artifact_path}")
     return True
 
 
 def build(
     script_path: str = SCRIPT_PATH,
     methodology_path: str = METHODOLOGY_PATH,
-    persist_dir: str = PERSIST_DIR,
+    persist_dir: str | None = None,
     force: bool = False,
+    backend: str | None = None,
+    artifact_path: str = ARTIFACT_PATH,
 ):
     """Chunk the sales script and Hardly Selling methodology, embed, and persist."""
+    backend = backend or get_vector_backend()
+    persist_dir = persist_dir or default_persist_dir(backend)
+    store_cls = get_store_class(backend)
     print("RAG Embedding Builder")
     print(f"{'=' * 50}")
     print(f"  Script:       {script_path}")
     print(f"  Methodology:  {methodology_path}")
-    print(f"  Store:        {persist_dir}")
+    print(f"  Store:        {persist_dir} ({backend})")
     print()
 
     # Force rebuild: wipe existing store
@@ -93,27 +225,34 @@ def build(
     # Embed + persist
     print("  [2/3] Embedding and persisting...")
     start = time.time()
-    store = EmbeddingStore(collection_name="sales_script", persist_dir=persist_dir)
-    changed = _sync_collection(store, chunks, "sales_script", force=force)
+    store = _open_store(store_cls, "sales_script", persist_dir)
+    changed = _sync_collection(store, chunks, "sales_script", force=force, persist_dir=persist_dir)
     methodology_store = None
     if methodology_chunks:
-        methodology_store = EmbeddingStore(collection_name="hardly_selling_methodology", persist_dir=persist_dir)
+        methodology_store = _open_store(store_cls, "hardly_selling_methodology", persist_dir)
         changed = (
             _sync_collection(
                 methodology_store,
                 methodology_chunks,
                 "hardly_selling_methodology",
                 force=force,
+                persist_dir=persist_dir,
             )
             or changed
         )
+    if backend == "numpy":
+        collections = {"sales_script": (store, chunks)}
+        if methodology_store is not None:
+            collections["hardly_selling_methodology"] = (methodology_store, methodology_chunks)
+        sources = knowledge_base_files(os.path.dirname(script_path), script_path, methodology_path)
+        changed = _sync_artifact(artifact_path, collections, sources, changed or force) or changed
 
     if not changed:
         print("         Use --force to rebuild from scratch")
         print("\n  Done (no changes needed)")
         return
     total_chunks = store.count() + (methodology_store.count() if methodology_store else 0)
-    print(f"         {total_chunks} chunks embedded in {time.time() - start:.1f}s")
+    print(f"         {total_chunks} chunks stored, synced in {time.time() - start:.3f}s")
 
     # Verify
     print("  [3/3] Verifying...")
@@ -138,10 +277,19 @@ def main():
     parser.add_argument("--force", action="store_true", help="Rebuild from scratch")
     parser.add_argument("--script", default=SCRIPT_PATH, help="Path to sales script")
     parser.add_argument("--methodology", default=METHODOLOGY_PATH, help="Path to Hardly Selling methodology source")
-    parser.add_argument("--output", default=PERSIST_DIR, help="ChromaDB persist directory")
+    parser.add_argument("--backend", choices=VECTOR_BACKENDS, help="Vector backend (default: RAG_VECTOR_BACKEND)")
+    parser.add_argument("--output", help="Persist directory (default: data/vectors or data/chromadb)")
+    parser.add_argument("--artifact", default=ARTIFACT_PATH, help="Packed artifact path (numpy backend)")
     args = parser.parse_args()
 
-    build(script_path=args.script, methodology_path=args.methodology, persist_dir=args.output, force=args.force)
+    build(
+        script_path=args.script,
+        methodology_path=args.methodology,
+        persist_dir=args.output,
+        force=args.force,
+        backend=args.backend,
+        artifact_path=args.artifact,
+    )
 
 
 if __name__ == "__main__":
@@ -325,33 +325,105 @@ def chunk_methodology(methodology_path: str) -> list[dict]:
     return chunks
 
 
-def get_chunk_by_id(chunks: list[dict], chunk_id: str) -> dict | None:
+def _part_number(chunk: dict) -> int | None:
+    return chunk.get("metadata", {}).get("part_number")
+
+
+class ChunkCatalog:
+    """Chunks with lookup indexes, built once when the knowledge base is chunked.
+
+    Indexes by id, ``part_number``, ``type`` and ``source``, the objection
+    chunks, and an adjacency table (part → chunks of the parts within
+    ``window``) for each window in ``windows``, so retrieval's deterministic
+    branch is a dictionary lookup instead of a scan. Every list keeps the
+    original chunk order. Read-only once built; safe to share across sessions.
+    """
+
+    def __init__(self, chunks: list[dict], windows: tuple[int, ...] = (1,)) -> None:
+        self.chunks = list(chunks)
+        self.by_id: dict[str, dict] = {}
+        self.by_part: dict[int, list[dict]] = {}
+        self.by_type: dict[str, list[dict]] = {}
+        self.by_source: dict[str, list[dict]] = {}
+        for chunk in self.chunks:
+            metadata = chunk.get("metadata", {})
+            self.by_id.setdefault(chunk["id"], chunk)
+            if metadata.get("part_number") is not None:
+                self.by_part.setdefault(metadata["part_number"], []).append(chunk)
+            if metadata.get("type"):
+                self.by_type.setdefault(metadata["type"], []).append(chunk)
+            if metadata.get("source"):
+                self.by_source.setdefault(metadata["source"], []).append(chunk)
+        self.objection_chunks = [
+            chunk for chunk in self.chunks if "objection" in chunk.get("metadata", {}).get("section", "").lower()
+        ]
+        # (window, source) -> part -> chunks; source None covers every source
+        self._adjacency: dict[tuple[int, str | None], dict[int, list[dict]]] = {}
+        for window in windows:
+            for source in (None, *self.by_source):
+                self._adjacency[(window, source)] = self._build_adjacency(window, source)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def get(self, chunk_id: str) -> dict | None:
+        return self.by_id.get(chunk_id)
+
+    def adjacent(self, part_number: int, window: int = 1, source: str | None = None) -> list[dict]:
+        """Chunks whose part_number is within ``window`` of ``part_number`` (optionally from one source)."""
+        table = self._adjacency.get((window, source))
+        if table is None:
+            # Window not precomputed: build it once and keep it
+            table = self._adjacency[(window, source)] = self._build_adjacency(window, source)
+        if part_number in table:
+            return table[part_number]
+        chunks = self.by_source.get(source, []) if source is not None else self.chunks
+        return self._chunks_in_range(chunks, part_number - window, part_number + window)
+
+    def _build_adjacency(self, window: int, source: str | None) -> dict[int, list[dict]]:
+        chunks = self.by_source.get(source, []) if source is not None else self.chunks
+        parts = {_part_number(chunk) for chunk in chunks} - {None}
+        return {part: self._chunks_in_range(chunks, part - window, part + window) for part in parts}
+
+    @staticmethod
+    def _chunks_in_range(chunks: list[dict], low: int, high: int) -> list[dict]:
+        return [chunk for chunk in chunks if _part_number(chunk) is not None and low <= _part_number(chunk) <= high]
+
+
+def get_chunk_by_id(chunks: list[dict] | ChunkCatalog, chunk_id: str) -> dict | None:
     """Get a specific chunk by its ID.
 
     Args:
-        chunks: List of chunk dicts from chunk_script().
+        chunks: List of chunk dicts from chunk_script(), or a ChunkCatalog (indexed lookup).
         chunk_id: The chunk identifier to search for.
 
     Returns:
         The matching chunk dict, or None if not found.
     """
+    if isinstance(chunks, ChunkCatalog):
+        return chunks.get(chunk_id)
     for chunk in chunks:
         if chunk["id"] == chunk_id:
             return chunk
     return None
 
 
-def get_adjacent_chunks(chunks: list[dict], part_number: int, window: int = 1) -> list[dict]:
+def get_adjacent_chunks(chunks: list[dict] | ChunkCatalog, part_number: int, window: int = 1) -> list[dict]:
     """Get chunks for current part +/- window adjacent parts.
 
     Args:
-        chunks: List of chunk dicts from chunk_script().
+        chunks: List of chunk dicts from chunk_script(), or a ChunkCatalog (precomputed lookup).
         part_number: The center part number (1-12).
         window: Number of adjacent parts to include on each side.
 
     Returns:
         List of chunks whose part_number falls within [part_number - window, part_number + window].
     """
+    if isinstance(chunks, ChunkCatalog):
+        return list(chunks.adjacent(part_number, window))
     low = part_number - window
     high = part_number + window
     return [
@@ -361,6 +433,39 @@ def get_adjacent_chunks(chunks: list[dict], part_number: int, window: int = 1) -
     ]
 
 
+def extract_rebuttal(chunk_text: str, max_chars: int = 280) -> str:
+    """Pull the rep's verbatim line out of an objection chunk.
+
+    Prefers the first quoted line (the script writes rebuttals as quotes);
+    otherwise falls back to the first content line below the #### header,
+    with list markers and bold labels stripped.
+
+    Args:
+        chunk_text: Text of an ``objection_*`` chunk from chunk_script().
+        max_chars: Truncate longer rebuttals at a word boundary.
+
+    Returns:
+        The rebuttal text, or "" if the chunk has no usable content.
+    """
+    body = "\n".join(line for line in chunk_text.splitlines() if not line.lstrip().startswith("#"))
+
+    quoted = re.search(r"[\"“]([^\"”\n]{15,})[\"”]", body)
+    if quoted:
+        rebuttal = quoted.group(1).strip()
+    else:
+        rebuttal = ""
+        for line in body.splitlines():
+            line = re.sub(r"^\s*(?:[-*>]|\d+\.)\s+", "", line)
+            line = re.sub(r"^\*\*[^*]+(?::\*\*|\*\*:)\s*", "", line).strip()
+            if line:
+                rebuttal = line
+                break
+
+    if len(rebuttal) > max_chars:
+        rebuttal = rebuttal[:max_chars].rsplit(" ", 1)[0] + "…"
+    return rebuttal
+
+
 if __name__ == "__main__":
     # Use path relative to this file's location
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -0,0 +1,211 @@
+"""
+Process-wide sentence-transformer for stores that do not go through ChromaDB,
+and the query-embedding cache every store puts in front of its model.
+
+The model is loaded once, on first use, and returns L2-normalised float32
+vectors, so cosine similarity is a plain dot product.
+
+During a call the retrieval query (active utterance + context tail) often
+repeats or differs only in case and punctuation, so query embeddings are
+kept in an LRU keyed by normalised text, bounded by size and age:
+
+    QUERY_EMBEDDING_CACHE_SIZE=512      (0 disables the cache)
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS=900
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "512"))
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", "900"))
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_embedders: dict[str, Callable[[Sequence[str]], np.ndarray]] = {}
+_embedders_lock = threading.Lock()
+
+
+def get_shared_embedder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> Callable[[Sequence[str]], np.ndarray]:
+    """Return a ``texts → (n, dim) float32 array`` function backed by one model instance per process."""
+    with _embedders_lock:
+        if model_name not in _embedders:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(model_name)
+
+            def embed(texts: Sequence[str]) -> np.ndarray:
+                vectors = model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True)
+                return np.asarray(vectors, dtype=np.float32)
+
+            _embedders[model_name] = embed
+        return _embedders[model_name]
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise each row (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def normalize_query_text(text: str) -> str:
+    """Cache key for a query: case-folded, punctuation stripped, whitespace collapsed."""
+    return _WHITESPACE_RE.sub(" ", _PUNCTUATION_RE.sub(" ", text.casefold())).strip()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query embeddings with a TTL, shared by all stores and sessions.
+
+    Entries are keyed by ``(embedding_key, normalised text)`` so stores with
+    different models never share vectors. Each entry remembers how long its
+    embedding took, which is what a hit saves.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds: float = QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (vector, embed_ms, stored_at)
+        self._entries: OrderedDict[tuple[str, str], tuple[list[float], float, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.embed_ms = 0.0
+        self.saved_ms = 0.0
+
+    def get_or_embed(
+        self,
+        model_key: str,
+        text: str,
+        embed: Callable[[str], list[float]],
+        stats: Optional["QueryCacheStats"] = None,
+    ) -> list[float]:
+        """Return the cached embedding of ``text`` for ``model_key``, embedding (and caching) it on a miss.
+
+        ``stats`` additionally tallies this lookup for one consumer (e.g. a session).
+        """
+        if self.max_entries <= 0:
+            return embed(text)
+        key = (model_key, normalize_query_text(text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[2] > self.ttl_seconds:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_ms += entry[1]
+                if stats is not None:
+                    stats.record(hit=True, ms=entry[1])
+                return entry[0]
+            self.misses += 1
+
+        # Embed outside the lock; concurrent misses on the same key just embed twice
+        start = time.perf_counter()
+        vector = embed(text)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.embed_ms += elapsed_ms
+            self._entries[key] = (vector, elapsed_ms, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        if stats is not None:
+            stats.record(hit=False, ms=elapsed_ms)
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "embed_ms": round(self.embed_ms, 1),
+                "saved_ms": round(self.saved_ms, 1),
+            }
+
+
+class QueryCacheStats:
+    """One consumer's share of the shared cache: hits, misses and embedding time, e.g. over one call."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.embed_ms = 0.0
+        self.saved_ms = 0.0
+
+    def record(self, hit: bool, ms: float) -> None:
+        """Count one lookup; ``ms`` is the embedding time saved (hit) or spent (miss)."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.saved_ms += ms
+            else:
+                self.misses += 1
+                self.embed_ms += ms
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "embed_ms": round(self.embed_ms, 1),
+                "saved_ms": round(self.saved_ms, 1),
+            }
+
+
+_query_cache_lock = threading.Lock()
+_query_cache: Optional[QueryEmbeddingCache] = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Return the process-wide query-embedding cache."""
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = QueryEmbeddingCache()
+        return _query_cache
+
+
+def reset_query_embedding_cache() -> None:
+    """Drop the process-wide cache (tests)."""
+    global _query_cache
+    with _query_cache_lock:
+        _query_cache = None
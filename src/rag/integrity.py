@@ -30,9 +30,20 @@ def _compute_file_checksum(file_path: Path) -> str:
     return sha256.hexdigest()
 
 
+def _checksum_from_stat(file_path: Path, record: Optional[dict]) -> Optional[str]:
+    """The recorded SHA-256 if the file's size and mtime still match ``record``, else None."""
+    if not record:
+        return None
+    stat = file_path.stat()
+    if stat.st_size == record.get("size") and stat.st_mtime_ns == record.get("mtime_ns"):
+        return record.get("sha256")
+    return None
+
+
 def verify_knowledge_base(
     kb_dir: Optional[Path] = None,
     checksum_file: Optional[Path] = None,
+    known_sources: Optional[dict[str, dict]] = None,
 ) -> dict:
     """Verify the integrity of knowledge base files on startup.
 
@@ -46,18 +57,30 @@ def verify_knowledge_base(
                 ``<project_root>/knowledge_base/``.
         checksum_file: Path to the checksum manifest JSON file. Defaults to
                        ``<project_root>/data/kb_checksums.json``.
+        known_sources: Per-file ``{"sha256", "size", "mtime_ns"}`` records; a file
+                       whose size and mtime still match uses the recorded hash
+                       instead of being rehashed. Defaults to the records in the
+                       packed knowledge base artifact when checking the default
+                       knowledge base.
 
     Returns:
         A dict with keys:
         - ``valid`` (bool): True if all checks passed
         - ``files_checked`` (int): Number of files verified
+        - ``files_rehashed`` (int): Number of files actually hashed
         - ``errors`` (list[str]): List of error messages (empty if valid)
     """
+    if known_sources is None and kb_dir is None:
+        from .artifact import load_source_records
+
+        known_sources = load_source_records()
     kb_dir = kb_dir or _DEFAULT_KB_DIR
     checksum_file = checksum_file or _CHECKSUM_FILE
+    known_sources = known_sources or {}
 
     errors: list[str] = []
     files_checked = 0
+    files_rehashed = 0
 
     # Check 1: Knowledge base directory exists
     if not kb_dir.exists():
@@ -88,7 +111,10 @@ def verify_knowledge_base(
                     errors.append(f"Missing file referenced in checksum manifest: {filename}")
                     continue
 
-                actual_hash = _compute_file_checksum(file_path)
+                actual_hash = _checksum_from_stat(file_path, known_sources.get(filename))
+                if actual_hash is None:
+                    actual_hash = _compute_file_checksum(file_path)
+                    files_rehashed += 1
                 if actual_hash != expected_hash:
                     errors.append(
                         f"Checksum mismatch for {filename}: "
@@ -100,6 +126,7 @@ def verify_knowledge_base(
     result = {
         "valid": len(errors) == 0,
         "files_checked": files_checked,
+        "files_rehashed": files_rehashed,
         "errors": errors,
     }
 
@@ -0,0 +1,307 @@
+"""
+In-process NumPy vector index, a drop-in ``EmbeddingStore`` replacement.
+
+The knowledge base is a few dozen chunks, so a ChromaDB round trip (plus a
+``count()`` per query to clamp ``n_results``) costs far more than the
+search itself. This store keeps L2-normalised embeddings in one contiguous
+float32 matrix; a query is a single matrix-vector product with an
+``argpartition`` top-k, typically tens of microseconds.
+
+Persisted as two files per collection in ``persist_dir``:
+
+    <collection>.npy        float32 (n, dim) matrix, loaded memory-mapped
+    <collection>.meta.json  ids, documents, metadata and embedding model
+
+Distances are squared L2 between unit vectors (``2 - 2·cos``), the same
+scale ChromaDB reports for the normalised MiniLM embeddings, so results
+from both backends merge consistently. ``where`` filters support the
+ChromaDB operators used here: plain equality, ``$eq``, ``$ne``, ``$in``,
+``$nin``, ``$gt``, ``$gte``, ``$lt``, ``$lte``, ``$and`` and ``$or``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Callable, Sequence
+
+import numpy as np
+
+from .embeddings import (
+    DEFAULT_EMBEDDING_MODEL,
+    QueryCacheStats,
+    get_query_embedding_cache,
+    get_shared_embedder,
+    normalize_rows,
+)
+
+_COMPARISONS: dict[str, Callable[[object, object], bool]] = {
+    "$eq": lambda value, operand: value == operand,
+    "$ne": lambda value, operand: value != operand,
+    "$in": lambda value, operand: value in operand,
+    "$nin": lambda value, operand: value not in operand,
+    "$gt": lambda value, operand: value is not None and value > operand,
+    "$gte": lambda value, operand: value is not None and value >= operand,
+    "$lt": lambda value, operand: value is not None and value < operand,
+    "$lte": lambda value, operand: value is not None and value <= operand,
+}
+
+
+def matches_where(metadata: dict, where: dict) -> bool:
+    """Evaluate a ChromaDB-style metadata filter against one chunk's metadata."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if op not in _COMPARISONS:
+                    raise ValueError(f"Unsupported where operator: {op}")
+                if not _COMPARISONS[op](value, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class NumpyEmbeddingStore:
+    """Vector store backed by a normalised float32 matrix (``EmbeddingStore`` interface)."""
+
+    def __init__(
+        self,
+        collection_name: str = "sales_script",
+        persist_dir: str | None = None,
+        embedding_fn: Callable[[Sequence[str]], np.ndarray] | None = None,
+        embedding_model: str | None = None,
+    ):
+        """
+        Args:
+            collection_name: Name of the collection (file stem when persisted).
+            persist_dir: If None, in-memory only. If set, load from and save to this directory.
+            embedding_fn: ``texts → vectors`` function; defaults to the shared all-MiniLM-L6-v2 model,
+                          which is only loaded when something actually needs embedding.
+            embedding_model: Stable name of the model ``embedding_fn`` implements. Saved with the
+                             index and checked on load; required to persist a custom ``embedding_fn``.
+
+        Raises:
+            ValueError: If a custom ``embedding_fn`` without ``embedding_model`` is given a ``persist_dir``,
+                        or the persisted index was built with another embedding model.
+        """
+        self.collection_name = collection_name
+        self.persist_dir = persist_dir
+        self._embedding_fn = embedding_fn
+        if embedding_model is None:
+            embedding_model = DEFAULT_EMBEDDING_MODEL if embedding_fn is None else f"custom:{id(embedding_fn)}"
+        elif embedding_fn is None and embedding_model != DEFAULT_EMBEDDING_MODEL:
+            raise ValueError(f"embedding_model {embedding_model} needs its embedding_fn")
+        # Stores with the same key embed queries identically, so one query vector serves them all
+        self.embedding_key = embedding_model
+        if persist_dir and self.embedding_key.startswith("custom:"):
+            # id() is process-local: the saved index could never be matched to its model again
+            raise ValueError(f"{collection_name}: pass embedding_model to persist a custom embedding_fn")
+
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids: list[str] = []
+        self._documents: list[str] = []
+        self._metadatas: list[dict] = []
+        if persist_dir:
+            self._load()
+
+    @classmethod
+    def from_matrix(
+        cls,
+        collection_name: str,
+        matrix: np.ndarray,
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict],
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+    ) -> "NumpyEmbeddingStore":
+        """An in-memory store over already-normalised embeddings (e.g. a memory-mapped artifact), without copying."""
+        if embedding_model != DEFAULT_EMBEDDING_MODEL:
+            raise ValueError(
+                f"{collection_name} was embedded with {embedding_model}, expected {DEFAULT_EMBEDDING_MODEL}"
+            )
+        if matrix.shape[0] != len(ids):
+            raise ValueError(f"{collection_name} has {matrix.shape[0]} rows but {len(ids)} ids")
+        store = cls(collection_name)
+        store._matrix = matrix
+        store._ids, store._documents, store._metadatas = list(ids), list(documents), list(metadatas)
+        return store
+
+    @property
+    def matrix_path(self) -> str | None:
+        return os.path.join(self.persist_dir, f"{self.collection_name}.npy") if self.persist_dir else None
+
+    @property
+    def meta_path(self) -> str | None:
+        return os.path.join(self.persist_dir, f"{self.collection_name}.meta.json") if self.persist_dir else None
+
+    def add_chunks(self, chunks: list[dict]) -> None:
+        """Embed and store chunks (chunks with an existing id replace it), then persist if configured.
+
+        Args:
+            chunks: List of chunk dicts, each with 'id', 'text', and 'metadata'.
+        """
+        if not chunks:
+            return
+        vectors = normalize_rows(self._embed([c["text"] for c in chunks]))
+
+        matrix = np.array(self._matrix, dtype=np.float32) if len(self._ids) else np.zeros((0, vectors.shape[1]))
+        rows = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+        new_rows = []
+        for chunk, vector in zip(chunks, vectors):
+            metadata = dict(chunk.get("metadata") or {})
+            if chunk["id"] in rows:
+                i = rows[chunk["id"]]
+                matrix[i] = vector
+                self._documents[i], self._metadatas[i] = chunk["text"], metadata
+            else:
+                rows[chunk["id"]] = len(self._ids)
+                self._ids.append(chunk["id"])
+                self._documents.append(chunk["text"])
+                self._metadatas.append(metadata)
+                new_rows.append(vector)
+        if new_rows:
+            matrix = np.vstack([matrix, np.asarray(new_rows, dtype=np.float32)])
+        self._matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+        if self.persist_dir:
+            self._save()
+
+    def query(
+        self,
+        text: str,
+        top_k: int = 3,
+        where: dict | None = None,
+    ) -> list[dict]:
+        """Query the store for similar chunks.
+
+        Returns:
+            List of result dicts, each with 'id', 'text', 'metadata', 'distance'.
+            Results are sorted by distance (closest first).
+        """
+        if not self._ids:
+            return []
+        return self.query_by_vector(self.embed_query(text), top_k=top_k, where=where)
+
+    def embed_query(self, text: str, stats: QueryCacheStats | None = None) -> list[float]:
+        """Embed query text with this store's model (reusable with ``query_by_vector``); cached per process.
+
+        ``stats`` tallies the cache lookup for the caller's session.
+        """
+        return get_query_embedding_cache().get_or_embed(
+            self.embedding_key, text, lambda query: normalize_rows(self._embed([query]))[0].tolist(), stats
+        )
+
+    def query_by_vector(
+        self,
+        vector: Sequence[float],
+        top_k: int = 3,
+        where: dict | None = None,
+    ) -> list[dict]:
+        """Query with a pre-computed query embedding. Returns the same result dicts as ``query``."""
+        if not self._ids or top_k <= 0:
+            return []
+        query = normalize_rows(np.asarray(vector, dtype=np.float32))[0]
+
+        if where:
+            candidates = np.fromiter(
+                (i for i, metadata in enumerate(self._metadatas) if matches_where(metadata, where)), dtype=np.intp
+            )
+            if candidates.size == 0:
+                return []
+            similarities = self._matrix[candidates] @ query
+        else:
+            candidates = None
+            similarities = self._matrix @ query
+
+        k = min(top_k, similarities.shape[0])
+        top = np.argpartition(-similarities, k - 1)[:k] if k < similarities.shape[0] else np.arange(k)
+        top = top[np.argsort(-similarities[top], kind="stable")]
+
+        results = []
+        for position in top:
+            i = int(candidates[position]) if candidates is not None else int(position)
+            results.append(
+                {
+                    "id": self._ids[i],
+                    "text": self._documents[i],
+                    "metadata": dict(self._metadatas[i]),
+                    "distance": float(max(0.0, 2.0 - 2.0 * similarities[position])),
+                }
+            )
+        return results
+
+    def count(self) -> int:
+        """Return number of stored chunks."""
+        return len(self._ids)
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Remove chunks by id (unknown ids are ignored), then persist if configured."""
+        drop = set(ids)
+        keep = [i for i, chunk_id in enumerate(self._ids) if chunk_id not in drop]
+        if len(keep) == len(self._ids):
+            return
+        self._matrix = np.ascontiguousarray(self._matrix[keep], dtype=np.float32)
+        self._ids = [self._ids[i] for i in keep]
+        self._documents = [self._documents[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        if self.persist_dir:
+            self._save()
+
+    def clear(self) -> None:
+        """Remove every chunk (and the persisted files)."""
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids, self._documents, self._metadatas = [], [], []
+        for path in (self.matrix_path, self.meta_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def vectors_for(self, ids: Sequence[str]) -> np.ndarray:
+        """The stored (normalised) embeddings of ``ids``, in that order. Raises ``KeyError`` for unknown ids."""
+        rows = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+        return np.asarray(self._matrix[[rows[chunk_id] for chunk_id in ids]], dtype=np.float32)
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        if self._embedding_fn is None:
+            self._embedding_fn = get_shared_embedder()
+        return np.asarray(self._embedding_fn(texts), dtype=np.float32)
+
+    def _load(self) -> None:
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.meta_path)):
+            return
+        with open(self.meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        model = meta.get("embedding_model", DEFAULT_EMBEDDING_MODEL)
+        if model != self.embedding_key:
+            raise ValueError(f"{self.meta_path} was built with {model}, expected {self.embedding_key}")
+        matrix = np.load(self.matrix_path, mmap_mode="r")
+        if matrix.shape[0] != len(meta["ids"]):
+            raise ValueError(f"{self.matrix_path} has {matrix.shape[0]} rows but {len(meta['ids'])} ids")
+        self._matrix = matrix
+        self._ids, self._documents, self._metadatas = meta["ids"], meta["documents"], meta["metadatas"]
+
+    def _save(self) -> None:
+        os.makedirs(self.persist_dir, exist_ok=True)
+        # Write to temp files and swap in, so a reader never sees a half-written index
+        matrix_tmp, meta_tmp = self.matrix_path + ".tmp.npy", self.meta_path + ".tmp"
+        np.save(matrix_tmp, self._matrix)
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "collection": self.collection_name,
+                    "embedding_model": self.embedding_key,
+                    "dim": int(self._matrix.shape[1]) if self._matrix.ndim == 2 else 0,
+                    "ids": self._ids,
+                    "documents": self._documents,
+                    "metadatas": self._metadatas,
+                },
+                f,
+            )
+        os.replace(matrix_tmp, self.matrix_path)
+        os.replace(meta_tmp, self.meta_path)
@@ -0,0 +1,276 @@
+"""
+Process-wide RAG pipeline, built once and shared read-only.
+
+Chunking the knowledge base, opening the embedding stores and loading the
+sentence-transformer model take seconds (longer when there is no persisted
+store and everything is embedded in memory). That used to happen in every
+``StreamingAnalyzer``, i.e. for every WebSocket session and Vexa join.
+
+The pipeline is now built once per process — in the background at app
+startup — and shared by all sessions. Each session gets its own
+lightweight ``ScriptRetriever`` over the shared chunks and stores, so
+per-session state such as ``last_stage`` never leaks between calls.
+Sessions that start before the build finishes run on the static script
+prompt and pick up retrieval as soon as the pipeline is ready.
+
+The vector backend is chosen with RAG_VECTOR_BACKEND: ``numpy`` (default,
+in-process index, no ChromaDB at all) or ``chroma`` for large corpora.
+With the numpy backend, a current packed artifact (``rag/artifact.py``,
+written by ``build.py``) is memory-mapped instead of chunking and loading
+the stores, so the build takes milliseconds and worker processes share
+the embedding pages.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from .chunker import ChunkCatalog
+from .retriever import ScriptRetriever
+from .stage_detector import StageDetector
+
+if TYPE_CHECKING:
+    from .store import EmbeddingStore
+
+logger = logging.getLogger(__name__)
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+KNOWLEDGE_BASE_DIR = os.path.join(_ROOT, "knowledge_base")
+PERSIST_DIR = os.path.join(_ROOT, "data", "chromadb")
+NUMPY_PERSIST_DIR = os.path.join(_ROOT, "data", "vectors")
+
+VECTOR_BACKENDS = ("numpy", "chroma")
+
+
+def get_vector_backend() -> str:
+    """The configured vector backend (RAG_VECTOR_BACKEND, default ``numpy``)."""
+    backend = os.getenv("RAG_VECTOR_BACKEND", "numpy").lower()
+    if backend not in VECTOR_BACKENDS:
+        raise ValueError(f"RAG_VECTOR_BACKEND must be one of {VECTOR_BACKENDS}, got {backend!r}")
+    return backend
+
+
+def get_store_class(backend: Optional[str] = None):
+    """The ``EmbeddingStore``-compatible class for ``backend`` (imported lazily: ChromaDB only when chosen)."""
+    if (backend or get_vector_backend()) == "chroma":
+        from .store import EmbeddingStore
+
+        return EmbeddingStore
+    from .numpy_store import NumpyEmbeddingStore
+
+    return NumpyEmbeddingStore
+
+
+def default_persist_dir(backend: Optional[str] = None) -> str:
+    return PERSIST_DIR if (backend or get_vector_backend()) == "chroma" else NUMPY_PERSIST_DIR
+
+
+@dataclass
+class RagPipeline:
+    """Shared, read-only retrieval resources: chunks, stores and stage detector."""
+
+    chunks: list[dict]
+    store: EmbeddingStore
+    detector: StageDetector
+    sources: list[EmbeddingStore] = field(default_factory=list)
+    build_ms: float = 0.0
+    catalog: Optional[ChunkCatalog] = None
+
+    def __post_init__(self) -> None:
+        if self.catalog is None:
+            # Indexed once here; every session retriever looks chunks up in the shared catalog
+            self.catalog = ChunkCatalog(self.chunks)
+
+    def session_retriever(self) -> ScriptRetriever:
+        """A retriever with its own stage continuity, over the shared stores and chunk catalog."""
+        return ScriptRetriever(self.store, self.detector, self.catalog, sources=self.sources)
+
+
+def build_rag_pipeline(
+    knowledge_base_dir: str = KNOWLEDGE_BASE_DIR,
+    persist_dir: Optional[str] = None,
+    backend: Optional[str] = None,
+    artifact_path: Optional[str] = None,
+) -> RagPipeline:
+    """Chunk → embed (or load pre-built embeddings) → shared pipeline.
+
+    Opens the packed artifact when it is current (numpy backend), else
+    loads pre-built embeddings from disk if available (built via
+    `python src/rag/build.py`). Falls back to in-memory embedding
+    if no persisted store exists.
+    """
+    from .chunker import chunk_methodology, chunk_script
+
+    backend = backend or get_vector_backend()
+    store_cls = get_store_class(backend)
+    persist_dir = persist_dir or default_persist_dir(backend)
+    start = time.time()
+    script_path = os.path.join(knowledge_base_dir, "kubecraft_script.md")
+    methodology_path = os.path.join(knowledge_base_dir, "hardly_selling_methodology.md")
+
+    if backend == "numpy":
+        pipeline = _open_artifact_pipeline(artifact_path, knowledge_base_dir, script_path, methodology_path, start)
+        if pipeline is not None:
+            return pipeline
+
+    # Always need chunks for the stage detector / retriever
+    logger.info("RAG: Chunking sales script...")
+    chunks = chunk_script(script_path)
+    logger.info(f"RAG: {len(chunks)} chunks parsed")
+    methodology_chunks = []
+    if os.path.exists(methodology_path):
+        logger.info("RAG Layer 2: Chunking Hardly Selling methodology...")
+        methodology_chunks = chunk_methodology(methodology_path)
+        logger.info(f"RAG Layer 2: {len(methodology_chunks)} methodology chunks parsed")
+    else:
+        logger.warning("RAG Layer 2 disabled: %s not found", methodology_path)
+
+    # Try loading pre-built embeddings from disk
+    if os.path.exists(persist_dir):
+        store = store_cls(collection_name="sales_script", persist_dir=persist_dir)
+        if store.count() > 0:
+            logger.info(f"RAG: Loaded {store.count()} pre-built embeddings from {persist_dir}")
+        else:
+            logger.warning("RAG: Persist dir exists but empty — embedding in-memory")
+            store = store_cls(collection_name="sales_script")
+            store.add_chunks(chunks)
+            logger.info(f"RAG: {store.count()} chunks embedded (in-memory)")
+    else:
+        logger.info("RAG: No pre-built store found — embedding in-memory (run `python src/rag/build.py` to persist)")
+        store = store_cls(collection_name="sales_script")
+        store.add_chunks(chunks)
+        logger.info(f"RAG: {store.count()} chunks embedded (in-memory)")
+
+    sources = []
+    if methodology_chunks:
+        methodology_store = _build_methodology_store(store_cls, methodology_chunks, persist_dir)
+        if methodology_store is not None:
+            sources.append(methodology_store)
+            logger.info("RAG Layer 2: Hardly Selling methodology source enabled")
+
+    pipeline = RagPipeline(chunks, store, StageDetector(), sources, build_ms=(time.time() - start) * 1000)
+    logger.info(f"RAG: Pipeline ready in {pipeline.build_ms:.0f}ms ({backend} backend)")
+    return pipeline
+
+
+def _open_artifact_pipeline(
+    artifact_path: Optional[str], knowledge_base_dir: str, script_path: str, methodology_path: str, start: float
+) -> Optional[RagPipeline]:
+    """The pipeline straight from the packed artifact, or None if it is missing, unreadable or stale."""
+    from .artifact import ARTIFACT_PATH, KnowledgeBaseArtifact, knowledge_base_files
+    from .numpy_store import NumpyEmbeddingStore
+
+    artifact_path = artifact_path or ARTIFACT_PATH
+    if not os.path.exists(artifact_path):
+        return None
+    try:
+        artifact = KnowledgeBaseArtifact.open(artifact_path)
+        stale = artifact.stale_sources(knowledge_base_files(knowledge_base_dir, script_path, methodology_path))
+        if stale:
+            logger.warning(f"RAG: Ignoring stale artifact {artifact_path} ({'; '.join(stale)}) — rerun build.py")
+            return None
+        stores = {
+            name: NumpyEmbeddingStore.from_matrix(
+                name, c.matrix, c.ids, c.documents, c.metadatas, embedding_model=artifact.embedding_model
+            )
+            for name, c in artifact.collections.items()
+        }
+        chunks = artifact.collections["sales_script"].chunks
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"RAG: Could not open artifact {artifact_path}: {e}")
+        return None
+
+    sources = [stores["hardly_selling_methodology"]] if "hardly_selling_methodology" in stores else []
+    pipeline = RagPipeline(
+        chunks, stores["sales_script"], StageDetector(), sources, build_ms=(time.time() - start) * 1000
+    )
+    logger.info(
+        f"RAG: Pipeline ready in {pipeline.build_ms:.1f}ms from artifact {artifact_path} "
+        f"({len(artifact.matrix)} embeddings memory-mapped)"
+    )
+    return pipeline
+
+
+def _build_methodology_store(store_cls, methodology_chunks: list[dict], persist_dir: str):
+    """Build or load the optional Hardly Selling methodology source."""
+    try:
+        if os.path.exists(persist_dir):
+            methodology_store = store_cls(
+                collection_name="hardly_selling_methodology",
+                persist_dir=persist_dir,
+            )
+            if methodology_store.count() == 0:
+                methodology_store.add_chunks(methodology_chunks)
+        else:
+            methodology_store = store_cls(collection_name="hardly_selling_methodology")
+            methodology_store.add_chunks(methodology_chunks)
+        logger.info("RAG Layer 2: %s methodology chunks ready", methodology_store.count())
+        return methodology_store
+    except Exception as e:
+        logger.warning("RAG Layer 2 disabled: failed to initialize methodology source: %s", e)
+        return None
+
+
+_lock = threading.Lock()
+_done = threading.Event()
+_pipeline: Optional[RagPipeline] = None
+_state = "idle"  # "idle" → "building" → "ready" | "failed"
+
+
+def _claim_build() -> bool:
+    global _state
+    with _lock:
+        if _state != "idle":
+            return False
+        _state = "building"
+        return True
+
+
+def _run_build() -> None:
+    global _pipeline, _state
+    try:
+        pipeline, state = build_rag_pipeline(), "ready"
+    except Exception as e:
+        logger.error(f"RAG: Pipeline build failed, retrieval disabled: {e}", exc_info=True)
+        pipeline, state = None, "failed"
+    with _lock:
+        _pipeline, _state = pipeline, state
+    _done.set()
+
+
+def start_rag_pipeline_build() -> None:
+    """Build the shared pipeline in a background thread (no-op if already built or building)."""
+    if _claim_build():
+        threading.Thread(target=_run_build, name="rag-pipeline-build", daemon=True).start()
+
+
+def get_rag_pipeline(timeout: Optional[float] = None) -> Optional[RagPipeline]:
+    """Return the shared pipeline, building it (or waiting for the build) if needed; None if the build failed."""
+    if _claim_build():
+        _run_build()
+    _done.wait(timeout)
+    return _pipeline
+
+
+def get_rag_pipeline_if_ready() -> Optional[RagPipeline]:
+    """Return the shared pipeline without blocking; None while it is missing, building or failed."""
+    with _lock:
+        return _pipeline if _state == "ready" else None
+
+
+def rag_pipeline_state() -> str:
+    """``idle``, ``building``, ``ready`` or ``failed``."""
+    return _state
+
+
+def reset_rag_pipeline() -> None:
+    """Forget the shared pipeline (tests, or after rebuilding the knowledge base)."""
+    global _pipeline, _state
+    with _lock:
+        _pipeline, _state = None, "idle"
+        _done.clear()
@@ -14,11 +14,17 @@ Strategy:
 
 from __future__ import annotations
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
+from .chunker import ChunkCatalog, extract_rebuttal
 from .stage_detector import StageDetector
+from .stage_tracker import StreamingStageTracker
 
 if TYPE_CHECKING:
+    from .embeddings import QueryCacheStats
     from .store import EmbeddingStore
 
 
@@ -28,6 +34,27 @@ _STAGE_CONFIDENCE_THRESHOLD = 0.3
 # How many characters of context_text tail to append for semantic queries.
 _CONTEXT_TAIL_LENGTH = 200
 
+# Objection fast path: minimum detector confidence on the latest utterance.
+# objection_handling has many keywords, so two distinct hits already score ~0.16.
+_FAST_PATH_MIN_CONFIDENCE = 0.15
+
+# Generic objection chunks carry principles, not a rebuttal to read out.
+_GENERIC_OBJECTION_IDS = {"objection_core_principle", "objection_testing"}
+
+logger = logging.getLogger(__name__)
+
+# Shared by all retrievers: multi-source queries run concurrently without a pool per call.
+_query_pool: ThreadPoolExecutor | None = None
+_query_pool_lock = threading.Lock()
+
+
+def _get_query_pool() -> ThreadPoolExecutor:
+    global _query_pool
+    with _query_pool_lock:
+        if _query_pool is None:
+            _query_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-query")
+        return _query_pool
+
 
 class ScriptRetriever:
     """Hybrid retriever: stage-based deterministic + semantic embedding lookup.
@@ -42,22 +69,49 @@ class ScriptRetriever:
         self,
         store: EmbeddingStore,
         detector: StageDetector,
-        chunks: list[dict],
+        chunks: list[dict] | ChunkCatalog,
         sources: list["EmbeddingStore"] | None = None,
     ) -> None:
         """
         Args:
             store: The primary embedding store with indexed chunks.
             detector: Stage detector for keyword-based detection.
-            chunks: The raw chunk list (for adjacent section lookup).
+            chunks: The chunk catalog (for adjacent section lookup); a plain
+                    chunk list is indexed here.
             sources: Optional additional embedding stores to query alongside
                      the primary store (e.g. methodology knowledge base).
         """
         self.store = store
         self.detector = detector
-        self.chunks = chunks
+        self.catalog = chunks if isinstance(chunks, ChunkCatalog) else ChunkCatalog(chunks)
+        self.chunks = self.catalog.chunks
         self.last_stage: str | None = None
+        # Fed transcript segments as they arrive (observe_segment); None for non-keyword detectors
+        self.stage_tracker = StreamingStageTracker(detector) if isinstance(detector, StageDetector) else None
         self._extra_sources: list["EmbeddingStore"] = list(sources) if sources else []
+        # Set by the owning session to count its own query-embedding cache hits and misses
+        self.embedding_stats: QueryCacheStats | None = None
+
+    def fork(self) -> ScriptRetriever:
+        """A retriever over the same stores, catalog and stage tracker with its own ``last_stage``.
+
+        For a second thread (e.g. background prefetch), so its retrievals do not
+        move this retriever's stage continuity.
+        """
+        twin = ScriptRetriever(self.store, self.detector, self.catalog, sources=self._extra_sources)
+        twin.stage_tracker = self.stage_tracker
+        twin.embedding_stats = self.embedding_stats
+        return twin
+
+    def observe_segment(self, text: str, at: float | None = None) -> tuple[str, float] | None:
+        """Feed a completed transcript segment to the stage tracker; returns ``(stage, confidence)``.
+
+        Once the tracker has seen the call, retrieval reads its stage instead
+        of rescanning the context tail. None if this retriever has no tracker.
+        """
+        if self.stage_tracker is None:
+            return None
+        return self.stage_tracker.observe(text, at)
 
     # ------------------------------------------------------------------
     # Multi-source management
@@ -121,14 +175,19 @@ class ScriptRetriever:
             return []
 
         # Step 1: Detect stage (with continuity from last turn).
-        # Feed the detector the recent context + latest utterance so it sees
-        # the rep's stage-signaling keywords, not just the prospect's reply.
-        detect_text = active_text
-        if context_text:
-            # Use the tail of context (last ~500 chars) + active text
-            context_tail = context_text[-500:] if len(context_text) > 500 else context_text
-            detect_text = context_tail + "\n" + active_text
-        stage, confidence = self.detector.detect(detect_text, current_stage=self.last_stage)
+        if self.stage_tracker is not None and self.stage_tracker.has_text:
+            # Kept current segment by segment over the same ~500-char window (continuity included);
+            # the active text counts too, incomplete segment and all, as it did appended to the context tail
+            stage, confidence = self.stage_tracker.current(pending=active_text)
+        else:
+            # Feed the detector the recent context + latest utterance so it sees
+            # the rep's stage-signaling keywords, not just the prospect's reply.
+            detect_text = active_text
+            if context_text:
+                # Use the tail of context (last ~500 chars) + active text
+                context_tail = context_text[-500:] if len(context_text) > 500 else context_text
+                detect_text = context_tail + "\n" + active_text
+            stage, confidence = self.detector.detect(detect_text, current_stage=self.last_stage)
 
         # Update last_stage for next turn's continuity bias.
         if stage is not None:
@@ -143,6 +202,59 @@ class ScriptRetriever:
                 return self._hybrid_retrieve(active_text, context_text, self.last_stage, top_k)
             return self._semantic_fallback(active_text, context_text, top_k)
 
+    def match_objection(
+        self,
+        active_text: str,
+        min_confidence: float = _FAST_PATH_MIN_CONFIDENCE,
+    ) -> dict | None:
+        """
+        Zero-LLM objection lookup for the fast path.
+
+        Returns the script's rebuttal when the latest utterance is detected as
+        ``objection_handling`` with at least ``min_confidence`` AND the top
+        semantic hit in the script store is a specific ``objection_*`` chunk.
+        Does not touch ``last_stage``, so the full retrieval that follows is
+        unaffected.
+
+        Returns:
+            {"id", "objection", "rebuttal", "confidence", "distance"} or None.
+        """
+        if not active_text or not active_text.strip():
+            return None
+
+        stage, confidence = self.detector.detect(active_text)
+        if stage != "objection_handling" or confidence < min_confidence:
+            return None
+
+        try:
+            vector, _ = self._embed_once(active_text)
+            if vector is not None:
+                hits = self.store.query_by_vector(vector, top_k=1)
+            else:
+                hits = self.store.query(active_text, top_k=1)
+        except Exception:
+            return None
+        if not hits:
+            return None
+
+        top = hits[0]
+        chunk_id = top.get("id", "")
+        if not chunk_id.startswith("objection_") or chunk_id in _GENERIC_OBJECTION_IDS:
+            return None
+
+        rebuttal = extract_rebuttal(top.get("text", ""))
+        if not rebuttal:
+            return None
+
+        section = top.get("metadata", {}).get("section", chunk_id)
+        return {
+            "id": chunk_id,
+            "objection": section.removeprefix("Objection: "),
+            "rebuttal": rebuttal,
+            "confidence": confidence,
+            "distance": top.get("distance"),
+        }
+
     # ------------------------------------------------------------------
     # Internal retrieval strategies
     # ------------------------------------------------------------------
@@ -210,25 +322,15 @@ class ScriptRetriever:
         For objection handling (part_number=None), returns chunks tagged
         with 'objection' in their metadata section field.
         """
-        if not self.chunks:
-            return []
-
         if part_number is None:
-            # Objection handling -- find chunks with objection-related sections.
-            return [
-                chunk for chunk in self.chunks if "objection" in chunk.get("metadata", {}).get("section", "").lower()
-            ]
-
-        # Collect chunks whose part_number falls within [part - window, part + window].
-        lower = max(1, part_number - window)
-        upper = part_number + window
-        adjacent = []
-        for chunk in self.chunks:
-            chunk_part = chunk.get("metadata", {}).get("part_number")
-            if chunk_part is not None and lower <= chunk_part <= upper:
-                adjacent.append(chunk)
-
-        return adjacent
+            # Objection handling -- chunks with objection-related sections (indexed at build time).
+            return list(self.catalog.objection_chunks)
+
+        # Chunks whose part_number falls within [part - window, part + window] (precomputed per part).
+        adjacent = self.catalog.adjacent(part_number, window)
+        if part_number - window < 1:
+            adjacent = [chunk for chunk in adjacent if chunk.get("metadata", {}).get("part_number", 0) >= 1]
+        return list(adjacent)
 
     def _build_semantic_query(self, active_text: str, context_text: str) -> str:
         """
@@ -249,27 +351,30 @@ class ScriptRetriever:
         Query all registered embedding stores with error handling.
 
         Queries the primary store and every extra source added via
-        ``add_source()``, merges results by distance, and returns the
-        top-k closest matches across all sources.
+        ``add_source()`` concurrently, merges results by distance, and
+        returns the top-k closest matches across all sources. The query is
+        embedded once and the vector reused for every store with the same
+        ``embedding_key``; stores without ``query_by_vector`` get the text.
 
         Returns an empty list if every store is unavailable or errors out,
         ensuring the retriever degrades gracefully.
         """
-        primary_results: list[dict] = []
-        extra_results_by_source: list[list[dict]] = []
+        stores = [self.store, *self._extra_sources]
+        vector, vector_key = self._embed_once(text)
 
-        # Query primary store
-        try:
-            primary_results = self.store.query(text, top_k=top_k, where=where)
-        except Exception:
-            primary_results = []
-
-        # Query extra sources (methodology, etc.)
-        for source in self._extra_sources:
+        def run(store) -> list[dict]:
             try:
-                extra_results_by_source.append(source.query(text, top_k=top_k, where=where))
+                if vector is not None and getattr(store, "embedding_key", None) == vector_key:
+                    return store.query_by_vector(vector, top_k=top_k, where=where)
+                return store.query(text, top_k=top_k, where=where)
             except Exception:
-                extra_results_by_source.append([])
+                return []
+
+        if len(stores) == 1:
+            results_by_store = [run(self.store)]
+        else:
+            results_by_store = list(_get_query_pool().map(run, stores))
+        primary_results, extra_results_by_source = results_by_store[0], results_by_store[1:]
 
         # Preserve source diversity: include the best result from each extra
         # source before filling remaining slots by distance across all sources.
@@ -298,6 +403,24 @@ class ScriptRetriever:
         selected.sort(key=lambda r: r.get("distance", float("inf")))
         return selected[:top_k]
 
+    def _embed_once(self, text: str) -> tuple[list[float] | None, str | None]:
+        """Embed ``text`` with the primary store's model; ``(None, None)`` if it cannot embed queries itself.
+
+        A single store is left to embed its own query unless the session is counting cache use.
+        """
+        if not self._extra_sources and self.embedding_stats is None:
+            return None, None
+        key = getattr(self.store, "embedding_key", None)
+        if key is None or not hasattr(self.store, "embed_query"):
+            return None, None
+        try:
+            if self.embedding_stats is None:
+                return self.store.embed_query(text), key
+            return self.store.embed_query(text, stats=self.embedding_stats), key
+        except Exception as e:
+            logger.warning(f"Query embedding failed, querying each source by text: {e}")
+            return None, None
+
     @staticmethod
     def _deduplicate(chunks: list[dict]) -> list[dict]:
         """Remove duplicate chunks by id, preserving order."""
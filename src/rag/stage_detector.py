@@ -3,11 +3,87 @@ Keyword-based sales call stage detection.
 
 Given a text utterance, detects which Part of the KubeCraft sales script
 the conversation is currently in. Uses case-insensitive keyword matching
-with confidence scoring based on hit density.
+with confidence scoring based on hit density. The keyword table is compiled
+once into a single trie-shaped regex, so detection is one scan of the text
+instead of one substring search per keyword.
 """
 
 from __future__ import annotations
 
+import re
+from collections import Counter
+from typing import Mapping
+
+# Matcher key for the "scale of 1-10" phrases (not a stage).
+_SCALE_KEY = "__scale__"
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """Regex for ``words`` factored into a trie, so each text position is tried once (longest match first)."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A word ends here: the longer continuations are optional (greedy, so still longest first)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class _KeywordMatcher:
+    """All stage keywords compiled into one regex; counts keyword hits per stage in one pass over the text.
+
+    Hits mean the same as ``keyword in text`` for every keyword: each keyword
+    counts once however often it occurs, and keywords hidden inside a longer
+    match ("get started" in "let's get started") are credited through
+    ``_contained``.
+    """
+
+    def __init__(self, stage_keywords: dict[str, list[str]], scale_patterns: list[str]) -> None:
+        self._stages_by_keyword: dict[str, list[str]] = {}
+        for stage, keywords in [*stage_keywords.items(), (_SCALE_KEY, scale_patterns)]:
+            for keyword in keywords:
+                self._stages_by_keyword.setdefault(keyword.lower(), []).append(stage)
+        words = list(self._stages_by_keyword)
+        self._contained = {word: [other for other in words if other in word] for word in words}
+        self._prefixes = {word: [other for other in words if word.startswith(other)] for word in words}
+        self.max_keyword_length = max(map(len, words))
+        self._search = re.compile(_trie_pattern(words)).search
+
+    def stages_for(self, keyword: str) -> list[str]:
+        """Stages (with repeats for duplicate entries) that list ``keyword``."""
+        return self._stages_by_keyword[keyword]
+
+    def occurrences(self, text_lower: str, pos: int = 0) -> list[tuple[int, str]]:
+        """Every ``(start, keyword)`` occurrence in ``text_lower[pos:]``, overlapping ones included."""
+        found = []
+        match = self._search(text_lower, pos)
+        while match:
+            # The regex yields the longest keyword at each start; shorter ones starting there are its prefixes
+            found.extend((match.start(), keyword) for keyword in self._prefixes[match.group()])
+            match = self._search(text_lower, match.start() + 1)
+        return found
+
+    def stage_hits(self, text_lower: str) -> Counter:
+        """Per-stage count of distinct keywords found in ``text_lower`` (scale phrases under ``_SCALE_KEY``)."""
+        found: set[str] = set()
+        match = self._search(text_lower)
+        while match:
+            found.update(self._contained[match.group()])
+            match = self._search(text_lower, match.start() + 1)
+        hits: Counter = Counter()
+        for keyword in found:
+            hits.update(self._stages_by_keyword[keyword])
+        return hits
+
 
 class StageDetector:
     """Detects the current sales call stage from conversational text."""
@@ -205,11 +281,44 @@ class StageDetector:
         "objection_handling": None,
     }
 
+    # Mapping from stage name to the summary's stage_hint vocabulary.
+    _STAGE_TO_HINT: dict[str, str] = {
+        "part_1_open": "open",
+        "part_2_set_agenda": "open",
+        "part_3_why_here": "context",
+        "part_4_pain_problem": "problem_development",
+        "part_5_what_they_want": "solution_vision",
+        "part_6_blocker": "blockers",
+        "part_7_now_tiedown": "tiedown",
+        "part_8_pre_pitch": "bridge",
+        "part_9_pitch": "pitch",
+        "part_10_shut_up": "pitch",
+        "part_11_temp_check": "temp_check",
+        "part_12_close": "close",
+        "objection_handling": "objection",
+    }
+
     # Keywords that appear in multiple stages need disambiguation.
     # "scale of" + "1-10" could be Part 4 (technical baseline) or Part 11 (temp check).
     # We use context keywords to disambiguate.
     _SCALE_TECH_CONTEXT = {"linux", "kubernetes", "containers", "skills", "technical"}
     _SCALE_TEMP_CONTEXT = {"feeling", "gut", "check", "investment", "everything"}
+    _SCALE_PATTERNS = [
+        "scale of 1",
+        "1 to 10",
+        "1-10",
+        "one to ten",
+        "scale of one",
+    ]
+
+    # Compiled from STAGE_KEYWORDS on first use, once per class.
+    _matcher: _KeywordMatcher | None = None
+
+    @classmethod
+    def _keyword_matcher(cls) -> _KeywordMatcher:
+        if cls.__dict__.get("_matcher") is None:
+            cls._matcher = _KeywordMatcher(cls.STAGE_KEYWORDS, cls._SCALE_PATTERNS)
+        return cls._matcher
 
     def detect(self, text: str, current_stage: str | None = None) -> tuple[str, float]:
         """
@@ -228,17 +337,32 @@ class StageDetector:
 
         text_lower = text.lower()
 
+        # One pass over the text counts keyword hits for every stage.
+        stage_hits = self._keyword_matcher().stage_hits(text_lower)
+        has_scale = stage_hits[_SCALE_KEY] > 0
+
         # Disambiguate "scale of 1-10" / "1 to 10" between Part 4 and Part 11.
-        scale_context = self._detect_scale_context(text_lower)
+        scale_context = self._detect_scale_context(text_lower, has_scale)
 
+        return self.score_stages(stage_hits, has_scale, scale_context, current_stage)
+
+    def score_stages(
+        self,
+        stage_hits: Mapping[str, int],
+        has_scale: bool,
+        scale_context: str | None,
+        current_stage: str | None = None,
+    ) -> tuple[str, float]:
+        """
+        Pick the stage from per-stage keyword hit counts (the scoring half of ``detect``).
+
+        Shared with the streaming tracker, which keeps the hit counts for a
+        sliding window instead of rescanning text.
+        """
         # Score each stage by counting keyword hits.
         scores: dict[str, float] = {}
         for stage_name, keywords in self.STAGE_KEYWORDS.items():
-            hits = 0
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    hits += 1
-
+            hits = stage_hits[stage_name]
             if hits == 0:
                 continue
 
@@ -257,7 +381,7 @@ class StageDetector:
             scores["part_4_pain_problem"] *= 0.3
 
         # Handle "scale of 1-10" / "1 to 10" as direct signal.
-        if self._has_scale_pattern(text_lower):
+        if has_scale:
             if scale_context == "tech":
                 scores["part_4_pain_problem"] = max(
                     scores.get("part_4_pain_problem", 0.0), 0.5
@@ -289,45 +413,52 @@ class StageDetector:
         """
         Convert stage name to part number (1-12).
 
-        Returns None for objection_handling or unknown stage names.
+        Returns None for unknown stage names.
         """
         return self._STAGE_TO_PART.get(stage_name)
 
+    def get_stage_hint(self, stage_name: str) -> str | None:
+        """
+        Convert stage name to the summary stage_hint it falls under ("open", "pitch", ...).
+
+        Returns None for unknown stage names.
+        """
+        return self._STAGE_TO_HINT.get(stage_name)
+
     def get_all_stage_names(self) -> list[str]:
         """Return all recognized stage names."""
         return list(self.STAGE_KEYWORDS.keys())
 
-    def _detect_scale_context(self, text_lower: str) -> str | None:
+    def _detect_scale_context(self, text_lower: str, has_scale: bool | None = None) -> str | None:
         """
         Determine if a 'scale of 1-10' reference is about technical
         baseline (Part 4) or temp check (Part 11).
 
+        ``has_scale`` skips the scale-pattern check when the caller already did it.
         Returns 'tech', 'temp', or None if no scale reference found.
         """
-        if not self._has_scale_pattern(text_lower):
+        if has_scale is None:
+            has_scale = self._has_scale_pattern(text_lower)
+        if not has_scale:
             return None
 
         words = set(text_lower.split())
-        tech_hits = len(words & self._SCALE_TECH_CONTEXT)
-        temp_hits = len(words & self._SCALE_TEMP_CONTEXT)
+        return self._scale_context_from_hits(
+            len(words & self._SCALE_TECH_CONTEXT), len(words & self._SCALE_TEMP_CONTEXT)
+        )
 
+    @staticmethod
+    def _scale_context_from_hits(tech_hits: int, temp_hits: int) -> str | None:
         if tech_hits > temp_hits:
             return "tech"
         elif temp_hits > tech_hits:
             return "temp"
         return None
 
-    @staticmethod
-    def _has_scale_pattern(text_lower: str) -> bool:
+    @classmethod
+    def _has_scale_pattern(cls, text_lower: str) -> bool:
         """Check if text contains a 1-10 scale reference."""
-        scale_patterns = [
-            "scale of 1",
-            "1 to 10",
-            "1-10",
-            "one to ten",
-            "scale of one",
-        ]
-        return any(p in text_lower for p in scale_patterns)
+        return any(p in text_lower for p in cls._SCALE_PATTERNS)
 
 
 if __name__ == "__main__":
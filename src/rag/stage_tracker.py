@@ -0,0 +1,197 @@
+"""
+Streaming call-stage tracking over a sliding transcript window.
+
+``StageDetector.detect`` rescans the last ~500 characters of context on
+every retrieval, so the same text is matched again and again. The tracker
+consumes each completed transcript segment once: only the new text (plus
+a short overlap for keywords spanning segments) is scanned, and per-stage
+keyword hit counts are kept for a window of the last ``window_chars``
+characters and, optionally, ``window_seconds``. Hits that slide out of
+the window are expired, so the current stage and confidence are always
+ready — retrieval reads them without touching the text, and the UI can
+show the stage as the call moves.
+
+Scoring, scale disambiguation and the continuity bias are the detector's
+own (``StageDetector.score_stages``); the window plays the role of the
+context tail ``detect`` would have been given. The window only holds
+completed segments, so retrieval passes the active text (which may end in
+an incomplete segment) as ``pending``: its keywords count for that read,
+as the active text did when it was appended to the context tail, without
+entering the window.
+
+Segments arrive on the event-loop thread while the analysis worker and the
+prefetch thread read the stage, so every access holds the tracker's lock.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable
+
+from .stage_detector import _SCALE_KEY, StageDetector
+
+# Same span of conversation the retriever used to hand the detector.
+DEFAULT_WINDOW_CHARS = 500
+
+_WORD_RE = re.compile(r"\S+")
+
+
+class StreamingStageTracker:
+    """Keeps the detected stage current as transcript segments arrive."""
+
+    def __init__(
+        self,
+        detector: StageDetector,
+        window_chars: int = DEFAULT_WINDOW_CHARS,
+        window_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            detector: Supplies the compiled keyword table and the scoring.
+            window_chars: Keyword hits older than the last this-many characters expire.
+            window_seconds: If set, hits from segments older than this also expire.
+        """
+        self.detector = detector
+        self.window_chars = window_chars
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._matcher = detector._keyword_matcher()
+        self._context_words = detector._SCALE_TECH_CONTEXT | detector._SCALE_TEMP_CONTEXT
+        self._lock = threading.Lock()
+
+        self.stage: str | None = None
+        self.confidence = 0.0
+        self._reset()
+
+    @property
+    def has_text(self) -> bool:
+        return self._end > 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._tail = ""  # lowercased end of the transcript, kept for keywords spanning segments
+        self._end = 0  # absolute character offset of the transcript end
+        self._occurrences: deque[tuple[int, float, str]] = deque()  # (start offset, time, keyword)
+        self._keyword_counts: Counter = Counter()
+        self._stage_hits: Counter = Counter()  # distinct keywords in the window, per stage
+        self._words: deque[tuple[int, float, str]] = deque()  # scale-context words in the window
+        self._word_counts: Counter = Counter()
+        self.stage = None
+        self.confidence = 0.0
+
+    def observe(self, text: str, at: float | None = None) -> tuple[str, float]:
+        """Consume one transcript segment; returns the updated ``(stage, confidence)``."""
+        text_lower = text.strip().lower()
+        if not text_lower:
+            return self.current()
+        with self._lock:
+            return self._observe(text_lower, self._clock() if at is None else at)
+
+    def _observe(self, text_lower: str, at: float) -> tuple[str, float]:
+        # Segments are joined with spaces, as in the buffer's context text
+        separator = " " if self._end else ""
+        previous_end = self._end
+        tail_start = self._end - len(self._tail)
+        self._tail += separator + text_lower
+        self._end += len(separator) + len(text_lower)
+
+        # Rescan a keyword's length of old text so matches spanning the boundary are found, and keep only
+        # matches that reach into the new text (the rest were counted when that text arrived).
+        overlap = max(0, len(self._tail) - len(text_lower) - len(separator) - (self._matcher.max_keyword_length - 1))
+        for start, keyword in self._matcher.occurrences(self._tail, overlap):
+            start += tail_start
+            if start + len(keyword) > previous_end:
+                self._add_keyword(start, at, keyword)
+        new_text_start = previous_end + len(separator)
+        for match in _WORD_RE.finditer(text_lower):
+            if match.group() in self._context_words:
+                self._add_word(new_text_start + match.start(), at, match.group())
+
+        keep = self.window_chars + self._matcher.max_keyword_length
+        if len(self._tail) > keep:
+            self._tail = self._tail[-keep:]
+
+        self._expire(at)
+        self._rescore()
+        return self.stage, self.confidence
+
+    def current(self, now: float | None = None, pending: str = "") -> tuple[str, float]:
+        """The current ``(stage, confidence)``; only does work when time-based expiry drops hits.
+
+        ``pending`` is text not (yet) observed, such as the active buffer with
+        its incomplete segment: keywords the window lacks are counted for this
+        read only, with the tracked stage as continuity.
+        """
+        with self._lock:
+            if self.window_seconds is not None and self._expire(self._clock() if now is None else now):
+                self._rescore()
+            if pending.strip():
+                scored = self._score_with(pending.lower())
+                if scored is not None:
+                    return scored
+            if self.stage is None:
+                return ("part_1_open", 0.0)
+            return self.stage, self.confidence
+
+    def _score_with(self, pending_lower: str) -> tuple[str, float] | None:
+        """Score the window plus ``pending_lower``; None if the pending text adds no keyword or context word."""
+        new_keywords = {
+            keyword for _, keyword in self._matcher.occurrences(pending_lower) if keyword not in self._keyword_counts
+        }
+        present = {word for word, count in self._word_counts.items() if count > 0}
+        new_words = ({match.group() for match in _WORD_RE.finditer(pending_lower)} & self._context_words) - present
+        if not new_keywords and not new_words:
+            return None
+        stage_hits = Counter(self._stage_hits)
+        for keyword in new_keywords:
+            stage_hits.update(self._matcher.stages_for(keyword))
+        return self._score(stage_hits, present | new_words, current_stage=self.stage)
+
+    def _add_keyword(self, start: int, at: float, keyword: str) -> None:
+        self._occurrences.append((start, at, keyword))
+        self._keyword_counts[keyword] += 1
+        if self._keyword_counts[keyword] == 1:
+            self._stage_hits.update(self._matcher.stages_for(keyword))
+
+    def _add_word(self, start: int, at: float, word: str) -> None:
+        self._words.append((start, at, word))
+        self._word_counts[word] += 1
+
+    def _expire(self, now: float) -> bool:
+        """Drop hits that left the window; True if anything was dropped."""
+        window_start = self._end - self.window_chars
+        oldest = now - self.window_seconds if self.window_seconds is not None else float("-inf")
+        dropped = False
+        while self._occurrences and (self._occurrences[0][0] < window_start or self._occurrences[0][1] < oldest):
+            _, _, keyword = self._occurrences.popleft()
+            self._keyword_counts[keyword] -= 1
+            if self._keyword_counts[keyword] == 0:
+                del self._keyword_counts[keyword]
+                self._stage_hits.subtract(self._matcher.stages_for(keyword))
+            dropped = True
+        while self._words and (self._words[0][0] < window_start or self._words[0][1] < oldest):
+            _, _, word = self._words.popleft()
+            self._word_counts[word] -= 1
+            dropped = True
+        return dropped
+
+    def _rescore(self) -> None:
+        present = {word for word, count in self._word_counts.items() if count > 0}
+        self.stage, self.confidence = self._score(self._stage_hits, present, current_stage=self.stage)
+
+    def _score(self, stage_hits: Counter, present_words: set[str], current_stage: str | None) -> tuple[str, float]:
+        has_scale = stage_hits[_SCALE_KEY] > 0
+        scale_context = None
+        if has_scale:
+            scale_context = self.detector._scale_context_from_hits(
+                len(present_words & self.detector._SCALE_TECH_CONTEXT),
+                len(present_words & self.detector._SCALE_TEMP_CONTEXT),
+            )
+        return self.detector.score_stages(stage_hits, has_scale, scale_context, current_stage=current_stage)
@@ -6,9 +6,33 @@ and querying sales script chunks. Uses all-MiniLM-L6-v2 (384 dims) for
 generating embeddings.
 """
 
+import threading
+
 import chromadb
 from chromadb.utils import embedding_functions
 
+try:
+    from .embeddings import DEFAULT_EMBEDDING_MODEL, QueryCacheStats, get_query_embedding_cache
+except ImportError:  # run as a script (see __main__ below)
+    from embeddings import DEFAULT_EMBEDDING_MODEL, QueryCacheStats, get_query_embedding_cache
+
+_embedding_fns: dict[str, object] = {}
+_embedding_fns_lock = threading.Lock()
+
+
+def get_shared_embedding_function(model_name: str = DEFAULT_EMBEDDING_MODEL):
+    """Return the process-wide sentence-transformer embedding function for ``model_name``.
+
+    Loading the model is the slow part of opening a store; every store in the
+    process shares one instance per model.
+    """
+    with _embedding_fns_lock:
+        if model_name not in _embedding_fns:
+            _embedding_fns[model_name] = embedding_functions.SentenceTransformerEmbeddingFunction(
+                model_name=model_name
+            )
+        return _embedding_fns[model_name]
+
 
 class EmbeddingStore:
     """Vector store backed by ChromaDB with sentence-transformer embeddings."""
@@ -17,6 +41,7 @@ class EmbeddingStore:
         self,
         collection_name: str = "sales_script",
         persist_dir: str | None = None,
+        embedding_fn=None,
     ):
         """Initialize ChromaDB client and collection.
 
@@ -24,10 +49,12 @@ class EmbeddingStore:
             collection_name: Name of the ChromaDB collection.
             persist_dir: If None, use in-memory (ephemeral) storage.
                          If set, persist embeddings to this directory.
+            embedding_fn: Embedding function to use instead of the shared
+                          all-MiniLM-L6-v2 instance (e.g. in tests).
         """
-        self._embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
-        )
+        self._embedding_fn = embedding_fn or get_shared_embedding_function()
+        # Stores with the same key embed queries identically, so one query vector serves them all
+        self.embedding_key = DEFAULT_EMBEDDING_MODEL if embedding_fn is None else f"custom:{id(embedding_fn)}"
 
         if persist_dir:
             self._client = chromadb.PersistentClient(path=persist_dir)
@@ -40,7 +67,7 @@ class EmbeddingStore:
         )
 
     def add_chunks(self, chunks: list[dict]) -> None:
-        """Embed and store chunks in the collection.
+        """Embed and store chunks in the collection (chunks with an existing id replace it).
 
         Args:
             chunks: List of chunk dicts, each with 'id', 'text', and 'metadata'.
@@ -66,7 +93,7 @@ class EmbeddingStore:
                     clean_meta[k] = v
             metadatas.append(clean_meta)
 
-        self._collection.add(
+        self._collection.upsert(
             ids=ids,
             documents=documents,
             metadatas=metadatas,
@@ -89,8 +116,33 @@ class EmbeddingStore:
             List of result dicts, each with 'id', 'text', 'metadata', 'distance'.
             Results are sorted by distance (closest first).
         """
+        return self.query_by_vector(self.embed_query(text), top_k=top_k, where=where)
+
+    def embed_query(self, text: str, stats: QueryCacheStats | None = None) -> list[float]:
+        """Embed query text with this store's model (reusable with ``query_by_vector``); cached per process.
+
+        ``stats`` tallies the cache lookup for the caller's session.
+        """
+        return get_query_embedding_cache().get_or_embed(
+            self.embedding_key, text, lambda query: [float(x) for x in self._embedding_fn([query])[0]], stats
+        )
+
+    def query_by_vector(
+        self,
+        vector: list[float],
+        top_k: int = 3,
+        where: dict | None = None,
+    ) -> list[dict]:
+        """Query with a pre-computed query embedding (from ``embed_query`` on a store with the same key).
+
+        Returns:
+            Same result dicts as ``query``.
+        """
+        return self._query({"query_embeddings": [vector]}, top_k, where)
+
+    def _query(self, query: dict, top_k: int, where: dict | None) -> list[dict]:
         kwargs = {
-            "query_texts": [text],
+            **query,
             "n_results": min(top_k, self._collection.count()),
         }
         if where:
@@ -117,6 +169,11 @@ class EmbeddingStore:
         """Return number of stored chunks."""
         return self._collection.count()
 
+    def delete(self, ids: list[str]) -> None:
+        """Remove chunks by id."""
+        if ids:
+            self._collection.delete(ids=list(ids))
+
 
 if __name__ == "__main__":
     import os
@@ -2,21 +2,32 @@ import json
 import logging
 import os
 import queue
+import statistics
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Callable, Optional
 
-from openai import OpenAI
-
+from .compression import TRANSCRIPT_COMPRESSION, TranscriptCompressor
+from .degradation import DegradationController
+from .gatekeeper import Gatekeeper, Priority, get_gatekeeper
+from .http_clients import get_openai_client, warm_connection
 from .models import ConversationState
+from .novelty_gate import NoveltyGate
 from .prompts import (
     build_untrusted_transcript_message,
+    get_compact_guidance_prompt,
     get_rag_guidance_prompt,
     get_recommendation_prompt,
     get_script_guidance_prompt,
     load_script,
 )
+from .provider_router import DispatchOutcome, ProviderRouter, RouteTarget
+from .retrieval_prefetch import RETRIEVAL_PREFETCH, RetrievalPrefetcher
+from .stage_classifier import StageClassification, StageClassifier
+from .token_budget import TokenBudget, estimate_messages_tokens, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -26,12 +37,53 @@ SCRIPT_CONTENT = load_script()
 # RAG toggle — set USE_RAG=true in .env to use retrieval-augmented prompts
 USE_RAG = os.getenv("USE_RAG", "false").lower() in ("true", "1", "yes")
 
+# Local stage classifier — when confident, the LLM is given script_location instead of asked for it
+LOCAL_STAGE_CLASSIFIER = os.getenv("LOCAL_STAGE_CLASSIFIER", "true").lower() in ("true", "1", "yes")
+
+# Guidance older than this (seconds after the speech started) is no longer current; 0 disables deadlines
+ANALYSIS_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_DEADLINE_SECONDS", "6"))
+
+# Output token caps: full JSON schema vs. the suggestion-only schema used near the deadline
+FULL_MAX_TOKENS = 500
+COMPACT_MAX_TOKENS = 120
+
+# Time to first suggestion of each session (trigger → first streamed chunk), split by whether
+# the session's warmup had completed, so the effect of warmup can be compared.
+_first_suggestion_lock = threading.Lock()
+_first_suggestion_ms: dict[str, deque[float]] = {"warm": deque(maxlen=200), "cold": deque(maxlen=200)}
+
+
+def record_first_suggestion(latency_ms: float, warmed: bool) -> None:
+    with _first_suggestion_lock:
+        _first_suggestion_ms["warm" if warmed else "cold"].append(latency_ms)
+
+
+def first_suggestion_stats() -> dict:
+    """Per-session time to first suggestion, with and without a completed warmup."""
+    with _first_suggestion_lock:
+        samples = {key: list(values) for key, values in _first_suggestion_ms.items()}
+    return {
+        key: {
+            "sessions": len(values),
+            "p50_ms": round(statistics.median(values), 1) if values else None,
+            "avg_ms": round(statistics.fmean(values), 1) if values else None,
+        }
+        for key, values in samples.items()
+    }
+
+
+class DeadlineExceeded(TimeoutError):
+    """The primary model timed out with no deadline budget left for the fallback."""
+
 
 @dataclass
 class AnalysisRequest:
     active_text: str
     context_text: str
     timestamp: float
+    speech_time: Optional[float] = None  # when the analyzed speech started (wall clock)
+    deadline: Optional[float] = None  # guidance arriving after this is tagged late
+    llm_started: bool = False  # first LLM chunk streamed; a fast-path rebuttal would now be stale
 
 
 @dataclass
@@ -42,6 +94,7 @@ class AnalysisResult:
     latency_ms: float
     state: ConversationState
     error: Optional[str] = None
+    late: bool = False  # finished after the request's deadline; not current guidance
 
 
 @dataclass
@@ -53,113 +106,254 @@ class AnalysisStreamChunk:
     accumulated: str
     sequence: int
     model: str
+    late: bool = False  # streamed past the request's deadline; not the current suggestion
+
+
+@dataclass
+class FastPathSuggestion:
+    """Script rebuttal sent before the LLM answers (zero-LLM objection fast path)."""
+
+    active_text: str
+    objection: str
+    suggestion: str
+    chunk_id: str
+    confidence: float
+    timestamp: float
+    latency_ms: float
+
+
+def _rag_module(name: str):
+    """Import a module of the RAG package (lives under src/rag, imported as ``rag``)."""
+    import importlib
+    import sys
+
+    # Ensure src/ is importable (needed when running from project root in Docker)
+    src_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    return importlib.import_module(f"rag.{name}")
+
+
+def _rag_pipeline_module():
+    """Import the shared RAG pipeline module."""
+    return _rag_module("pipeline")
+
+
+def start_rag_pipeline() -> None:
+    """Start building the shared RAG pipeline in the background at app startup (no-op unless USE_RAG)."""
+    if USE_RAG:
+        _rag_pipeline_module().start_rag_pipeline_build()
+
+
+def query_embedding_cache_stats() -> Optional[dict]:
+    """Process-wide query-embedding cache stats, or None when RAG is off."""
+    if not USE_RAG:
+        return None
+    return _rag_module("embeddings").get_query_embedding_cache().stats()
 
 
 class StreamingAnalyzer:
-    def __init__(self, api_key: str, base_url: str, model: str, fallback_model: Optional[str] = None):
-        self.client = OpenAI(base_url=base_url, api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        model: str,
+        fallback_model: Optional[str] = None,
+        token_budget: Optional[TokenBudget] = None,
+        router: Optional[ProviderRouter] = None,
+        gatekeeper: Optional[Gatekeeper] = None,
+    ):
+        self.client = get_openai_client(base_url=base_url, api_key=api_key)
+        self.base_url = base_url
         self.model = model
         self.fallback_model = fallback_model
+        self.token_budget = token_budget or TokenBudget()
+        self.compressor = TranscriptCompressor() if TRANSCRIPT_COMPRESSION else None
+        self.router = router
+        self.gatekeeper = gatekeeper
         self.retriever = None
-
+        self.stage_classifier: Optional[StageClassifier] = None
+        self.last_location: Optional[StageClassification] = None
+        # "cold" until warmup() finishes: "warm", "skipped" (rate-limited provider) or "failed"
+        self.warmup_state = "cold"
+        self.warmup_ms: Optional[float] = None
+        self._last_location_key: Optional[tuple[str, str]] = None
+        if LOCAL_STAGE_CLASSIFIER:
+            try:
+                self.stage_classifier = StageClassifier()
+            except Exception as e:
+                logger.warning(f"Local stage classifier disabled: {e}")
+
+        self._rag_pending = False
+        self.retrieval_prefetcher: Optional[RetrievalPrefetcher] = None
+        # Forked from the session retriever on first prefetch; only the prefetch thread uses it
+        self._prefetch_retriever = None
+        # This session's share of the process-wide query-embedding cache
+        self.embedding_stats = _rag_module("embeddings").QueryCacheStats() if USE_RAG else None
         if USE_RAG:
-            self._init_rag()
+            if RETRIEVAL_PREFETCH:
+                self.retrieval_prefetcher = RetrievalPrefetcher(self._prefetch_retrieve)
+            self._init_rag(wait=False)
             self.system_prompt = None  # built per-request from retrieved sections
         else:
             self.system_prompt = get_script_guidance_prompt(SCRIPT_CONTENT)
 
-    def _init_rag(self):
-        """Initialize the RAG pipeline: chunk → embed → retriever.
+    def _init_rag(self, wait: bool = True) -> None:
+        """Attach a per-session retriever over the process-wide RAG pipeline.
 
-        Loads pre-built embeddings from disk if available (built via
-        `python src/rag/build.py`). Falls back to in-memory embedding
-        if no persisted store exists.
+        The pipeline (chunks, embedding stores, sentence-transformer) is built
+        once per process and shared. With ``wait=False`` (session start) this
+        never blocks: if the pipeline is still building, the session uses the
+        script prompt until ``_session_retriever()`` finds it ready.
         """
-        import sys
-
-        # Ensure src/ is importable (needed when running from project root in Docker)
-        src_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
-        if src_dir not in sys.path:
-            sys.path.insert(0, src_dir)
-
-        from rag.chunker import chunk_methodology, chunk_script
-        from rag.retriever import ScriptRetriever
-        from rag.stage_detector import StageDetector
-        from rag.store import EmbeddingStore
-
-        knowledge_base_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "knowledge_base"))
-        script_path = os.path.join(knowledge_base_dir, "kubecraft_script.md")
-        methodology_path = os.path.join(knowledge_base_dir, "hardly_selling_methodology.md")
-        persist_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "chromadb"))
-
-        # Always need chunks for the stage detector / retriever
-        logger.info("RAG: Chunking sales script...")
-        chunks = chunk_script(script_path)
-        logger.info(f"RAG: {len(chunks)} chunks parsed")
-        methodology_chunks = []
-        if os.path.exists(methodology_path):
-            logger.info("RAG Layer 2: Chunking Hardly Selling methodology...")
-            methodology_chunks = chunk_methodology(methodology_path)
-            logger.info(f"RAG Layer 2: {len(methodology_chunks)} methodology chunks parsed")
-        else:
-            logger.warning("RAG Layer 2 disabled: %s not found", methodology_path)
-
-        # Try loading pre-built embeddings from disk
-        if os.path.exists(persist_dir):
-            store = EmbeddingStore(collection_name="sales_script", persist_dir=persist_dir)
-            if store.count() > 0:
-                logger.info(f"RAG: Loaded {store.count()} pre-built embeddings from {persist_dir}")
-            else:
-                logger.warning("RAG: Persist dir exists but empty — embedding in-memory")
-                store = EmbeddingStore(collection_name="sales_script")
-                store.add_chunks(chunks)
-                logger.info(f"RAG: {store.count()} chunks embedded (in-memory)")
-        else:
-            logger.info(
-                "RAG: No pre-built store found — embedding in-memory (run `python src/rag/build.py` to persist)"
-            )
-            store = EmbeddingStore(collection_name="sales_script")
-            store.add_chunks(chunks)
-            logger.info(f"RAG: {store.count()} chunks embedded (in-memory)")
-
-        detector = StageDetector()
-        self.retriever = ScriptRetriever(store, detector, chunks)
-        if methodology_chunks:
-            methodology_store = self._build_methodology_store(EmbeddingStore, methodology_chunks, persist_dir)
-            if methodology_store is not None:
-                self.retriever.add_source(methodology_store)
-                logger.info("RAG Layer 2: Hardly Selling methodology source enabled")
-        logger.info("RAG: Pipeline ready")
-
-    def _build_methodology_store(self, store_cls, methodology_chunks: list[dict], persist_dir: str):
-        """Build or load the optional Hardly Selling methodology source."""
-        try:
-            if os.path.exists(persist_dir):
-                methodology_store = store_cls(
-                    collection_name="hardly_selling_methodology",
-                    persist_dir=persist_dir,
-                )
-                if methodology_store.count() == 0:
-                    methodology_store.add_chunks(methodology_chunks)
-            else:
-                methodology_store = store_cls(collection_name="hardly_selling_methodology")
-                methodology_store.add_chunks(methodology_chunks)
-            logger.info("RAG Layer 2: %s methodology chunks ready", methodology_store.count())
-            return methodology_store
-        except Exception as e:
-            logger.warning("RAG Layer 2 disabled: failed to initialize methodology source: %s", e)
-            return None
-
-    def _retrieve_context_sections(self, active_text: str, context_text: str, top_k: int = 3) -> list[str]:
-        """Retrieve RAG sections and preserve source metadata for prompts."""
-        if not self.retriever:
+        rag_pipeline = _rag_pipeline_module()
+        pipeline = rag_pipeline.get_rag_pipeline() if wait else rag_pipeline.get_rag_pipeline_if_ready()
+        if pipeline is not None:
+            self.retriever = pipeline.session_retriever()
+            self.retriever.embedding_stats = self.embedding_stats
+            self._rag_pending = False
+            return
+        if not wait:
+            rag_pipeline.start_rag_pipeline_build()
+        self._rag_pending = rag_pipeline.rag_pipeline_state() == "building"
+
+    def _session_retriever(self):
+        """This session's retriever, attaching it once a background pipeline build has finished."""
+        if self.retriever is None and self._rag_pending:
+            self._init_rag(wait=False)
+        return self.retriever
+
+    def _retrieve_context_sections(
+        self, active_text: str, context_text: str, top_k: int = 3, retriever=None
+    ) -> list[str]:
+        """Retrieve RAG sections (with the session retriever by default) and preserve source metadata for prompts."""
+        retriever = retriever or self._session_retriever()
+        if not retriever:
             return []
 
-        if hasattr(self.retriever, "retrieve_with_metadata"):
-            sections = self.retriever.retrieve_with_metadata(active_text, context_text, top_k=top_k)
+        if hasattr(retriever, "retrieve_with_metadata"):
+            sections = retriever.retrieve_with_metadata(active_text, context_text, top_k=top_k)
             return [self._format_retrieved_section(section) for section in sections]
 
-        return self.retriever.retrieve(active_text, context_text, top_k=top_k)
+        return retriever.retrieve(active_text, context_text, top_k=top_k)
+
+    def prefetch_retrieval(self, active_text: str, context_text: str) -> None:
+        """Start retrieval for the current buffer payload in the background."""
+        if self.retrieval_prefetcher is not None and self._session_retriever():
+            self.retrieval_prefetcher.submit(active_text, context_text)
+
+    def _rag_sections(self, active_text: str, context_text: str) -> list[str]:
+        """Sections for one request: prefetched for this (possibly shortened) context if ready, else retrieved now."""
+        sections = self.retrieval_prefetcher.sections(context_text) if self.retrieval_prefetcher is not None else None
+        if sections is None:
+            active_text = self.token_budget.fit_active(active_text)
+            context_text = self.token_budget.fit_context(context_text)
+            sections = self._retrieve_context_sections(active_text, context_text, top_k=3)
+        return sections
+
+    def observe_segment(self, text: str) -> Optional[dict]:
+        """Feed a completed segment to the retriever's stage tracker (buffer ``on_new_segment``).
+
+        Returns the tracked call stage, or None when there is no RAG retriever yet.
+        """
+        retriever = self._session_retriever()
+        observe = getattr(retriever, "observe_segment", None)
+        tracked = observe(text) if observe is not None else None
+        if tracked is None:
+            return None
+        stage, confidence = tracked
+        return {
+            "stage": stage,
+            "part_number": retriever.detector.get_part_number(stage),
+            "stage_hint": retriever.detector.get_stage_hint(stage),
+            "confidence": round(confidence, 3),
+        }
+
+    def _prefetch_retrieve(self, active_text: str, context_text: str) -> list[str]:
+        if self._prefetch_retriever is None:
+            retriever = self._session_retriever()
+            if retriever is None:
+                return []
+            self._prefetch_retriever = retriever.fork()
+        active_text = self.token_budget.fit_active(active_text)
+        context_text = self.token_budget.fit_context(context_text)
+        return self._retrieve_context_sections(active_text, context_text, top_k=3, retriever=self._prefetch_retriever)
+
+    def warmup(self, timeout: float = 10.0) -> Optional[float]:
+        """Prepare the LLM path before the first suggestion of a session.
+
+        Opens the pooled connection, then sends the static guidance system
+        prompt with ``max_tokens=1`` so a local server loads the model and
+        caches the prompt prefix. On rate-limited hosted providers only the
+        connection is opened — a throwaway completion would spend quota.
+
+        Returns:
+            Milliseconds spent, or None if the warmup request failed.
+        """
+        start = time.time()
+        client, model_name, base_url = self.client, self.model, self.base_url
+        gatekeeper = self.gatekeeper
+        if self.router is not None:
+            # Not a routed request: its outcome is never recorded, so it must not claim a half-open probe
+            target = self.router.peek()
+            client = get_openai_client(base_url=target.base_url, api_key=target.api_key)
+            model_name, base_url = target.model, target.base_url
+            gatekeeper = get_gatekeeper(target.provider)
+        warm_connection(base_url, timeout=timeout)
+
+        if gatekeeper is not None and not gatekeeper.unlimited:
+            self.warmup_state = "skipped"
+            self.warmup_ms = (time.time() - start) * 1000
+            logger.info(f"LLM warmup: connection only ({gatekeeper.name} is rate-limited), {self.warmup_ms:.0f}ms")
+            return self.warmup_ms
+
+        system_prompt = self.system_prompt or get_rag_guidance_prompt([])
+        try:
+            client.chat.completions.create(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": build_untrusted_transcript_message("")},
+                ],
+                max_tokens=1,
+                temperature=0,
+                timeout=timeout,
+            )
+        except Exception as e:
+            self.warmup_state = "failed"
+            logger.warning(f"LLM warmup request failed (non-fatal): {e}")
+            return None
+        self.warmup_state = "warm"
+        self.warmup_ms = (time.time() - start) * 1000
+        logger.info(f"LLM warmup: {model_name} ready in {self.warmup_ms:.0f}ms")
+        return self.warmup_ms
+
+    @property
+    def fast_model_available(self) -> bool:
+        """Whether compact/degraded requests can switch to a faster model (the router already picks the fastest)."""
+        return bool(self.fallback_model) and self.router is None
+
+    def classify_location(self, active_text: str, context_text: str = "") -> Optional[StageClassification]:
+        """Locally classify the script location; None when the classifier is disabled or fails."""
+        if self.stage_classifier is None:
+            return None
+        # Primary and fallback attempts of one request share a classification (continuity advances once)
+        if self._last_location_key == (active_text, context_text):
+            return self.last_location
+        try:
+            location = self.stage_classifier.classify(active_text, context_text)
+        except Exception as e:
+            logger.warning(f"Local stage classification failed: {e}")
+            location = None
+        self.last_location = location
+        self._last_location_key = (active_text, context_text)
+        return location
+
+    def fast_path_suggestion(self, active_text: str) -> Optional[dict]:
+        """Return the script's rebuttal for a high-confidence objection, without calling the LLM."""
+        if not self._session_retriever() or not hasattr(self.retriever, "match_objection"):
+            return None
+        return self.retriever.match_objection(active_text)
 
     @staticmethod
     def _format_retrieved_section(section: dict) -> str:
@@ -169,6 +363,15 @@ class StreamingAnalyzer:
         title = metadata.get("section", section.get("id", "unknown"))
         return f"[Source: {source} | Section: {title}]\n{section.get('text', '')}"
 
+    def _admit(self, priority: Priority, messages: list[dict], max_tokens: int, target: Optional[RouteTarget] = None):
+        """Wait for rate-limit capacity on the provider that will serve this request."""
+        gatekeeper = get_gatekeeper(target.provider) if target is not None else self.gatekeeper
+        if gatekeeper is None:
+            return
+        waited = gatekeeper.acquire(priority, estimate_messages_tokens(messages) + max_tokens)
+        if waited >= 0.1:
+            logger.info(f"{priority.name} request waited {waited * 1000:.0f}ms for rate-limit capacity")
+
     def analyze(
         self,
         active_text: str,
@@ -176,36 +379,100 @@ class StreamingAnalyzer:
         on_chunk: Optional[Callable[[str, str], None]] = None,
         model: Optional[str] = None,
         timeout: float = 30,
+        target: Optional[RouteTarget] = None,
+        location: Optional[StageClassification] = None,
+        max_tokens: int = FULL_MAX_TOKENS,
+        compact: bool = False,
+        use_rag: bool = True,
+        max_context_chars: Optional[int] = None,
+        outcome: Optional[DispatchOutcome] = None,
+        sections: Optional[list[str]] = None,
     ) -> str:
-        """Analyze text using streaming LLM responses for lower latency."""
+        """Analyze text using streaming LLM responses for lower latency.
+
+        When ``target`` is given (picked by the provider router) the request
+        goes to that provider and its TTFT/throughput or failure is recorded,
+        unless ``outcome`` was already settled (e.g. the caller timed out).
+        ``location`` is the local stage classification; when confident it is
+        given to the model and ``script_location`` is left out of the schema.
+        ``compact`` switches to the short suggestion-only prompt (no retrieval);
+        ``use_rag=False`` and ``max_context_chars`` shed retrieval and older
+        context when the degradation controller asks for it. ``sections`` are
+        RAG sections already resolved for this request (shared by its attempts).
+        """
+        if location is None:
+            location = self.classify_location(active_text, context_text)
+
+        if max_context_chars is not None:
+            context_text = context_text[-max_context_chars:]
+        if not compact and use_rag and sections is None and self._session_retriever():
+            # Prefetched while the segments arrived; retrieve inline only if nothing usable is ready
+            sections = self._rag_sections(active_text, context_text)
+
+        # Bound transcript input to the provider's token budget (oldest text dropped first)
+        active_text = self.token_budget.fit_active(active_text)
+        context_text = self.token_budget.fit_context(context_text)
         user_message = build_untrusted_transcript_message(active_text, context_text)
+        known_location = (
+            location.label if self.stage_classifier and self.stage_classifier.is_confident(location) else None
+        )
 
         # Build system prompt — RAG retrieves relevant sections per-request
-        if self.retriever:
-            sections = self._retrieve_context_sections(active_text, context_text, top_k=3)
-            system_prompt = get_rag_guidance_prompt(sections)
+        if compact:
+            system_prompt = get_compact_guidance_prompt(known_location)
+        elif use_rag and sections is not None:
+            sections = self.token_budget.fit_sections(sections, estimate_tokens(get_rag_guidance_prompt([])))
+            system_prompt = get_rag_guidance_prompt(sections, known_location)
+        elif known_location or self.system_prompt is None:
+            system_prompt = get_script_guidance_prompt(SCRIPT_CONTENT, known_location)
         else:
             system_prompt = self.system_prompt
 
+        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_message}]
+        logger.debug(f"Analysis prompt ~{estimate_messages_tokens(messages)} tokens")
+
+        client = self.client
         model_name = model or self.model
-        response = self.client.chat.completions.create(
-            model=model_name,
-            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_message}],
-            max_tokens=500,
-            temperature=0.1,
-            timeout=timeout,
-            stop=["<|end|>", "<|end_of_text|>", "<|im_end|>", "\n\n"],
-            stream=True,
-        )
+        if target is not None:
+            client = get_openai_client(base_url=target.base_url, api_key=target.api_key)
+            model_name = target.model
 
-        # Collect streaming chunks into full response
+        self._admit(Priority.LIVE, messages, max_tokens, target)
+        start = time.time()
+        first_token_at: Optional[float] = None
         chunks = []
-        for chunk in response:
-            if chunk.choices and chunk.choices[0].delta.content:
-                delta = chunk.choices[0].delta.content
-                chunks.append(delta)
-                if on_chunk:
-                    on_chunk(delta, "".join(chunks))
+        try:
+            response = client.chat.completions.create(
+                model=model_name,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.1,
+                timeout=timeout,
+                stop=["<|end|>", "<|end_of_text|>", "<|im_end|>", "\n\n"],
+                stream=True,
+            )
+
+            # Collect streaming chunks into full response
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if first_token_at is None:
+                        first_token_at = time.time()
+                    delta = chunk.choices[0].delta.content
+                    chunks.append(delta)
+                    if on_chunk:
+                        on_chunk(delta, "".join(chunks))
+        except Exception as e:
+            if target is not None and self.router is not None and (outcome is None or outcome.claim()):
+                self.router.record_failure(target, e)
+            raise
+
+        if target is not None and self.router is not None and (outcome is None or outcome.claim()):
+            end = time.time()
+            first_token_at = first_token_at or end
+            streaming_secs = end - first_token_at
+            tokens_per_sec = len(chunks) / streaming_secs if streaming_secs > 0 and len(chunks) > 1 else None
+            self.router.record_success(target, (first_token_at - start) * 1000, tokens_per_sec)
+
         content = "".join(chunks)
 
         # Clean markdown
@@ -222,17 +489,61 @@ class StreamingAnalyzer:
         context_text: str = "",
         timeout: float = 5.0,
         on_chunk: Optional[Callable[[str, str, str], None]] = None,
+        max_tokens: Optional[int] = None,
+        compact: bool = False,
+        fast_model_only: bool = False,
+        use_rag: bool = True,
+        max_context_chars: Optional[int] = None,
+        deadline: Optional[float] = None,
     ) -> str:
         """Analyze with a bounded primary wait and optional fallback model.
 
         The primary call runs with the primary model name captured as an
         argument. If it times out, late primary chunks are suppressed so they
-        cannot overwrite fallback output in the UI.
+        cannot overwrite fallback output in the UI. The fallback gets what is
+        left until ``deadline`` (wall clock), or raises ``DeadlineExceeded``
+        when nothing is left. With several router targets the fallback is the
+        next healthy target (routed like the primary), not ``fallback_model``.
+
+        ``compact``/``max_tokens`` come from the orchestrator when a request is
+        close to its deadline; compact requests go straight to the fallback
+        model when one is configured, as there is no time for two attempts.
+        The remaining keyword arguments are degradation overrides under load.
         """
         result: list[Optional[str]] = [None]
         error: list[Optional[Exception]] = [None]
         suppress_primary_chunks = threading.Event()
         primary_model = self.model
+        route_kwargs = {}
+        self.classify_location(active_text, context_text)
+        budget_kwargs = {}
+        if max_tokens is not None:
+            budget_kwargs["max_tokens"] = max_tokens
+        if not use_rag:
+            budget_kwargs["use_rag"] = False
+        if max_context_chars is not None:
+            budget_kwargs["max_context_chars"] = max_context_chars
+        if compact:
+            budget_kwargs["compact"] = True
+        elif use_rag and self._session_retriever():
+            # Resolved once per request, so a fallback attempt neither re-reads the prefetcher nor retrieves again
+            truncated_context = context_text[-max_context_chars:] if max_context_chars is not None else context_text
+            budget_kwargs["sections"] = self._rag_sections(active_text, truncated_context)
+        if (compact or fast_model_only) and self.fast_model_available:
+            fast_model = self.fallback_model
+
+            def fast_chunk(delta: str, accumulated: str) -> None:
+                if on_chunk:
+                    on_chunk(delta, accumulated, fast_model)
+
+            return self.analyze(
+                active_text, context_text, on_chunk=fast_chunk, model=fast_model, timeout=timeout, **budget_kwargs
+            )
+        if self.router is not None:
+            target = self.router.select()
+            primary_model = target.model
+            route_kwargs["target"] = target
+            route_kwargs["outcome"] = DispatchOutcome()
 
         def primary_chunk(delta: str, accumulated: str) -> None:
             if on_chunk and not suppress_primary_chunks.is_set():
@@ -246,6 +557,8 @@ class StreamingAnalyzer:
                     on_chunk=primary_chunk,
                     model=primary_model,
                     timeout=timeout,
+                    **route_kwargs,
+                    **budget_kwargs,
                 )
             except Exception as e:
                 error[0] = e
@@ -258,8 +571,24 @@ class StreamingAnalyzer:
             return result[0] or ""
 
         suppress_primary_chunks.set()
-        if self.fallback_model:
+        primary_target = route_kwargs.get("target")
+        if thread.is_alive() and primary_target is not None and route_kwargs["outcome"].claim():
+            # The stream may still finish; its late success must not close the breaker
+            self.router.record_failure(primary_target, TimeoutError(f"no response within {timeout}s"))
+        routed_fallback = primary_target is not None and len(self.router.targets) > 1
+        if self.fallback_model or routed_fallback:
             fallback_model = self.fallback_model
+            fallback_timeout = 30.0
+            if deadline is not None:
+                fallback_timeout = deadline - time.time()
+                if fallback_timeout <= 0:
+                    raise DeadlineExceeded(f"Primary model timed out after {timeout}s with no time left for fallback")
+            fallback_kwargs = {}
+            if routed_fallback:
+                # The next healthy target, so the fallback also feeds its breaker and latency stats
+                fallback_target = self.router.select(exclude={primary_target.name})
+                fallback_model = fallback_target.model
+                fallback_kwargs = {"target": fallback_target, "outcome": DispatchOutcome()}
 
             def fallback_chunk(delta: str, accumulated: str) -> None:
                 if on_chunk:
@@ -270,7 +599,9 @@ class StreamingAnalyzer:
                 context_text,
                 on_chunk=fallback_chunk,
                 model=fallback_model,
-                timeout=30,
+                timeout=fallback_timeout,
+                **fallback_kwargs,
+                **budget_kwargs,
             )
 
         if error[0]:
@@ -289,17 +620,35 @@ class StreamingAnalyzer:
         """
         return self.analyze_with_fallback(text, timeout=timeout)
 
-    def recommend(self, summary: str, key_points: list[str], stage: str, context_text: str = "") -> str:
+    def recommendation_sections(self, summary: str, context_text: str = "") -> list[str]:
+        """Playbook sections for a recommendation prompt, retrieved with the summary and (compressed) transcript."""
+        if not (summary and self._session_retriever()):
+            return []
+        if self.compressor is not None:
+            # Salient sentences from the whole call beat only its most recent tail
+            context_text = self.compressor.compress(
+                context_text, max_tokens=self.token_budget.recommendation_context
+            ).text
+        context_text = self.token_budget.fit_recommendation_context(context_text)
+        rag_sections = self._retrieve_context_sections(summary, context_text, top_k=3)
+        return self.token_budget.fit_sections(rag_sections)
+
+    def recommend(
+        self,
+        summary: str,
+        key_points: list[str],
+        stage: str,
+        context_text: str = "",
+        priority: Priority = Priority.RECOMMENDATION,
+    ) -> str:
         """
         Generate stage-specific recommendations using semantic blueprints.
 
         Takes the current summary, detected stage, and RAG context to
         produce tailored questions via the appropriate blueprint prompt.
+        Speculative (precomputed) calls pass a lower ``priority``.
         """
-        # Get RAG sections for script context
-        rag_sections = []
-        if self.retriever and summary:
-            rag_sections = self._retrieve_context_sections(summary, context_text, top_k=3)
+        rag_sections = self.recommendation_sections(summary, context_text)
 
         # Build the stage-specific blueprint prompt
         system_prompt = get_recommendation_prompt(
@@ -309,12 +658,14 @@ class StreamingAnalyzer:
             rag_sections=rag_sections,
         )
 
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "Generate recommendations now."},
+        ]
+        self._admit(priority, messages, 600)
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Generate recommendations now."},
-            ],
+            messages=messages,
             max_tokens=600,
             temperature=0.2,
             timeout=30,
@@ -337,29 +688,190 @@ class AnalysisOrchestrator:
         on_result: Callable[[AnalysisResult], None],
         on_partial: Optional[Callable[[AnalysisStreamChunk], None]] = None,
         fallback_timeout_seconds: float = 5.0,
+        on_fast_path: Optional[Callable[[FastPathSuggestion], None]] = None,
+        novelty_gate: Optional[NoveltyGate] = None,
+        deadline_seconds: float = ANALYSIS_DEADLINE_SECONDS,
+        min_remaining_seconds: float = 0.75,
+        compact_below_seconds: float = 2.5,
+        degradation: Optional[DegradationController] = None,
     ):
+        """
+        Args:
+            deadline_seconds: Guidance budget measured from when the speech started; 0 disables deadlines.
+            min_remaining_seconds: Requests with less budget left than this are dropped unanswered.
+            compact_below_seconds: Below this much budget, use the suggestion-only schema and token cap.
+            degradation: Optional controller that sheds model/RAG/context/schema cost under backlog.
+        """
         self.analyzer = analyzer
         self.on_result = on_result
         self.on_partial = on_partial
+        self.on_fast_path = on_fast_path
+        # Objection matching embeds the utterance, so it runs off the caller's (event loop) thread
+        self._fast_path_pool = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="objection-fast-path") if on_fast_path else None
+        )
+        self.novelty_gate = novelty_gate
         self.fallback_timeout_seconds = fallback_timeout_seconds
         self.queue = queue.Queue()
         self.running = False
         self.worker_thread = None
+        # Time from analysis trigger to first guidance shown, per path (ms)
+        self._first_guidance_ms: dict[str, deque[float]] = {"fast_path": deque(maxlen=500), "llm": deque(maxlen=500)}
+        self.deadline_seconds = deadline_seconds
+        self.min_remaining_seconds = min_remaining_seconds
+        self.compact_below_seconds = compact_below_seconds
+        self.degradation = degradation
+        self._first_suggestion_recorded = False
+        self._deadline_counts = {"met": 0, "late": 0, "dropped": 0, "errored": 0, "compact": 0}
 
     def start(self):
         self.running = True
+        if self.degradation is not None:
+            self.degradation.register_queue(self.queue)
         self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
         self.worker_thread.start()
 
     def shutdown(self):
         self.running = False
+        if self.degradation is not None:
+            self.degradation.unregister_queue(self.queue)
         if self.worker_thread:
             self.worker_thread.join(timeout=1.0)
-
-    def submit_analysis(self, active_text: str, context_text: str):
-        req = AnalysisRequest(active_text, context_text, time.time())
+        if self._fast_path_pool is not None:
+            self._fast_path_pool.shutdown(wait=False, cancel_futures=True)
+        stats = self.guidance_latency_stats()
+        if stats["llm"]["count"] or stats["fast_path"]["count"]:
+            logger.info(f"Time to first guidance: {stats}")
+        if self.novelty_gate is not None and self.novelty_gate.checked:
+            logger.info(f"Novelty gate: {self.novelty_gate.stats()}")
+        deadlines = self.deadline_stats()
+        if deadlines["requests"]:
+            logger.info(f"Analysis deadlines: {deadlines}")
+        prefetcher = getattr(self.analyzer, "retrieval_prefetcher", None)
+        if isinstance(prefetcher, RetrievalPrefetcher):
+            prefetcher.close()
+            prefetch = prefetcher.stats()
+            if prefetch["submitted"]:
+                logger.info(f"Retrieval prefetch: {prefetch}")
+        embedding_cache = self.embedding_cache_stats()
+        if embedding_cache and embedding_cache["hits"] + embedding_cache["misses"]:
+            logger.info(f"Query embedding cache this call: {embedding_cache}")
+
+    def submit_analysis(self, active_text: str, context_text: str, speech_time: Optional[float] = None):
+        """Queue an analysis; ``speech_time`` (when the speech started) anchors its deadline."""
+        if self.novelty_gate is not None:
+            # Low-information payloads ("Yeah." "Okay.") are merged into the next trigger
+            merged = self.novelty_gate.admit(active_text)
+            if merged is None:
+                logger.debug(f"Deferred low-information trigger: '{active_text[:60]}'")
+                return
+            active_text = merged
+        now = time.time()
+        speech_time = speech_time or now
+        deadline = speech_time + self.deadline_seconds if self.deadline_seconds > 0 else None
+        req = AnalysisRequest(active_text, context_text, now, speech_time=speech_time, deadline=deadline)
+        if self._fast_path_pool is not None:
+            self._fast_path_pool.submit(self._try_fast_path, req)
         self.queue.put(req)
 
+    def guidance_latency_stats(self) -> dict:
+        """Time-to-first-guidance (from trigger) for the fast path vs. the first LLM chunk."""
+        stats = {}
+        for path, samples in self._first_guidance_ms.items():
+            values = list(samples)
+            stats[path] = {
+                "count": len(values),
+                "p50_ms": round(statistics.median(values), 1) if values else None,
+                "avg_ms": round(statistics.fmean(values), 1) if values else None,
+            }
+        return stats
+
+    def embedding_cache_stats(self) -> Optional[dict]:
+        """This session's query-embedding cache hits, misses and embedding ms saved (None without RAG)."""
+        stats = getattr(self.analyzer, "embedding_stats", None)
+        return stats.stats() if stats is not None else None
+
+    def deadline_stats(self) -> dict:
+        """Deadline outcomes: met, finished late, dropped before calling the LLM, errored, and the miss rate.
+
+        Errored requests showed no guidance, so they count as missed whenever they finished.
+        """
+        counts = dict(self._deadline_counts)
+        requests = counts["met"] + counts["late"] + counts["dropped"] + counts["errored"]
+        missed = counts["late"] + counts["dropped"] + counts["errored"]
+        return {"requests": requests, **counts, "miss_rate": round(missed / requests, 3) if requests else 0.0}
+
+    def _deadline_plan(self, req: AnalysisRequest) -> Optional[dict]:
+        """Fit the LLM call to the request's remaining budget.
+
+        Returns analyze_with_fallback kwargs, or None when the request cannot
+        finish before its deadline and should be dropped.
+        """
+        kwargs: dict = {"timeout": self.fallback_timeout_seconds}
+        if req.deadline is None:
+            return kwargs
+        remaining = req.deadline - time.time()
+        if remaining < self.min_remaining_seconds:
+            return None
+        kwargs["timeout"] = min(self.fallback_timeout_seconds, remaining)
+        kwargs["deadline"] = req.deadline
+        if remaining < self.compact_below_seconds:
+            kwargs.update(compact=True, max_tokens=COMPACT_MAX_TOKENS)
+        return kwargs
+
+    def _try_fast_path(self, req: AnalysisRequest) -> None:
+        """Send the script's rebuttal immediately when the utterance is a clear objection.
+
+        Runs on its own thread, so the suggestion is not stuck behind an
+        in-flight LLM analysis and matching never blocks ``submit_analysis``.
+        Skipped once the LLM analysis of the same request has started streaming.
+        """
+        lookup = getattr(self.analyzer, "fast_path_suggestion", None)
+        if lookup is None:
+            return
+        try:
+            match = lookup(req.active_text)
+        except Exception as e:
+            logger.warning(f"Objection fast path failed: {e}")
+            return
+        if not match or req.llm_started:
+            return
+
+        latency_ms = (time.time() - req.timestamp) * 1000
+        self._first_guidance_ms["fast_path"].append(latency_ms)
+        logger.info(f"Fast path: '{match['objection']}' rebuttal in {latency_ms:.1f}ms")
+        self.on_fast_path(
+            FastPathSuggestion(
+                active_text=req.active_text,
+                objection=match["objection"],
+                suggestion=match["rebuttal"],
+                chunk_id=match["id"],
+                confidence=match["confidence"],
+                timestamp=time.time(),
+                latency_ms=latency_ms,
+            )
+        )
+
+    def prefetch_retrieval(self, active_text: str, context_text: str) -> None:
+        """Buffer ``on_segment_completed`` hook: prefetch retrieval unless degradation has shed RAG."""
+        if self.degradation is not None:
+            degrade = self.degradation.overrides(fast_model=getattr(self.analyzer, "fast_model_available", False))
+            if degrade.get("use_rag") is False:
+                # Sections would go unused, and the extra retrieval adds load while overloaded
+                return
+        self.analyzer.prefetch_retrieval(active_text, context_text)
+
+    def _record_deadline(self, req: AnalysisRequest, errored: bool = False) -> bool:
+        """Count a finished request against its deadline; True if it finished late.
+
+        An errored request is counted as errored, never as met.
+        """
+        late = req.deadline is not None and time.time() > req.deadline
+        self._deadline_counts["errored" if errored else "late" if late else "met"] += 1
+        if late:
+            logger.info(f"Analysis finished {(time.time() - req.deadline):.1f}s past its deadline")
+        return late
+
     def _worker_loop(self):
         while self.running:
             try:
@@ -367,9 +879,39 @@ class AnalysisOrchestrator:
                 start_time = time.time()
                 sequence = 0
 
+                degrade: dict = {}
+                if self.degradation is not None:
+                    # Backlog across every session sharing the controller
+                    self.degradation.observe()
+                    degrade = self.degradation.overrides(
+                        fast_model=getattr(self.analyzer, "fast_model_available", False)
+                    )
+
+                plan = self._deadline_plan(req)
+                if plan is None:
+                    self._deadline_counts["dropped"] += 1
+                    logger.info(
+                        f"Dropped analysis {(start_time - req.speech_time):.1f}s after speech "
+                        f"(deadline {self.deadline_seconds:.1f}s): '{req.active_text[:60]}'"
+                    )
+                    self.queue.task_done()
+                    continue
+                if plan.get("compact"):
+                    self._deadline_counts["compact"] += 1
+                plan = {**degrade, **plan}
+
                 def on_chunk(delta: str, accumulated: str, model: str) -> None:
                     nonlocal sequence
                     sequence += 1
+                    if sequence == 1:
+                        req.llm_started = True
+                        self._first_guidance_ms["llm"].append((time.time() - req.timestamp) * 1000)
+                        if not self._first_suggestion_recorded:
+                            self._first_suggestion_recorded = True
+                            warmed = getattr(self.analyzer, "warmup_state", "cold") == "warm"
+                            record_first_suggestion((time.time() - req.timestamp) * 1000, warmed)
+                        if self.degradation is not None:
+                            self.degradation.record_ttft((time.time() - start_time) * 1000)
                     if self.on_partial:
                         self.on_partial(
                             AnalysisStreamChunk(
@@ -380,6 +922,7 @@ class AnalysisOrchestrator:
                                 accumulated=accumulated,
                                 sequence=sequence,
                                 model=model,
+                                late=req.deadline is not None and time.time() > req.deadline,
                             )
                         )
 
@@ -387,13 +930,15 @@ class AnalysisOrchestrator:
                     raw_json = self.analyzer.analyze_with_fallback(
                         req.active_text,
                         req.context_text,
-                        timeout=self.fallback_timeout_seconds,
                         on_chunk=on_chunk,
+                        **plan,
                     )
                     data = json.loads(raw_json)
+                    location = getattr(self.analyzer, "last_location", None)
+                    local_location = location.label if isinstance(location, StageClassification) else None
 
                     state = ConversationState(
-                        script_location=data.get("script_location", "Unknown"),
+                        script_location=data.get("script_location") or local_location or "Unknown",
                         key_points=data.get("key_points", []),
                         suggestion=data.get("suggestion", ""),
                         last_updated=time.time(),
@@ -405,9 +950,26 @@ class AnalysisOrchestrator:
                         timestamp=time.time(),
                         latency_ms=(time.time() - start_time) * 1000,
                         state=state,
+                        late=self._record_deadline(req),
                     )
                     self.on_result(result)
 
+                except DeadlineExceeded as e:
+                    self._deadline_counts["dropped"] += 1
+                    logger.info(f"Dropped analysis after primary timeout: '{req.active_text[:60]}'")
+                    # Closes any entry the primary had started streaming
+                    self.on_result(
+                        AnalysisResult(
+                            raw_response="",
+                            active_text=req.active_text,
+                            timestamp=time.time(),
+                            latency_ms=(time.time() - start_time) * 1000,
+                            state=ConversationState(),
+                            error=str(e),
+                            late=True,
+                        )
+                    )
+
                 except Exception as e:
                     logger.error(f"Analysis error: {e}", exc_info=True)
                     self.on_result(
@@ -418,6 +980,7 @@ class AnalysisOrchestrator:
                             latency_ms=(time.time() - start_time) * 1000,
                             state=ConversationState(),
                             error=str(e),
+                            late=self._record_deadline(req, errored=True),
                         )
                     )
 
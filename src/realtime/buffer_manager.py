@@ -63,6 +63,8 @@ class DualBufferManager:
         config: Optional[BufferConfig] = None,
         on_analysis_ready: Optional[Callable[[str, str], None]] = None,
         on_state_analysis_ready: Optional[Callable[[str], None]] = None,
+        on_segment_completed: Optional[Callable[[str, str], None]] = None,
+        on_new_segment: Optional[Callable[[str], None]] = None,
     ):
         """
         Initialize the dual buffer manager.
@@ -74,10 +76,18 @@ class DualBufferManager:
                               Signature: (active_text: str, context_text: str) -> None
             on_state_analysis_ready: Callback when state analysis should be triggered.
                                     Signature: (full_transcript: str) -> None
+            on_segment_completed: Callback when new completed segments entered the active
+                                  buffer (e.g. to prefetch retrieval before the trigger).
+                                  Signature: (active_text: str, context_text: str) -> None
+            on_new_segment: Callback with the text of each completed segment as it
+                            enters the active buffer (e.g. streaming stage tracking).
+                            Signature: (segment_text: str) -> None
         """
         self.config = config or BufferConfig()
         self.on_analysis_ready = on_analysis_ready
         self.on_state_analysis_ready = on_state_analysis_ready
+        self.on_segment_completed = on_segment_completed
+        self.on_new_segment = on_new_segment
 
         # Active buffer: accumulates new segments
         self.active_buffer: list[Segment] = []
@@ -102,6 +112,10 @@ class DualBufferManager:
         # Track last incomplete text we already triggered on (avoid re-triggering same text)
         self._last_triggered_incomplete_text: str = ""
 
+        # Wall-clock time the speech now in the active buffer started arriving
+        # (deadline anchor for the analysis it triggers; does not affect triggers)
+        self.active_started_at: Optional[float] = None
+
     def on_transcript_chunk(self, text: str, segments: list) -> None:
         """
         Callback for WhisperLive transcription_callback.
@@ -113,6 +127,7 @@ class DualBufferManager:
             text: Space-joined transcript of current segments
             segments: List of segment dictionaries from WhisperLive
         """
+        completed_added = False
         for i, seg_dict in enumerate(segments):
             segment = Segment.from_dict(seg_dict)
             seg_key = (segment.start, segment.end)
@@ -121,6 +136,8 @@ class DualBufferManager:
             is_last = i == len(segments) - 1
             if is_last and not segment.completed:
                 self.last_incomplete_segment = segment
+                if self.active_started_at is None:
+                    self.active_started_at = time.time()
                 continue
 
             # Skip already processed segments
@@ -129,9 +146,17 @@ class DualBufferManager:
 
             # Only add completed segments to active buffer
             if segment.completed:
+                if self.active_started_at is None:
+                    self.active_started_at = time.time()
                 self.active_buffer.append(segment)
                 self._processed_segment_keys.add(seg_key)
                 self.last_segment_end_time = segment.end
+                completed_added = True
+                if self.on_new_segment:
+                    self.on_new_segment(segment.text)
+
+        if completed_added and self.on_segment_completed:
+            self.on_segment_completed(*self.get_analysis_payload())
 
         # Check if we should trigger analysis
         if self.should_trigger_analysis():
@@ -238,6 +263,7 @@ class DualBufferManager:
 
         # Reset active buffer
         self.active_buffer = []
+        self.active_started_at = None
 
         # Update analysis timing (MUST happen here, not inside _check_state_trigger,
         # otherwise last_analysis_time never updates when no state callback is set,
@@ -308,6 +334,7 @@ class DualBufferManager:
         self.last_segment_end_time = 0.0
         self._processed_segment_keys = set()
         self._last_triggered_incomplete_text = ""
+        self.active_started_at = None
 
 
 # Simple test
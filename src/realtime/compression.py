@@ -0,0 +1,305 @@
+"""
+Extractive transcript compression for summary and recommendation prompts.
+
+Raw ASR transcripts are full of filler ("yeah", "mm-hmm"), repeated
+sentences and restarts. Before a long transcript goes into a summary or
+recommendation prompt this stage, which never calls the LLM:
+
+1. splits each speaker turn into sentences,
+2. drops filler-only sentences (unless they carry a hesitation/objection
+   marker) and sentences repeated nearby (the fuller, later one is kept),
+3. scores what is left with TF-IDF (or cosine similarity to the transcript
+   centroid when an ``embed_fn`` such as the RAG MiniLM model is given),
+   with a small bonus for recent sentences, and
+4. keeps the top-scoring sentences within the token budget, re-emitted in
+   their original order and grouped under their original speaker turns.
+
+Transcripts under ``min_tokens`` pass through untouched.
+
+    TRANSCRIPT_COMPRESSION=true
+    TRANSCRIPT_COMPRESSION_RATIO=0.6
+
+Report the compression ratio and estimated prefill time saved on recorded
+transcripts:
+
+    python -m src.realtime.compression --db validation.db
+    python -m src.realtime.compression call1.txt call2.txt
+"""
+
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from .novelty_gate import SIGNAL_PHRASES, content_words, cosine_similarity
+from .token_budget import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_COMPRESSION = os.getenv("TRANSCRIPT_COMPRESSION", "true").lower() in ("true", "1", "yes")
+
+# Share of the (filtered) transcript's tokens kept when it is over ``min_tokens``.
+DEFAULT_TARGET_RATIO = float(os.getenv("TRANSCRIPT_COMPRESSION_RATIO", "0.6"))
+
+_SPEAKER_RE = re.compile(r"^\s*([\w .'-]{1,40}):\s*(.*)$")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Sentences compared with each other when looking for repeats (either side).
+_DUPLICATE_WINDOW = 40
+
+
+@dataclass
+class CompressionResult:
+    """Compressed transcript plus what the compression did."""
+
+    text: str
+    original_tokens: int
+    compressed_tokens: int
+    dropped_filler: int = 0
+    dropped_duplicates: int = 0
+    dropped_low_score: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size as a share of the original (1.0 = unchanged)."""
+        return self.compressed_tokens / self.original_tokens if self.original_tokens else 1.0
+
+
+@dataclass
+class _Sentence:
+    turn: int
+    speaker: Optional[str]
+    text: str
+    words: list[str]
+    tokens: int
+    score: float = 0.0
+
+
+def _split_turns(transcript: str) -> list[tuple[Optional[str], str]]:
+    """Split a line-per-turn transcript into ``(speaker, text)`` pairs."""
+    turns = []
+    for line in transcript.splitlines():
+        if not line.strip():
+            continue
+        match = _SPEAKER_RE.match(line)
+        if match:
+            turns.append((match.group(1).strip(), match.group(2).strip()))
+        else:
+            turns.append((None, line.strip()))
+    return turns
+
+
+class TranscriptCompressor:
+    """Extractive, LLM-free compressor for long call transcripts."""
+
+    def __init__(
+        self,
+        target_ratio: float = DEFAULT_TARGET_RATIO,
+        min_tokens: int = 300,
+        duplicate_threshold: float = 0.8,
+        recency_weight: float = 0.3,
+        embed_fn: Optional[Callable[[Sequence[str]], Sequence[Sequence[float]]]] = None,
+    ) -> None:
+        """
+        Args:
+            target_ratio: Share of the original tokens to keep (the caller's budget caps it further).
+            min_tokens: Transcripts at or below this size are returned unchanged.
+            duplicate_threshold: Share of a sentence's content words found in a fuller one that makes it a repeat.
+            recency_weight: Score bonus for the most recent sentence (scaled linearly from 0 at the start).
+            embed_fn: Optional batch text → vectors function; replaces TF-IDF scoring with centroid similarity.
+        """
+        self.target_ratio = target_ratio
+        self.min_tokens = min_tokens
+        self.duplicate_threshold = duplicate_threshold
+        self.recency_weight = recency_weight
+        self.embed_fn = embed_fn
+
+    def compress(self, transcript: str, max_tokens: Optional[int] = None) -> CompressionResult:
+        """Compress ``transcript`` to about ``target_ratio`` of its size, and at most ``max_tokens``."""
+        start = time.perf_counter()
+        original_tokens = estimate_tokens(transcript)
+        if original_tokens <= self.min_tokens and (max_tokens is None or original_tokens <= max_tokens):
+            return CompressionResult(transcript, original_tokens, original_tokens)
+
+        sentences, dropped_filler = self._sentences(transcript)
+        sentences, dropped_duplicates = self._drop_duplicates(sentences)
+
+        budget = int(original_tokens * self.target_ratio)
+        if max_tokens is not None:
+            budget = min(budget, max_tokens)
+
+        kept = sentences
+        if sum(s.tokens for s in sentences) > budget:
+            self._score(sentences)
+            kept, spent = [], 0
+            for s in sorted(sentences, key=lambda s: s.score, reverse=True):
+                if spent + s.tokens <= budget:
+                    kept.append(s)
+                    spent += s.tokens
+            kept.sort(key=lambda s: s.turn)
+
+        text = self._render(kept)
+        return CompressionResult(
+            text=text,
+            original_tokens=original_tokens,
+            compressed_tokens=estimate_tokens(text),
+            dropped_filler=dropped_filler,
+            dropped_duplicates=dropped_duplicates,
+            dropped_low_score=len(sentences) - len(kept),
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def _sentences(self, transcript: str) -> tuple[list[_Sentence], int]:
+        """Sentence units in order, with filler-only sentences removed."""
+        sentences: list[_Sentence] = []
+        dropped = 0
+        for turn, (speaker, text) in enumerate(_split_turns(transcript)):
+            for part in _SENTENCE_RE.split(text):
+                part = part.strip()
+                if not part:
+                    continue
+                words = content_words(part)
+                if not words and not any(phrase in part.lower() for phrase in SIGNAL_PHRASES):
+                    dropped += 1
+                    continue
+                # Count the speaker prefix too, so the rendered text stays within budget
+                cost = estimate_tokens(f"{speaker}: {part}" if speaker else part) + 1
+                sentences.append(_Sentence(turn, speaker, part, words, cost))
+        return sentences, dropped
+
+    def _drop_duplicates(self, sentences: list[_Sentence]) -> tuple[list[_Sentence], int]:
+        """Drop sentences another nearby sentence already covers, keeping the fuller, then the later one.
+
+        Sentences with at least three content words are repeats when ``duplicate_threshold`` of their words
+        appear in a fuller (or equally full, later) sentence; shorter ones only when their words repeat
+        exactly. Only sentences within ``_DUPLICATE_WINDOW`` of each other are compared, which catches ASR
+        restarts and re-asked questions while keeping the pass linear in call length.
+        """
+        word_sets = [set(s.words) for s in sentences]
+        kept: list[_Sentence] = []
+        for i, s in enumerate(sentences):
+            words = word_sets[i]
+            if not any(
+                self._covers(word_sets[j], words) and (len(word_sets[j]), j) > (len(words), i)
+                for j in range(max(0, i - _DUPLICATE_WINDOW), min(len(sentences), i + _DUPLICATE_WINDOW + 1))
+                if j != i
+            ):
+                kept.append(s)
+        return kept, len(sentences) - len(kept)
+
+    def _covers(self, other: set[str], words: set[str]) -> bool:
+        if not words:
+            return False
+        if len(words) < 3:
+            return other == words
+        return len(words & other) / len(words) >= self.duplicate_threshold
+
+    def _score(self, sentences: list[_Sentence]) -> None:
+        """Set each sentence's salience score (TF-IDF or embedding centroid) plus a recency bonus."""
+        if self.embed_fn is not None:
+            try:
+                self._score_embeddings(sentences)
+            except Exception as e:
+                logger.warning(f"Compression embedding failed, using TF-IDF: {e}")
+                self._score_tfidf(sentences)
+        else:
+            self._score_tfidf(sentences)
+
+        top = max((s.score for s in sentences), default=0.0) or 1.0
+        last_turn = max(sentences[-1].turn, 1) if sentences else 1
+        for s in sentences:
+            s.score = s.score / top + self.recency_weight * (s.turn / last_turn)
+            if any(phrase in s.text.lower() for phrase in SIGNAL_PHRASES):
+                s.score += 0.5
+
+    def _score_tfidf(self, sentences: list[_Sentence]) -> None:
+        df = Counter(w for s in sentences for w in set(s.words))
+        n = len(sentences)
+        for s in sentences:
+            tf = Counter(s.words)
+            weight = sum(count * math.log(1 + n / df[w]) for w, count in tf.items())
+            # Normalise by length so long rambling sentences do not win on size alone
+            s.score = weight / math.sqrt(len(s.words)) if s.words else 0.0
+
+    def _score_embeddings(self, sentences: list[_Sentence]) -> None:
+        vectors = self.embed_fn([s.text for s in sentences])
+        dims = len(vectors[0]) if len(vectors) else 0
+        centroid = [sum(v[i] for v in vectors) / len(vectors) for i in range(dims)]
+        for s, v in zip(sentences, vectors):
+            s.score = max(cosine_similarity(v, centroid), 0.0)
+
+    def _render(self, sentences: list[_Sentence]) -> str:
+        """Re-join kept sentences under their original speaker turns."""
+        lines: list[str] = []
+        current_turn = None
+        for s in sentences:
+            if s.turn == current_turn:
+                lines[-1] += " " + s.text
+                continue
+            current_turn = s.turn
+            lines.append(f"{s.speaker}: {s.text}" if s.speaker else s.text)
+        return "\n".join(lines)
+
+
+def compress_transcript(transcript: str, max_tokens: Optional[int] = None) -> CompressionResult:
+    """Compress with the default settings, or pass through when TRANSCRIPT_COMPRESSION is off."""
+    if not TRANSCRIPT_COMPRESSION:
+        tokens = estimate_tokens(transcript)
+        return CompressionResult(transcript, tokens, tokens)
+    return TranscriptCompressor().compress(transcript, max_tokens=max_tokens)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Report transcript compression ratio and estimated latency saved")
+    parser.add_argument("files", nargs="*", help="Transcript text files (one speaker turn per line)")
+    parser.add_argument("--db", help="ValidationDB path; compresses every stored call transcript")
+    parser.add_argument("--ratio", type=float, default=DEFAULT_TARGET_RATIO)
+    parser.add_argument(
+        "--prefill-tokens-per-second",
+        type=float,
+        default=1500.0,
+        help="Provider prefill throughput used to estimate latency saved (measure with tests/test_llm_latency.py)",
+    )
+    args = parser.parse_args()
+
+    transcripts: list[tuple[str, str]] = [(f, Path(f).read_text(encoding="utf-8")) for f in args.files]
+    if args.db:
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+        from validation.db import ValidationDB
+
+        transcripts += [(c["name"], c["transcript"] or "") for c in ValidationDB(args.db).get_all_calls()]
+
+    if not transcripts:
+        print("No transcripts to compress (pass files or --db).")
+        sys.exit(1)
+
+    compressor = TranscriptCompressor(target_ratio=args.ratio)
+    total_original = total_compressed = 0
+    total_ms = 0.0
+    for name, transcript in transcripts:
+        result = compressor.compress(transcript)
+        total_original += result.original_tokens
+        total_compressed += result.compressed_tokens
+        total_ms += result.elapsed_ms
+        print(
+            f"{name}: {result.original_tokens} → {result.compressed_tokens} tokens ({result.ratio:.0%}), "
+            f"filler={result.dropped_filler} duplicates={result.dropped_duplicates} "
+            f"low_score={result.dropped_low_score}, {result.elapsed_ms:.1f}ms"
+        )
+
+    saved_ms = (total_original - total_compressed) / args.prefill_tokens_per_second * 1000
+    ratio = total_compressed / total_original if total_original else 1.0
+    print(
+        f"\nTotal: {total_original} → {total_compressed} tokens ({ratio:.0%}); "
+        f"compression took {total_ms:.0f}ms, est. prefill saved {saved_ms:.0f}ms "
+        f"at {args.prefill_tokens_per_second:.0f} tok/s"
+    )
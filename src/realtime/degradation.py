@@ -0,0 +1,245 @@
+"""
+Automatic degradation of live analysis under load.
+
+When the orchestrator backlog grows or observed time-to-first-token rises
+(e.g. the shared local GPU box is saturated at peak call hours), full prompts
+to the primary model only make the backlog worse. The controller watches
+the backlog summed over every session's queue and a TTFT EWMA, and steps
+down one level at a time:
+
+    normal → fallback_model → no_rag → short_context → suggestion_only
+
+Each level keeps the savings of the ones before it; a session that has no
+separate fast model (no fallback model, or provider routing already picks
+the fastest target) skips the fallback_model level. It steps back up one
+level after load has stayed low for ``recover_after_seconds``; between the
+high and low watermarks nothing changes, so the level does not flap.
+Transitions are logged, kept for ``/api/llm/degradation`` and pushed to
+listeners (the web app broadcasts them to the UI).
+
+    DEGRADATION_CONTROLLER=true
+    DEGRADATION_MAX_QUEUE_DEPTH=2
+    DEGRADATION_TTFT_HIGH_MS=2500
+    DEGRADATION_TTFT_LOW_MS=1200
+    DEGRADATION_RECOVER_SECONDS=20
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ("normal", "fallback_model", "no_rag", "short_context", "suggestion_only")
+
+# Context kept at the short_context level (characters of the most recent conversation).
+SHORT_CONTEXT_CHARS = 600
+
+# Output cap at the suggestion_only level.
+SUGGESTION_ONLY_MAX_TOKENS = 120
+
+# analyze_with_fallback overrides added at each level (cumulative).
+_LEVEL_OVERRIDES: tuple[dict, ...] = (
+    {},
+    {"fast_model_only": True},
+    {"use_rag": False},
+    {"max_context_chars": SHORT_CONTEXT_CHARS},
+    {"compact": True, "max_tokens": SUGGESTION_ONLY_MAX_TOKENS},
+)
+
+
+class DegradationController:
+    """Steps live analysis down and back up based on backlog and TTFT."""
+
+    def __init__(
+        self,
+        max_queue_depth: int = 2,
+        ttft_high_ms: float = 2500.0,
+        ttft_low_ms: float = 1200.0,
+        step_down_after: int = 2,
+        recover_after_seconds: float = 20.0,
+        alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_queue_depth: Queue depth (waiting requests) that counts as overload.
+            ttft_high_ms: TTFT EWMA at or above which the system counts as overloaded.
+            ttft_low_ms: TTFT EWMA at or below which (with an empty queue) load counts as low.
+            step_down_after: Consecutive overloaded observations before stepping down a level.
+            recover_after_seconds: Time load must stay low before stepping up a level.
+            alpha: EWMA weight of the newest TTFT sample.
+        """
+        self.max_queue_depth = max_queue_depth
+        self.ttft_high_ms = ttft_high_ms
+        self.ttft_low_ms = ttft_low_ms
+        self.step_down_after = step_down_after
+        self.recover_after_seconds = recover_after_seconds
+        self.alpha = alpha
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self.level = 0
+        self.ttft_ewma_ms: Optional[float] = None
+        self._overloaded_streak = 0
+        self._calm_since: Optional[float] = None
+        self.transitions: deque[dict] = deque(maxlen=50)
+        self._listeners: list[Callable[[dict], None]] = []
+        self._queues: list[queue.Queue] = []
+
+    @property
+    def level_name(self) -> str:
+        return LEVELS[self.level]
+
+    def record_ttft(self, ttft_ms: float) -> None:
+        """Feed one observed time-to-first-token (ms) into the EWMA."""
+        with self._lock:
+            if self.ttft_ewma_ms is None:
+                self.ttft_ewma_ms = ttft_ms
+            else:
+                self.ttft_ewma_ms = self.alpha * ttft_ms + (1 - self.alpha) * self.ttft_ewma_ms
+
+    def register_queue(self, q: queue.Queue) -> None:
+        """Count ``q`` (one session's analysis queue) towards the shared backlog."""
+        with self._lock:
+            self._queues.append(q)
+
+    def unregister_queue(self, q: queue.Queue) -> None:
+        with self._lock:
+            if q in self._queues:
+                self._queues.remove(q)
+
+    def queue_depth(self) -> int:
+        """Requests waiting across all registered session queues."""
+        with self._lock:
+            queues = list(self._queues)
+        return sum(q.qsize() for q in queues)
+
+    def observe(self, queue_depth: Optional[int] = None) -> int:
+        """Update the level from the backlog (default: all registered queues); returns the level to use next."""
+        if queue_depth is None:
+            queue_depth = self.queue_depth()
+        event = None
+        with self._lock:
+            ttft = self.ttft_ewma_ms
+            overloaded = queue_depth >= self.max_queue_depth or (ttft is not None and ttft >= self.ttft_high_ms)
+            calm = queue_depth == 0 and (ttft is None or ttft <= self.ttft_low_ms)
+            now = self._clock()
+
+            if overloaded:
+                self._calm_since = None
+                self._overloaded_streak += 1
+                if self._overloaded_streak >= self.step_down_after and self.level < len(LEVELS) - 1:
+                    self._overloaded_streak = 0
+                    event = self._set_level(self.level + 1, self._reason(queue_depth, ttft))
+            elif calm:
+                self._overloaded_streak = 0
+                if self._calm_since is None:
+                    self._calm_since = now
+                elif self.level > 0 and now - self._calm_since >= self.recover_after_seconds:
+                    self._calm_since = now
+                    event = self._set_level(self.level - 1, self._reason(queue_depth, ttft))
+            else:
+                self._overloaded_streak = 0
+                self._calm_since = None
+            level = self.level
+
+        if event is not None:
+            self._notify(event)
+        return level
+
+    def overrides(self, level: Optional[int] = None, fast_model: bool = True) -> dict:
+        """analyze_with_fallback keyword overrides for ``level`` (default: current level).
+
+        Without a separate ``fast_model`` the fallback_model level cannot shed
+        anything, so every degraded level takes the next level's overrides.
+        """
+        level = self.level if level is None else level
+        if not fast_model and level > 0:
+            level = min(level + 1, len(LEVELS) - 1)
+        merged: dict = {}
+        for step in _LEVEL_OVERRIDES[: level + 1]:
+            merged.update(step)
+        return merged
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[dict], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "level": self.level,
+                "name": self.level_name,
+                "ttft_ewma_ms": round(self.ttft_ewma_ms, 1) if self.ttft_ewma_ms is not None else None,
+                "sessions": len(self._queues),
+                "queue_depth": sum(q.qsize() for q in self._queues),
+                "thresholds": {
+                    "max_queue_depth": self.max_queue_depth,
+                    "ttft_high_ms": self.ttft_high_ms,
+                    "ttft_low_ms": self.ttft_low_ms,
+                    "recover_after_seconds": self.recover_after_seconds,
+                },
+                "transitions": list(self.transitions),
+            }
+
+    def _reason(self, queue_depth: int, ttft: Optional[float]) -> str:
+        ttft_text = f"{ttft:.0f}ms" if ttft is not None else "n/a"
+        return f"queue_depth={queue_depth} ttft_ewma={ttft_text}"
+
+    def _set_level(self, level: int, reason: str) -> dict:
+        event = {
+            "at": time.time(),
+            "from": LEVELS[self.level],
+            "to": LEVELS[level],
+            "level": level,
+            "reason": reason,
+        }
+        if level > self.level:
+            logger.warning(f"Degrading live analysis: {event['from']} → {event['to']} ({reason})")
+        else:
+            logger.info(f"Recovering live analysis: {event['from']} → {event['to']} ({reason})")
+        self.level = level
+        self.transitions.append(event)
+        return event
+
+    def _notify(self, event: dict) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Degradation listener failed: {e}")
+
+
+def build_degradation_controller_from_env() -> Optional[DegradationController]:
+    """Build a controller from DEGRADATION_* env vars, or None if DEGRADATION_CONTROLLER is off."""
+    if os.getenv("DEGRADATION_CONTROLLER", "true").lower() not in ("true", "1", "yes"):
+        return None
+    return DegradationController(
+        max_queue_depth=int(os.getenv("DEGRADATION_MAX_QUEUE_DEPTH", "2")),
+        ttft_high_ms=float(os.getenv("DEGRADATION_TTFT_HIGH_MS", "2500")),
+        ttft_low_ms=float(os.getenv("DEGRADATION_TTFT_LOW_MS", "1200")),
+        recover_after_seconds=float(os.getenv("DEGRADATION_RECOVER_SECONDS", "20")),
+    )
+
+
+_controller_lock = threading.Lock()
+_controller: Optional[DegradationController] = None
+_controller_built = False
+
+
+def get_degradation_controller() -> Optional[DegradationController]:
+    """Return the process-wide controller (shared by all sessions, like the GPU box), or None if disabled."""
+    global _controller, _controller_built
+    with _controller_lock:
+        if not _controller_built:
+            _controller = build_degradation_controller_from_env()
+            _controller_built = True
+        return _controller
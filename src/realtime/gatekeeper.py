@@ -0,0 +1,260 @@
+"""
+Priority-aware rate limiting for all LLM traffic to a provider.
+
+One ``Gatekeeper`` per provider enforces requests-per-minute and
+tokens-per-minute with two token buckets. Callers acquire capacity with a
+priority class:
+
+    LIVE > RECOMMENDATION > SUMMARY > BATCH
+
+Lower priorities may not dip into a reserved share of each bucket, always
+yield to waiting higher-priority callers, and give up (``RateLimitExceeded``)
+after their maximum wait. During a burst, live coaching keeps its headroom
+while summaries and batch jobs queue or are shed instead of triggering 429s.
+
+Limits come from env (0 = unlimited):
+
+    LLM_RATE_LIMIT_RPM / LLM_RATE_LIMIT_TPM                 all providers
+    LLM_RATE_LIMIT_<PROVIDER>_RPM / ..._<PROVIDER>_TPM      per provider
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from enum import IntEnum
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Traffic classes, most urgent first."""
+
+    LIVE = 0
+    RECOMMENDATION = 1
+    SUMMARY = 2
+    BATCH = 3
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a request is shed instead of waiting for capacity."""
+
+
+# Share of each bucket a priority class may NOT consume (kept for more urgent work).
+_RESERVE = {
+    Priority.LIVE: 0.0,
+    Priority.RECOMMENDATION: 0.1,
+    Priority.SUMMARY: 0.25,
+    Priority.BATCH: 0.5,
+}
+
+# Longest a priority class waits for capacity before being shed (None = wait indefinitely).
+_MAX_WAIT = {
+    Priority.LIVE: 2.0,
+    Priority.RECOMMENDATION: 10.0,
+    Priority.SUMMARY: 30.0,
+    Priority.BATCH: None,
+}
+
+# Free-tier request limits for providers that enforce them; others are unlimited unless configured.
+_DEFAULT_RPM = {
+    "github": 15,
+    "gemini": 15,
+    "openrouter": 20,
+}
+
+
+class _Bucket:
+    """Token bucket refilled continuously at ``capacity`` per minute (capacity 0 = unlimited)."""
+
+    def __init__(self, capacity: float, now: float) -> None:
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = now
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def refill(self, now: float) -> None:
+        if self.unlimited:
+            return
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def seconds_until(self, amount: float, floor: float) -> float:
+        """Seconds until ``amount`` can be taken without dropping below ``floor``."""
+        if self.unlimited:
+            return 0.0
+        missing = amount + floor - self.level
+        return max(0.0, missing * 60.0 / self.capacity)
+
+
+class Gatekeeper:
+    """Requests/tokens-per-minute limiter with priority classes for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._clock = clock
+        now = clock()
+        self._requests = _Bucket(requests_per_minute, now)
+        self._tokens = _Bucket(tokens_per_minute, now)
+        self._cond = threading.Condition()
+        self._waiting: Counter = Counter()
+        self._admitted: Counter = Counter()
+        self._shed: Counter = Counter()
+        self._wait_ms_total: Counter = Counter()
+
+    @property
+    def unlimited(self) -> bool:
+        return self._requests.unlimited and self._tokens.unlimited
+
+    def acquire(self, priority: Priority, tokens: int = 0, max_wait: Optional[float] = -1) -> float:
+        """Block until ``priority`` may send a request estimated at ``tokens`` tokens.
+
+        Args:
+            priority: Traffic class of the caller.
+            tokens: Estimated prompt + completion tokens.
+            max_wait: Seconds to wait before shedding; -1 uses the class default, None waits forever.
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            RateLimitExceeded: If capacity did not free up within ``max_wait``.
+        """
+        if self.unlimited:
+            self._admitted[priority] += 1
+            return 0.0
+        if max_wait == -1:
+            max_wait = _MAX_WAIT[priority]
+
+        start = self._clock()
+        deadline = None if max_wait is None else start + max_wait
+        request_floor = self._requests.capacity * _RESERVE[priority]
+        token_floor = self._tokens.capacity * _RESERVE[priority]
+        # A single request larger than the whole bucket would never fit; let it drain the bucket instead.
+        if self._tokens.unlimited:
+            tokens = 0
+        else:
+            tokens = min(tokens, self._tokens.capacity - token_floor)
+
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = self._clock()
+                    self._requests.refill(now)
+                    self._tokens.refill(now)
+
+                    outranked = any(self._waiting[p] for p in Priority if p < priority)
+                    wait = max(
+                        self._requests.seconds_until(1, request_floor),
+                        self._tokens.seconds_until(tokens, token_floor),
+                    )
+                    if not outranked and wait <= 0:
+                        if not self._requests.unlimited:
+                            self._requests.level -= 1
+                        if not self._tokens.unlimited:
+                            self._tokens.level -= tokens
+                        waited = now - start
+                        self._admitted[priority] += 1
+                        self._wait_ms_total[priority] += waited * 1000
+                        return waited
+
+                    if deadline is not None and now + (wait if not outranked else 0) > deadline:
+                        self._shed[priority] += 1
+                        logger.warning(f"Gatekeeper[{self.name}]: shedding {priority.name} request (near rate limit)")
+                        raise RateLimitExceeded(f"{self.name} rate limit reached for {priority.name} traffic")
+
+                    timeout = wait if wait > 0 else 0.05
+                    if deadline is not None:
+                        timeout = min(timeout, max(0.0, deadline - now))
+                    self._cond.wait(timeout=timeout)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the provider reports real usage."""
+        if self._tokens.unlimited:
+            return
+        with self._cond:
+            self._tokens.level -= actual_tokens - estimated_tokens
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        """Current bucket levels and per-priority admitted/shed counters."""
+        with self._cond:
+            now = self._clock()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            return {
+                "provider": self.name,
+                "requests_per_minute": self._requests.capacity,
+                "tokens_per_minute": self._tokens.capacity,
+                "requests_available": None if self._requests.unlimited else round(self._requests.level, 1),
+                "tokens_available": None if self._tokens.unlimited else round(self._tokens.level),
+                "admitted": {p.name.lower(): self._admitted[p] for p in Priority},
+                "shed": {p.name.lower(): self._shed[p] for p in Priority},
+                "avg_wait_ms": {
+                    p.name.lower(): round(self._wait_ms_total[p] / self._admitted[p], 1) if self._admitted[p] else 0.0
+                    for p in Priority
+                },
+            }
+
+
+def _limit_from_env(provider: str, kind: str, default: float) -> float:
+    for var in (f"LLM_RATE_LIMIT_{provider.upper()}_{kind}", f"LLM_RATE_LIMIT_{kind}"):
+        value = os.getenv(var)
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                logger.warning(f"Ignoring invalid {var}={value!r}")
+    return default
+
+
+_registry_lock = threading.Lock()
+_gatekeepers: dict[str, Gatekeeper] = {}
+
+
+def get_gatekeeper(provider: Optional[str] = None) -> Gatekeeper:
+    """Return the process-wide gatekeeper for ``provider`` (defaults to LLM_PROVIDER)."""
+    provider = (provider or os.getenv("LLM_PROVIDER", "local")).lower()
+    with _registry_lock:
+        gatekeeper = _gatekeepers.get(provider)
+        if gatekeeper is None:
+            gatekeeper = Gatekeeper(
+                provider,
+                requests_per_minute=_limit_from_env(provider, "RPM", _DEFAULT_RPM.get(provider, 0)),
+                tokens_per_minute=_limit_from_env(provider, "TPM", 0),
+            )
+            _gatekeepers[provider] = gatekeeper
+            if not gatekeeper.unlimited:
+                logger.info(
+                    f"Gatekeeper[{provider}]: {gatekeeper._requests.capacity:g} RPM, "
+                    f"{gatekeeper._tokens.capacity:g} TPM"
+                )
+        return gatekeeper
+
+
+def gatekeeper_snapshots() -> list[dict]:
+    """Snapshots of every gatekeeper created so far."""
+    with _registry_lock:
+        gatekeepers = list(_gatekeepers.values())
+    return [g.snapshot() for g in gatekeepers]
+
+
+def reset_gatekeepers() -> None:
+    """Drop all gatekeepers (tests / config reload)."""
+    with _registry_lock:
+        _gatekeepers.clear()
@@ -0,0 +1,101 @@
+"""
+Process-wide pooled HTTP clients for LLM providers.
+
+Every OpenAI-compatible client in the process shares one tuned httpx
+connection pool with keep-alive (and HTTP/2 when enabled and the ``h2``
+package is installed). Clients are cached per (base_url, api_key), so a new
+call session reuses warm TCP+TLS connections instead of paying the
+handshake on its first suggestion.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+logger = logging.getLogger(__name__)
+
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "false").lower() in ("true", "1", "yes")
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "120"))
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_clients: dict[tuple[str, str], OpenAI] = {}
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive."""
+    if not LLM_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("LLM_HTTP2=true but the 'h2' package is not installed — using HTTP/1.1")
+        return False
+    return True
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared httpx pool used by every LLM client."""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = DefaultHttpxClient(
+                http2=_http2_enabled(),
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return _http_client
+
+
+def get_openai_client(base_url: str, api_key: str) -> OpenAI:
+    """Return the cached OpenAI client for (base_url, api_key)."""
+    key = (base_url.rstrip("/"), api_key)
+    http_client = get_http_client()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = OpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+            _clients[key] = client
+        return client
+
+
+def warm_connection(base_url: str, timeout: float = 5.0) -> Optional[float]:
+    """Open a pooled connection to ``base_url`` ahead of the first LLM call.
+
+    Any HTTP response (even 404/401) means TCP+TLS is established and the
+    connection is parked in the keep-alive pool.
+
+    Returns:
+        Milliseconds spent warming, or None if the endpoint was unreachable.
+    """
+    if not base_url:
+        return None
+    start = time.time()
+    try:
+        get_http_client().head(base_url, timeout=timeout)
+    except httpx.HTTPError as e:
+        logger.info(f"Connection warmup to {base_url} failed (non-fatal): {e}")
+        return None
+    elapsed_ms = (time.time() - start) * 1000
+    logger.info(f"Warmed LLM connection to {base_url} in {elapsed_ms:.0f}ms")
+    return elapsed_ms
+
+
+def close_clients() -> None:
+    """Close the shared pool and drop cached clients (app shutdown / tests)."""
+    global _http_client
+    with _lock:
+        _clients.clear()
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
@@ -0,0 +1,264 @@
+"""
+Novelty / information gate for analysis triggers.
+
+``DualBufferManager`` fires on two completed segments or sentence-ending
+punctuation, so backchannels like "Yeah." "Okay." "Mm-hmm." each cost a full
+LLM call. This gate sits in front of ``AnalysisOrchestrator.submit_analysis``
+and defers low-information payloads; the orchestrator merges them into the
+next trigger instead of dispatching them.
+
+A payload is low-information when, after removing filler words and
+stopwords, it has fewer than ``min_content_words`` content words, or when it
+is a near-repeat of the last analyzed text (lexical overlap, plus embedding
+similarity if an ``embed_fn`` is supplied). Payloads containing a hesitation
+or objection marker ("not sure", "expensive", ...) always pass.
+
+Replay on recorded transcripts to see the suppression rate:
+
+    python -m src.realtime.novelty_gate --db validation.db
+    python -m src.realtime.novelty_gate call1.txt call2.txt
+
+The suppression rate has not been measured yet: the repository's
+validation.db holds no recorded calls, so the defaults are unvalidated.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Backchannels and verbal filler that carry no coaching signal on their own.
+FILLER_WORDS = frozenset(
+    (
+        "yeah yep yup yes ya no nope nah ok okay k right sure mm mhm mmhmm hmm hm uh um uhh umm er ah oh huh "
+        "wow cool nice great gotcha totally exactly absolutely definitely like so well alright awesome "
+        "perfect true correct yea sounds good"
+    ).split()
+)
+
+# Function words ignored when counting content words.
+STOPWORDS = frozenset(
+    (
+        "a an the and or but if then of to in on at for with is are was were be been it its it's this that i "
+        "you we me my your our he she they them do does did just i'm that's there here what kind really know "
+        "mean get"
+    ).split()
+)
+
+# Short hesitation/objection markers that must never be gated, however few words surround them.
+SIGNAL_PHRASES = (
+    "not sure",
+    "expensive",
+    "afford",
+    "think about it",
+    "too much",
+    "price",
+    "cost",
+    "money",
+    "spouse",
+    "wife",
+    "husband",
+    "need time",
+    "not interested",
+    "no way",
+    "can't",
+    "don't know",
+)
+
+_WORD_RE = re.compile(r"[a-z0-9$']+")
+
+
+@dataclass
+class GateDecision:
+    """Outcome of checking one trigger payload."""
+
+    dispatch: bool
+    reason: str
+    content_words: int
+    similarity: Optional[float] = None
+
+
+def content_words(text: str) -> list[str]:
+    """Lower-cased words of ``text`` minus filler and stopwords."""
+    words = _WORD_RE.findall(text.lower().replace("-", ""))
+    return [w for w in words if w not in FILLER_WORDS and w not in STOPWORDS]
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors (0.0 when either is all zeros)."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class NoveltyGate:
+    """Decides whether a trigger payload is worth an LLM call."""
+
+    def __init__(
+        self,
+        min_content_words: int = 2,
+        max_overlap: float = 0.8,
+        max_similarity: float = 0.95,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        max_deferred: int = 4,
+    ) -> None:
+        """
+        Args:
+            min_content_words: Payloads with fewer content words are deferred.
+            max_overlap: Defer when this share of content words repeats the last analyzed text.
+            max_similarity: Defer when embedding cosine similarity to the last analyzed text exceeds this.
+            embed_fn: Optional text → vector function (e.g. the RAG sentence-transformer).
+            max_deferred: Deferred payloads kept for merging (oldest dropped beyond this).
+        """
+        self.min_content_words = min_content_words
+        self.max_overlap = max_overlap
+        self.max_similarity = max_similarity
+        self.embed_fn = embed_fn
+        self.max_deferred = max_deferred
+
+        self._deferred: list[str] = []
+        self._last_words: set[str] = set()
+        self._last_vector: Optional[Sequence[float]] = None
+        self.checked = 0
+        self.suppressed = 0
+        self.reasons: Counter = Counter()
+
+    def admit(self, active_text: str) -> Optional[str]:
+        """Gate one trigger payload.
+
+        Returns the text to analyze (earlier deferred payloads merged in front),
+        or None if the merged payload is still low-information and was deferred.
+        """
+        combined = " ".join(self._deferred + [active_text])
+        if self.check(combined).dispatch:
+            self._deferred.clear()
+            self.record_dispatched(combined)
+            return combined
+        self._deferred = (self._deferred + [active_text])[-self.max_deferred :]
+        return None
+
+    def check(self, text: str) -> GateDecision:
+        """Classify ``text``; does not change what counts as 'last analyzed'."""
+        self.checked += 1
+        words = content_words(text)
+        lowered = text.lower()
+
+        if any(phrase in lowered for phrase in SIGNAL_PHRASES):
+            self.reasons["dispatched"] += 1
+            return GateDecision(True, "signal_phrase", len(words))
+
+        if len(words) < self.min_content_words:
+            return self._suppress("low_information", len(words))
+
+        if self._last_words and words:
+            overlap = len(set(words) & self._last_words) / len(set(words))
+            if overlap >= self.max_overlap:
+                return self._suppress("repeat", len(words), overlap)
+
+        similarity = None
+        if self.embed_fn is not None and self._last_vector is not None:
+            try:
+                similarity = cosine_similarity(self.embed_fn(text), self._last_vector)
+            except Exception as e:
+                logger.warning(f"Novelty gate embedding failed, skipping similarity check: {e}")
+            if similarity is not None and similarity >= self.max_similarity:
+                return self._suppress("similar", len(words), similarity)
+
+        self.reasons["dispatched"] += 1
+        return GateDecision(True, "novel", len(words), similarity)
+
+    def record_dispatched(self, text: str) -> None:
+        """Remember the text that was actually sent for analysis."""
+        self._last_words = set(content_words(text))
+        if self.embed_fn is not None:
+            try:
+                self._last_vector = self.embed_fn(text)
+            except Exception as e:
+                logger.warning(f"Novelty gate embedding failed: {e}")
+                self._last_vector = None
+
+    @property
+    def suppression_rate(self) -> float:
+        return self.suppressed / self.checked if self.checked else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "checked": self.checked,
+            "suppressed": self.suppressed,
+            "suppression_rate": round(self.suppression_rate, 3),
+            "reasons": dict(self.reasons),
+        }
+
+    def _suppress(self, reason: str, count: int, similarity: Optional[float] = None) -> GateDecision:
+        self.suppressed += 1
+        self.reasons[reason] += 1
+        return GateDecision(False, reason, count, similarity)
+
+
+def replay_transcript(transcript: str, gate: Optional[NoveltyGate] = None) -> dict:
+    """Feed a recorded transcript (one utterance per line) through the buffer triggers and the gate.
+
+    Returns the trigger count and how many of those calls the gate would have saved.
+    """
+    from .buffer_manager import DualBufferManager
+
+    gate = gate or NoveltyGate()
+    dispatched: list[str] = []
+
+    def on_analysis_ready(active_text: str, context_text: str) -> None:
+        merged = gate.admit(active_text)
+        if merged is not None:
+            dispatched.append(merged)
+
+    manager = DualBufferManager(on_analysis_ready=on_analysis_ready)
+    t = 0.0
+    for line in transcript.splitlines():
+        text = line.split(":", 1)[1] if re.match(r"^\s*[\w .'-]{1,40}:", line) else line
+        text = text.strip()
+        if not text:
+            continue
+        duration = max(0.5, len(text.split()) * 0.35)
+        manager.on_transcript_chunk(text, [{"text": text, "start": t, "end": t + duration, "completed": True}])
+        t += duration + 0.2
+
+    return {"triggers": gate.checked, "dispatched": len(dispatched), **gate.stats()}
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Report how many analysis calls the novelty gate suppresses")
+    parser.add_argument("files", nargs="*", help="Transcript text files (one utterance per line)")
+    parser.add_argument("--db", help="ValidationDB path; replays every stored call transcript")
+    parser.add_argument("--min-content-words", type=int, default=2)
+    args = parser.parse_args()
+
+    transcripts: list[tuple[str, str]] = [(f, Path(f).read_text(encoding="utf-8")) for f in args.files]
+    if args.db:
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+        from validation.db import ValidationDB
+
+        transcripts += [(c["name"], c["transcript"] or "") for c in ValidationDB(args.db).get_all_calls()]
+
+    if not transcripts:
+        print("No transcripts to replay (pass files or --db).")
+        sys.exit(1)
+
+    total_triggers = total_suppressed = 0
+    for name, transcript in transcripts:
+        report = replay_transcript(transcript, NoveltyGate(min_content_words=args.min_content_words))
+        total_triggers += report["triggers"]
+        total_suppressed += report["suppressed"]
+        print(
+            f"{name}: {report['triggers']} triggers, {report['suppressed']} suppressed "
+            f"({report['suppression_rate']:.0%}) {report['reasons']}"
+        )
+
+    rate = total_suppressed / total_triggers if total_triggers else 0.0
+    print(f"\nTotal: {total_triggers} triggers, {total_suppressed} suppressed ({rate:.0%} of LLM calls saved)")
@@ -141,19 +141,49 @@ _UNTRUSTED_TRANSCRIPT_RULES = """SECURITY RULES:
 - Return only the requested JSON object."""
 
 
+def _known_location_block(known_location: str | None) -> str:
+    """Prompt block stating a script location the local classifier is confident about."""
+    if not known_location:
+        return ""
+    return (
+        f"\nSCRIPT LOCATION (given — detected locally, do not re-derive): {sanitize_untrusted_text(known_location)}\n"
+    )
+
+
+def _guidance_output_format(location_hint: str, key_points_hint: str, suggestion_hint: str, known: bool) -> str:
+    """JSON schema for guidance; drops script_location when the location is already given."""
+    fields = []
+    if not known:
+        fields.append(f'    "script_location": "{location_hint}"')
+    fields += [
+        '    "archetype": "pain_buyer|vision_buyer|crisis_buyer|convenience_buyer|tire_kicker|unknown"',
+        f'    "key_points": {key_points_hint}',
+        f'    "suggestion": "{suggestion_hint}"',
+    ]
+    return "OUTPUT FORMAT (JSON ONLY):\n{\n" + ",\n".join(fields) + "\n}"
+
+
 # =============================================================================
 # GUIDANCE PROMPT (Real-time per-chunk coaching)
 # =============================================================================
 
 
-def get_script_guidance_prompt(script_content: str) -> str:
+def get_script_guidance_prompt(script_content: str, known_location: str | None = None) -> str:
     """
     Build the system prompt for real-time call coaching.
 
     Uses the Hardly Selling framework + KubeCraft 132-call empirical analysis.
     The script_content parameter is kept for backward compatibility but the
     coaching knowledge is embedded from the decision tree, not the raw script.
+    When ``known_location`` is given it is stated as fact and the output
+    schema omits ``script_location``.
     """
+    output_format = _guidance_output_format(
+        "Phase name from the 13 phases above",
+        '["specific thing the prospect revealed", "another specific thing revealed"]',
+        "Specific, actionable coaching: exact question to ask or phrase to use right now",
+        known=bool(known_location),
+    )
     return f"""You are a real-time sales coaching AI. A sales rep is on a live high-ticket sales call and you are reading the transcript in real-time.
 
 {_CALL_PHASE_GUIDE}
@@ -165,19 +195,34 @@ def get_script_guidance_prompt(script_content: str) -> str:
 {_CLOSE_SIGNALS}
 
 {_UNTRUSTED_TRANSCRIPT_RULES}
-
+{_known_location_block(known_location)}
 INSTRUCTIONS:
 1. Read the conversation transcript provided.
 2. Determine which phase we're in and which archetype the prospect is showing.
 3. Identify what the prospect has revealed — pain, goals, objections, buying signals, emotional triggers.
 4. Suggest the SINGLE BEST thing for the rep to say or ask RIGHT NOW. Be specific. Use the prospect's own words where possible.
 
+{output_format}"""
+
+
+def get_compact_guidance_prompt(known_location: str | None = None) -> str:
+    """
+    Build a short suggestion-only system prompt for requests close to their deadline.
+
+    Drops the archetype guide and every output field except ``suggestion`` so
+    the model has little to read and little to write.
+    """
+    return f"""You are a real-time sales coaching AI. A sales rep is on a live high-ticket sales call and needs a suggestion NOW.
+
+{_CALL_PHASE_GUIDE}
+
+{_UNTRUSTED_TRANSCRIPT_RULES}
+{_known_location_block(known_location)}
+Suggest the SINGLE BEST thing for the rep to say or ask right now, in one sentence. Use the prospect's own words.
+
 OUTPUT FORMAT (JSON ONLY):
 {{
-    "script_location": "Phase name from the 13 phases above",
-    "archetype": "pain_buyer|vision_buyer|crisis_buyer|convenience_buyer|tire_kicker|unknown",
-    "key_points": ["specific thing the prospect revealed", "another specific thing revealed"],
-    "suggestion": "Specific, actionable coaching: exact question to ask or phrase to use right now"
+    "suggestion": "Exact question to ask or phrase to use right now"
 }}"""
 
 
@@ -186,17 +231,25 @@ OUTPUT FORMAT (JSON ONLY):
 # =============================================================================
 
 
-def get_rag_guidance_prompt(retrieved_sections: list[str]) -> str:
+def get_rag_guidance_prompt(retrieved_sections: list[str], known_location: str | None = None) -> str:
     """
     Build the system prompt for RAG-based coaching.
 
     Uses Hardly Selling framework + retrieved playbook sections for this moment.
+    When ``known_location`` is given the output schema omits ``script_location``.
     """
     if not retrieved_sections:
         sections_block = "(No specific playbook sections retrieved — use framework knowledge.)"
     else:
         sections_block = "\n\n---\n\n".join(section.strip() for section in retrieved_sections)
 
+    output_format = _guidance_output_format(
+        "Phase name",
+        '["specific thing revealed", "another specific thing revealed"]',
+        "Specific, actionable: what to say or ask right now",
+        known=bool(known_location),
+    )
+
     return f"""You are a real-time sales coaching AI. A sales rep is on a live high-ticket sales call.
 
 {_CALL_PHASE_GUIDE}
@@ -208,7 +261,7 @@ def get_rag_guidance_prompt(retrieved_sections: list[str]) -> str:
 {_CLOSE_SIGNALS}
 
 {_UNTRUSTED_TRANSCRIPT_RULES}
-
+{_known_location_block(known_location)}
 RETRIEVED PLAYBOOK CONTEXT (relevant sections for this moment in the call):
 {sections_block}
 
@@ -218,13 +271,7 @@ INSTRUCTIONS:
 3. Determine phase, archetype, and what the prospect has revealed.
 4. Suggest the SINGLE BEST next move. Use their exact words wherever possible.
 
-OUTPUT FORMAT (JSON ONLY):
-{{
-    "script_location": "Phase name",
-    "archetype": "pain_buyer|vision_buyer|crisis_buyer|convenience_buyer|tire_kicker|unknown",
-    "key_points": ["specific thing revealed", "another specific thing revealed"],
-    "suggestion": "Specific, actionable: what to say or ask right now"
-}}"""
+{output_format}"""
 
 
 # =============================================================================
@@ -232,6 +279,16 @@ OUTPUT FORMAT (JSON ONLY):
 # =============================================================================
 
 
+_SUMMARY_OUTPUT_FORMAT = """OUTPUT FORMAT (JSON ONLY):
+{
+    "summary": "3-5 sentence rolling summary focused on what matters for the sale",
+    "key_points": ["specific thing prospect revealed 1", "specific thing revealed 2"],
+    "pain_indicators": ["their exact words or phrases that reveal pain or motivation"],
+    "stage_hint": "open|context|problem_development|baseline|solution_vision|consequence|blockers|responsibility|tiedown|bridge|pitch|temp_check|close",
+    "archetype_hint": "pain_buyer|vision_buyer|crisis_buyer|convenience_buyer|tire_kicker|unknown"
+}"""
+
+
 def get_summary_prompt(transcript: str, previous_summary: str = "") -> str:
     """
     Build the prompt for generating a rolling conversation summary.
@@ -265,14 +322,47 @@ INSTRUCTIONS:
 4. Determine which call stage we're in.
 5. Identify buyer archetype from the signals above. Use "unknown" only if truly no signals yet.
 
-OUTPUT FORMAT (JSON ONLY):
-{{
-    "summary": "3-5 sentence rolling summary focused on what matters for the sale",
-    "key_points": ["specific thing prospect revealed 1", "specific thing revealed 2"],
-    "pain_indicators": ["their exact words or phrases that reveal pain or motivation"],
-    "stage_hint": "open|context|problem_development|baseline|solution_vision|consequence|blockers|responsibility|tiedown|bridge|pitch|temp_check|close",
-    "archetype_hint": "pain_buyer|vision_buyer|crisis_buyer|convenience_buyer|tire_kicker|unknown"
-}}"""
+{_SUMMARY_OUTPUT_FORMAT}"""
+
+
+def get_incremental_summary_prompt(new_transcript: str, previous_summary: dict) -> str:
+    """
+    Build the prompt for updating a summary with only the transcript since the last one.
+
+    ``previous_summary`` is the last structured summary (summary, key_points,
+    pain_indicators, stage_hint, archetype_hint); it stands in for everything
+    said before ``new_transcript``, so input size stays flat through the call.
+    """
+    previous_block = _json_for_prompt(
+        {
+            key: [sanitize_untrusted_text(v) for v in value]
+            if isinstance(value, list)
+            else sanitize_untrusted_text(value)
+            for key, value in previous_summary.items()
+        }
+    )
+    transcript_block = _json_for_prompt({"new_transcript": sanitize_untrusted_text(new_transcript)})
+
+    return f"""You are a conversation analyst for a high-ticket sales call. Update the running summary with what was just said.
+
+{_ARCHETYPE_GUIDE}
+
+{_UNTRUSTED_TRANSCRIPT_RULES}
+
+PREVIOUS SUMMARY (covers the call up to the new transcript):
+{previous_block}
+
+UNTRUSTED TRANSCRIPT JSON (only what was said since the previous summary):
+<untrusted_transcript_json>
+{transcript_block}
+</untrusted_transcript_json>
+
+INSTRUCTIONS:
+1. Rewrite the summary in 3-5 sentences covering the WHOLE call so far: previous summary plus the new transcript.
+2. Keep previous key points and pain indicators that still hold; add new ones; drop any the prospect has contradicted.
+3. Update the call stage and buyer archetype if the new transcript changes them.
+
+{_SUMMARY_OUTPUT_FORMAT}"""
 
 
 # =============================================================================
@@ -501,3 +591,66 @@ def get_recommendation_prompt(
         key_points=key_points_block,
         rag_sections=rag_block,
     )
+
+
+def _blueprint_parts(stage: str) -> tuple[str, str, str]:
+    """Split a stage blueprint into its role line, stage guidance and recommendation JSON format."""
+    blueprint = SEMANTIC_BLUEPRINTS.get(stage, SEMANTIC_BLUEPRINTS["discovery"])
+    marker = "\x00rag\x00"
+    text = blueprint.format(summary="", key_points="", rag_sections=marker)
+    role = text.split("\n", 1)[0].strip()
+    guidance, output_format = text.split("OUTPUT FORMAT (JSON ONLY):", 1)
+    return role, guidance.split(marker, 1)[1].strip(), output_format.strip()
+
+
+def get_fused_summary_recommendation_prompt(
+    transcript: str,
+    stage: str,
+    rag_sections: list[str],
+    previous_summary: dict | None = None,
+) -> str:
+    """
+    Build one prompt that updates the summary and generates stage recommendations.
+
+    The summary part is the regular (or, given ``previous_summary``,
+    incremental) summary prompt; the recommendation part is the ``stage``
+    blueprint's guidance. The schema puts the summary fields first and the
+    recommendation last, so a streaming caller can show the summary before
+    the questions finish.
+
+    Args:
+        transcript: Transcript to summarize (the delta when ``previous_summary`` is given).
+        stage: Stage whose blueprint drives the questions (usually the last summary's stage_hint).
+        rag_sections: Relevant playbook sections from RAG retrieval.
+        previous_summary: Last structured summary, for an incremental update.
+
+    Returns:
+        Complete prompt string for the fused LLM call.
+    """
+    if previous_summary:
+        summary_prompt = get_incremental_summary_prompt(transcript, previous_summary)
+    else:
+        summary_prompt = get_summary_prompt(transcript)
+    summary_prompt = summary_prompt[: -len(_SUMMARY_OUTPUT_FORMAT)].rstrip()
+
+    role, guidance, recommendation_format = _blueprint_parts(stage)
+    rag_block = (
+        "\n\n---\n\n".join(s.strip() for s in rag_sections) if rag_sections else "(no playbook sections retrieved)"
+    )
+    summary_fields = _SUMMARY_OUTPUT_FORMAT.split("{", 1)[1].rsplit("}", 1)[0].rstrip()
+    recommendation_format = recommendation_format.replace("\n", "\n    ")
+
+    return f"""{summary_prompt}
+
+THEN COACH THE REP'S NEXT MOVE, based on your updated summary and key points.
+{role}
+
+RELEVANT PLAYBOOK SECTIONS:
+{rag_block}
+
+{guidance}
+
+OUTPUT FORMAT (JSON ONLY) — write the summary fields FIRST and "recommendation" LAST:
+{{{summary_fields},
+    "recommendation": {recommendation_format}
+}}"""
@@ -0,0 +1,290 @@
+"""
+Latency-aware routing across several configured LLM providers.
+
+Tracks an EWMA of time-to-first-token (TTFT) and streaming tokens/sec per
+provider+model, routes each request to the fastest healthy target, and trips
+a per-target circuit breaker after consecutive errors or timeouts. An open
+breaker lets a single half-open probe through after ``reset_timeout`` seconds;
+the probe's outcome closes or re-opens it.
+
+Enable by listing providers in priority order:
+
+    LLM_ROUTER_PROVIDERS=local,gemini,openrouter
+
+Each provider is configured exactly as for ``LLM_PROVIDER`` (see
+``llm_provider.get_llm_config``); providers missing credentials are skipped.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .llm_provider import get_llm_config
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the TTFT histogram buckets exposed to operators.
+TTFT_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000)
+
+# Output length assumed when turning tokens/sec into an expected generation time.
+_EXPECTED_OUTPUT_TOKENS = 120
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class RouteTarget:
+    """One routable provider + model."""
+
+    provider: str
+    base_url: str
+    api_key: str
+    model: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    def __repr__(self) -> str:
+        return f"RouteTarget(provider='{self.provider}', model='{self.model}', base_url='{self.base_url}')"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing."""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def available(self, now: float) -> bool:
+        """Whether a request may be routed here (no side effects)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        return not self._probe_in_flight
+
+    def on_dispatch(self, now: float) -> None:
+        """Record that a request was routed here; an expired open breaker becomes a half-open probe."""
+        if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self, now: float) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"Circuit opened after {self.consecutive_failures} consecutive failures")
+            self.state = OPEN
+            self.opened_at = now
+
+
+class DispatchOutcome:
+    """One routed request's outcome, settled once.
+
+    A request abandoned on timeout is recorded as a failure; its stream
+    may still finish later, and that late success must not close the
+    breaker or feed the latency EWMA. Whoever claims first records.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.settled = False
+
+    def claim(self) -> bool:
+        """True for the first caller only: that caller records the outcome."""
+        with self._lock:
+            if self.settled:
+                return False
+            self.settled = True
+            return True
+
+
+@dataclass
+class LatencyStats:
+    """EWMA latency/throughput plus a TTFT histogram for one target."""
+
+    alpha: float = 0.3
+    ewma_ttft_ms: Optional[float] = None
+    ewma_tokens_per_sec: Optional[float] = None
+    samples: int = 0
+    errors: int = 0
+    ttft_histogram: list[int] = field(default_factory=lambda: [0] * (len(TTFT_BUCKETS_MS) + 1))
+
+    def observe(self, ttft_ms: float, tokens_per_sec: Optional[float]) -> None:
+        self.samples += 1
+        self.ewma_ttft_ms = ttft_ms if self.ewma_ttft_ms is None else self._blend(self.ewma_ttft_ms, ttft_ms)
+        if tokens_per_sec:
+            self.ewma_tokens_per_sec = (
+                tokens_per_sec
+                if self.ewma_tokens_per_sec is None
+                else self._blend(self.ewma_tokens_per_sec, tokens_per_sec)
+            )
+        bucket = next((i for i, bound in enumerate(TTFT_BUCKETS_MS) if ttft_ms <= bound), len(TTFT_BUCKETS_MS))
+        self.ttft_histogram[bucket] += 1
+
+    def expected_ms(self) -> float:
+        """Expected time to a complete suggestion; unmeasured targets score 0 so they get explored."""
+        if self.ewma_ttft_ms is None:
+            return 0.0
+        generation_ms = 0.0
+        if self.ewma_tokens_per_sec:
+            generation_ms = _EXPECTED_OUTPUT_TOKENS / self.ewma_tokens_per_sec * 1000
+        return self.ewma_ttft_ms + generation_ms
+
+    def _blend(self, current: float, sample: float) -> float:
+        return self.alpha * sample + (1 - self.alpha) * current
+
+
+class ProviderRouter:
+    """Routes LLM requests to the fastest healthy provider target."""
+
+    def __init__(
+        self,
+        targets: list[RouteTarget],
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        alpha: float = 0.3,
+        decision_log_size: int = 200,
+    ) -> None:
+        if not targets:
+            raise ValueError("ProviderRouter needs at least one target")
+        self.targets = list(targets)
+        self._breakers = {t.name: CircuitBreaker(failure_threshold, reset_timeout) for t in self.targets}
+        self._stats = {t.name: LatencyStats(alpha=alpha) for t in self.targets}
+        self._decisions: deque[dict] = deque(maxlen=decision_log_size)
+        self._lock = threading.Lock()
+
+    def select(self, exclude: Iterable[str] = ()) -> RouteTarget:
+        """Pick the healthy target with the lowest expected latency (config order breaks ties).
+
+        Counts as a dispatch: the caller must record the request's outcome.
+        ``exclude`` names targets to skip, e.g. the primary a fallback replaces.
+        """
+        with self._lock:
+            now = time.time()
+            target, reason = self._choose(now, exclude)
+            self._breakers[target.name].on_dispatch(now)
+            self._decisions.append(
+                {
+                    "timestamp": now,
+                    "target": target.name,
+                    "reason": reason,
+                    "expected_ms": round(self._stats[target.name].expected_ms(), 1),
+                    "breaker": self._breakers[target.name].state,
+                }
+            )
+            return target
+
+    def peek(self) -> RouteTarget:
+        """The target ``select`` would pick now, without dispatching to it (breakers are not touched)."""
+        with self._lock:
+            return self._choose(time.time())[0]
+
+    def _choose(self, now: float, exclude: Iterable[str] = ()) -> tuple[RouteTarget, str]:
+        candidates = [t for t in self.targets if t.name not in exclude]
+        if not candidates:
+            raise ValueError("ProviderRouter: every target is excluded")
+        healthy = [t for t in candidates if self._breakers[t.name].available(now)]
+        if healthy:
+            target = min(healthy, key=lambda t: self._stats[t.name].expected_ms())
+            return target, "fastest_healthy" if self._stats[target.name].samples else "explore"
+        # Every breaker is open: try the one that has been resting longest.
+        return min(candidates, key=lambda t: self._breakers[t.name].opened_at), "all_open"
+
+    def record_success(self, target: RouteTarget, ttft_ms: float, tokens_per_sec: Optional[float] = None) -> None:
+        with self._lock:
+            self._stats[target.name].observe(ttft_ms, tokens_per_sec)
+            self._breakers[target.name].record_success()
+
+    def record_failure(self, target: RouteTarget, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._stats[target.name].errors += 1
+            self._breakers[target.name].record_failure(time.time())
+        logger.warning(f"Router: {target.name} failed: {error}")
+
+    def snapshot(self) -> dict:
+        """Operator view: per-target health, EWMA latency, TTFT histogram and recent decisions."""
+        with self._lock:
+            targets = []
+            for t in self.targets:
+                stats = self._stats[t.name]
+                breaker = self._breakers[t.name]
+                targets.append(
+                    {
+                        "name": t.name,
+                        "provider": t.provider,
+                        "model": t.model,
+                        "breaker": breaker.state,
+                        "consecutive_failures": breaker.consecutive_failures,
+                        "ewma_ttft_ms": stats.ewma_ttft_ms,
+                        "ewma_tokens_per_sec": stats.ewma_tokens_per_sec,
+                        "samples": stats.samples,
+                        "errors": stats.errors,
+                        "ttft_histogram": {
+                            **{f"le_{bound}": stats.ttft_histogram[i] for i, bound in enumerate(TTFT_BUCKETS_MS)},
+                            "gt_max": stats.ttft_histogram[-1],
+                        },
+                    }
+                )
+            return {"targets": targets, "decisions": list(self._decisions)}
+
+
+def build_router_from_env() -> Optional[ProviderRouter]:
+    """Build a router from LLM_ROUTER_PROVIDERS, or None when routing is not configured."""
+    names = [p.strip().lower() for p in os.getenv("LLM_ROUTER_PROVIDERS", "").split(",") if p.strip()]
+    if not names:
+        return None
+
+    targets = []
+    for name in names:
+        try:
+            cfg = get_llm_config(name)
+        except ValueError as e:
+            logger.warning(f"Router: skipping provider '{name}': {e}")
+            continue
+        targets.append(RouteTarget(provider=cfg.provider, base_url=cfg.base_url, api_key=cfg.api_key, model=cfg.model))
+
+    if not targets:
+        logger.warning("Router: no usable providers in LLM_ROUTER_PROVIDERS — routing disabled")
+        return None
+
+    router = ProviderRouter(
+        targets,
+        failure_threshold=int(os.getenv("LLM_ROUTER_FAILURE_THRESHOLD", "3")),
+        reset_timeout=float(os.getenv("LLM_ROUTER_RESET_TIMEOUT", "30")),
+    )
+    logger.info(f"Router: routing across {[t.name for t in targets]}")
+    return router
+
+
+_router_lock = threading.Lock()
+_router: Optional[ProviderRouter] = None
+_router_built = False
+
+
+def get_provider_router() -> Optional[ProviderRouter]:
+    """Return the process-wide router (built once from env), or None if disabled."""
+    global _router, _router_built
+    with _router_lock:
+        if not _router_built:
+            _router = build_router_from_env()
+            _router_built = True
+        return _router
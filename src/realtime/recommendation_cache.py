@@ -0,0 +1,236 @@
+"""
+Speculative recommendation precomputation.
+
+Recommendations depend on the rolling summary and the detected stage, both of
+which change rarely compared with how often the rep asks for them. This
+module recomputes recommendations in the background whenever a new summary
+lands or the stage changes, caches them per (summary version, stage), and
+lets the "recommend" command answer from the cache instantly.
+
+A cached entry goes stale once enough new transcript lines arrive after it
+was computed; staleness triggers another background refresh. Speculative
+calls are capped per minute so they never crowd out live coaching.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedRecommendation:
+    """A recommendation computed ahead of the rep asking for it."""
+
+    summary_version: int
+    stage: str
+    content: str
+    transcript_mark: int
+    created_at: float
+    latency_ms: float
+    speculative: bool = True
+
+
+@dataclass
+class _Inputs:
+    summary_version: int = 0
+    summary: str = ""
+    key_points: list[str] = field(default_factory=list)
+    stage: str = "unknown"
+
+
+class RecommendationPrecomputer:
+    """Background recommendation cache keyed by (summary version, stage)."""
+
+    def __init__(
+        self,
+        recommend_fn: Callable[[str, list[str], str, str], str],
+        get_transcript: Callable[[], str],
+        max_per_minute: int = 2,
+        stale_after_lines: int = 6,
+        max_entries: int = 4,
+        on_ready: Optional[Callable[[CachedRecommendation], None]] = None,
+    ) -> None:
+        self.recommend_fn = recommend_fn
+        self.get_transcript = get_transcript
+        self.max_per_minute = max_per_minute
+        self.stale_after_lines = stale_after_lines
+        self.max_entries = max_entries
+        self.on_ready = on_ready
+
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[tuple[int, str], CachedRecommendation] = OrderedDict()
+        self._inputs = _Inputs()
+        self._tracked_stage: Optional[str] = None
+        self._transcript_mark = 0
+        self._recent_calls: deque[float] = deque()
+        self._in_flight = False
+        self._pending = False
+        self._closed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.speculative_calls = 0
+        self.skipped_for_budget = 0
+
+    # ------------------------------------------------------------------
+    # Triggers
+    # ------------------------------------------------------------------
+
+    def update_summary(self, summary_version: int, summary: str, key_points: list[str], stage: str) -> None:
+        """A new summary is available: precompute for it (at the tracked stage, if there is one)."""
+        if not summary:
+            return
+        with self._lock:
+            stage = self._tracked_stage or stage or "unknown"
+            self._inputs = _Inputs(summary_version, summary, list(key_points), stage)
+        self._schedule()
+
+    def update_stage(self, stage: str) -> None:
+        """The detected stage changed: precompute for the new stage."""
+        with self._lock:
+            self._tracked_stage = stage
+            if not self._inputs.summary or stage == self._inputs.stage:
+                return
+            self._inputs = _Inputs(self._inputs.summary_version, self._inputs.summary, self._inputs.key_points, stage)
+        self._schedule()
+
+    def note_transcript(self) -> None:
+        """Newer transcript content arrived; refresh once cached entries go stale."""
+        with self._lock:
+            self._transcript_mark += 1
+            stale = [key for key, entry in self._cache.items() if self._is_stale(entry)]
+            for key in stale:
+                del self._cache[key]
+        if stale:
+            logger.debug(f"Recommendation cache: invalidated {len(stale)} stale entries")
+        # No-op while the current entry is fresh; otherwise retries within the per-minute budget
+        self._schedule()
+
+    # ------------------------------------------------------------------
+    # Cache access
+    # ------------------------------------------------------------------
+
+    @property
+    def stage(self) -> Optional[str]:
+        """The live stage from ``update_stage``, or None until one was tracked."""
+        return self._tracked_stage
+
+    def get(self, summary_version: int, stage: str) -> Optional[CachedRecommendation]:
+        """Return a fresh cached recommendation, or None on a miss."""
+        with self._lock:
+            entry = self._cache.get((summary_version, stage))
+            if entry is None or self._is_stale(entry):
+                self.misses += 1
+                return None
+            self._cache.move_to_end((summary_version, stage))
+            self.hits += 1
+            return entry
+
+    def store(self, summary_version: int, stage: str, content: str, latency_ms: float = 0.0) -> None:
+        """Cache a recommendation computed on demand so repeat clicks are instant."""
+        with self._lock:
+            self._put(
+                CachedRecommendation(
+                    summary_version=summary_version,
+                    stage=stage,
+                    content=content,
+                    transcript_mark=self._transcript_mark,
+                    created_at=time.time(),
+                    latency_ms=latency_ms,
+                    speculative=False,
+                )
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "speculative_calls": self.speculative_calls,
+                "skipped_for_budget": self.skipped_for_budget,
+                "cached_entries": len(self._cache),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _is_stale(self, entry: CachedRecommendation) -> bool:
+        return self._transcript_mark - entry.transcript_mark > self.stale_after_lines
+
+    def _put(self, entry: CachedRecommendation) -> None:
+        self._cache[(entry.summary_version, entry.stage)] = entry
+        self._cache.move_to_end((entry.summary_version, entry.stage))
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _within_budget(self, now: float) -> bool:
+        while self._recent_calls and now - self._recent_calls[0] >= 60:
+            self._recent_calls.popleft()
+        return len(self._recent_calls) < self.max_per_minute
+
+    def _schedule(self) -> None:
+        """Start a background computation, coalescing triggers while one is in flight."""
+        with self._lock:
+            if self._closed or not self._inputs.summary:
+                return
+            key = (self._inputs.summary_version, self._inputs.stage)
+            cached = self._cache.get(key)
+            if cached is not None and not self._is_stale(cached):
+                return
+            if self._in_flight:
+                self._pending = True
+                return
+            now = time.time()
+            if not self._within_budget(now):
+                self.skipped_for_budget += 1
+                logger.debug("Recommendation precompute skipped: per-minute budget spent")
+                return
+            self._recent_calls.append(now)
+            self.speculative_calls += 1
+            self._in_flight = True
+            self._pending = False
+            inputs = self._inputs
+            mark = self._transcript_mark
+
+        threading.Thread(target=self._compute, args=(inputs, mark), daemon=True).start()
+
+    def _compute(self, inputs: _Inputs, mark: int) -> None:
+        start = time.time()
+        try:
+            content = self.recommend_fn(inputs.summary, inputs.key_points, inputs.stage, self.get_transcript())
+            entry = CachedRecommendation(
+                summary_version=inputs.summary_version,
+                stage=inputs.stage,
+                content=content,
+                transcript_mark=mark,
+                created_at=time.time(),
+                latency_ms=(time.time() - start) * 1000,
+            )
+            with self._lock:
+                if not self._closed:
+                    self._put(entry)
+            logger.info(
+                f"Precomputed recommendation for stage={inputs.stage} "
+                f"(summary v{inputs.summary_version}) in {entry.latency_ms:.0f}ms"
+            )
+            if self.on_ready:
+                self.on_ready(entry)
+        except Exception as e:
+            logger.warning(f"Recommendation precompute failed: {e}")
+        finally:
+            with self._lock:
+                self._in_flight = False
+                rerun = self._pending
+            if rerun:
+                self._schedule()
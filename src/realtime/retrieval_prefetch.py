@@ -0,0 +1,179 @@
+"""
+Speculative RAG retrieval as transcript segments arrive.
+
+Retrieval (query embedding + vector search) used to run inside
+``StreamingAnalyzer.analyze`` before the LLM request was sent, so its time
+added straight to TTFT. The prefetcher runs it in the background each time a
+completed segment enters the buffer. At trigger time the analyzer takes the
+newest retrieval if it finishes within a short wait (``wait_ms``), otherwise
+the last completed one — retrieval leaves the critical path.
+
+Only the latest payload is retrieved: segments that arrive while a
+retrieval is running replace each other, so a burst of segments costs one
+extra retrieval, not one per segment.
+
+    RETRIEVAL_PREFETCH=true
+    RETRIEVAL_PREFETCH_WAIT_MS=20
+    RETRIEVAL_PREFETCH_MAX_AGE_SECONDS=30
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_PREFETCH = os.getenv("RETRIEVAL_PREFETCH", "true").lower() in ("true", "1", "yes")
+RETRIEVAL_PREFETCH_WAIT_MS = float(os.getenv("RETRIEVAL_PREFETCH_WAIT_MS", "20"))
+RETRIEVAL_PREFETCH_MAX_AGE_SECONDS = float(os.getenv("RETRIEVAL_PREFETCH_MAX_AGE_SECONDS", "30"))
+
+
+@dataclass
+class PrefetchedSections:
+    """One completed background retrieval."""
+
+    sections: list[str]
+    active_text: str
+    context_text: str
+    completed_at: float
+    retrieval_ms: float
+
+
+class RetrievalPrefetcher:
+    """Runs retrieval for the latest buffer payload on a background thread."""
+
+    def __init__(
+        self,
+        retrieve: Callable[[str, str], list[str]],
+        wait_ms: float = RETRIEVAL_PREFETCH_WAIT_MS,
+        max_age_seconds: float = RETRIEVAL_PREFETCH_MAX_AGE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            retrieve: ``(active_text, context_text) -> sections``, the analyzer's retrieval.
+            wait_ms: How long ``sections()`` waits for a retrieval still in flight.
+            max_age_seconds: Sections older than this are not reused (the caller retrieves itself).
+        """
+        self.retrieve = retrieve
+        self.wait_ms = wait_ms
+        self.max_age_seconds = max_age_seconds
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._pending: Optional[tuple[str, str]] = None
+        self._in_flight = False
+        self._submitted = 0
+        self._completed_seq = 0
+        self._failed_seq = 0
+        self._latest: Optional[PrefetchedSections] = None
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._counts = {"submitted": 0, "fresh": 0, "waited": 0, "stale": 0, "miss": 0, "failed": 0}
+
+    def submit(self, active_text: str, context_text: str) -> None:
+        """Queue retrieval for the current buffer payload (replaces any payload not yet started)."""
+        if not active_text.strip():
+            return
+        with self._cond:
+            if self._closed:
+                return
+            self._pending = (active_text, context_text)
+            self._submitted += 1
+            self._counts["submitted"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="retrieval-prefetch")
+                self._thread.start()
+            self._cond.notify_all()
+
+    def sections(self, context_text: Optional[str] = None) -> Optional[list[str]]:
+        """Sections for an analysis being sent now.
+
+        Waits up to ``wait_ms`` for the newest submitted payload; if it is
+        still running, returns the last completed retrieval. None when nothing
+        usable has been retrieved yet, when the newest retrieval failed (the
+        older sections were for other text), or when the sections were
+        retrieved against another ``context_text`` than the analysis sends
+        (e.g. before it was shortened); the caller then retrieves itself.
+        """
+        deadline = self._clock() + self.wait_ms / 1000
+        with self._cond:
+            target = self._submitted
+            waited = False
+            while self._completed_seq < target and (self._in_flight or self._pending is not None):
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    break
+                waited = True
+                self._cond.wait(remaining)
+
+            latest = self._latest
+            newest_failed = self._completed_seq < target <= self._failed_seq
+            if (
+                latest is None
+                or newest_failed
+                or (context_text is not None and latest.context_text != context_text)
+                or self._clock() - latest.completed_at > self.max_age_seconds
+            ):
+                self._counts["miss"] += 1
+                return None
+            if self._completed_seq >= target:
+                self._counts["waited" if waited else "fresh"] += 1
+            else:
+                self._counts["stale"] += 1
+            return list(latest.sections)
+
+    def stats(self) -> dict:
+        with self._cond:
+            counts = dict(self._counts)
+            latest_ms = self._latest.retrieval_ms if self._latest else None
+        used = counts["fresh"] + counts["waited"] + counts["stale"]
+        lookups = used + counts["miss"]
+        return {
+            **counts,
+            "off_critical_path_rate": round(used / lookups, 3) if lookups else 0.0,
+            "last_retrieval_ms": round(latest_ms, 1) if latest_ms is not None else None,
+        }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._pending = None
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                active_text, context_text = self._pending
+                self._pending = None
+                self._in_flight = True
+                seq = self._submitted
+
+            start = time.perf_counter()
+            try:
+                sections = self.retrieve(active_text, context_text)
+            except Exception as e:
+                logger.warning(f"Prefetch retrieval failed: {e}")
+                sections = None
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            with self._cond:
+                self._in_flight = False
+                if sections is None:
+                    self._counts["failed"] += 1
+                    self._failed_seq = max(self._failed_seq, seq)
+                else:
+                    self._latest = PrefetchedSections(
+                        sections, active_text, context_text, completed_at=self._clock(), retrieval_ms=elapsed_ms
+                    )
+                    self._completed_seq = max(self._completed_seq, seq)
+                self._cond.notify_all()
@@ -0,0 +1,89 @@
+"""
+Local script-location classifier for real-time analysis.
+
+Every analysis used to ask the LLM for ``script_location`` even though the
+keyword ``StageDetector`` already knows the stage for most utterances. This
+classifier runs before the LLM call: when it is confident, the location is
+given to the model in the prompt and the output schema drops the field, which
+saves output tokens and removes one thing the model can get wrong.
+
+Classification is deterministic (keyword detector with continuity).
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+# Confidence at or above which the LLM is told the location instead of asked.
+# Matches the retriever's threshold for trusting stage-based retrieval.
+DEFAULT_MIN_CONFIDENCE = float(os.getenv("STAGE_CLASSIFIER_MIN_CONFIDENCE", "0.3"))
+
+# How much trailing context the detector sees alongside the latest utterance.
+_CONTEXT_TAIL_CHARS = 500
+
+# Human-readable script locations shown to the LLM and the rep.
+STAGE_LABELS = {
+    "part_1_open": "Part 1: Open",
+    "part_2_set_agenda": "Part 2: Set Agenda",
+    "part_3_why_here": "Part 3: Why Are You Here",
+    "part_4_pain_problem": "Part 4: Pain / Problem",
+    "part_5_what_they_want": "Part 5: What They Want",
+    "part_6_blocker": "Part 6: Blocker",
+    "part_7_now_tiedown": "Part 7: NOW Tie-Down",
+    "part_8_pre_pitch": "Part 8: Pre-Pitch",
+    "part_9_pitch": "Part 9: Pitch",
+    "part_10_shut_up": "Part 10: Shut Up",
+    "part_11_temp_check": "Part 11: Temp Check",
+    "part_12_close": "Part 12: Close",
+    "objection_handling": "Objection Handling",
+}
+
+
+@dataclass
+class StageClassification:
+    """Local script-location estimate for one analysis request."""
+
+    stage: str
+    label: str
+    confidence: float
+    source: str  # "keywords" or "none"
+
+
+def _load_stage_detector():
+    """Import the RAG keyword detector (lives under src/rag, imported as ``rag``)."""
+    src_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from rag.stage_detector import StageDetector
+
+    return StageDetector()
+
+
+class StageClassifier:
+    """Classifies the current script location without calling the LLM."""
+
+    def __init__(self, detector=None, min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> None:
+        """
+        Args:
+            detector: Keyword ``StageDetector``; a fresh one is created if omitted.
+            min_confidence: Confidence needed before the location is handed to the LLM.
+        """
+        self.detector = detector or _load_stage_detector()
+        self.min_confidence = min_confidence
+        self.last_stage: Optional[str] = None
+
+    def classify(self, active_text: str, context_text: str = "") -> StageClassification:
+        """Classify the latest utterance (with a tail of context), keeping stage continuity."""
+        detect_text = active_text
+        if context_text:
+            detect_text = context_text[-_CONTEXT_TAIL_CHARS:] + "\n" + active_text
+
+        stage, confidence = self.detector.detect(detect_text, current_stage=self.last_stage)
+        source = "keywords" if confidence > 0 else "none"
+        if confidence > 0:
+            self.last_stage = stage
+        return StageClassification(stage, STAGE_LABELS.get(stage, stage), confidence, source)
+
+    def is_confident(self, classification: Optional[StageClassification]) -> bool:
+        return classification is not None and classification.confidence >= self.min_confidence
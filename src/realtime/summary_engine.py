@@ -4,24 +4,60 @@ Summary Engine for rolling conversation summaries.
 Generates a distilled summary of the conversation on a timer (~5 min)
 or on manual trigger. The summary captures key points, pain indicators,
 emotional signals, and archetype hints — feeding the recommendation engine.
+
+In incremental mode (default) each run sends only the transcript added
+since the last successful summary plus that structured summary, so input
+size and latency stay flat through a long call. Every ``full_every``-th run
+re-summarizes the whole (budget-trimmed) transcript to correct drift.
+
+With adaptive scheduling (default) the timer polls every few seconds and a
+summary runs early when enough new content has arrived or the call stage
+changed, never more often than ``min_interval``. At ``interval`` (the max)
+it runs only if at least ``min_new_lines`` new lines arrived. Poll times and
+the max interval are jittered per session so concurrent sessions spread out.
 """
 
 import json
 import logging
+import os
+import random
+import re
 import threading
 import time
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import Callable, Optional
 
 from openai import OpenAI
 
-from .prompts import get_summary_prompt
+from .compression import TRANSCRIPT_COMPRESSION, CompressionResult, TranscriptCompressor
+from .gatekeeper import Gatekeeper, Priority, RateLimitExceeded
+from .prompts import get_fused_summary_recommendation_prompt, get_incremental_summary_prompt, get_summary_prompt
+from .token_budget import TokenBudget, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
 # Default interval between automatic summaries (seconds)
 DEFAULT_SUMMARY_INTERVAL = 300  # 5 minutes
 
+# Delta-based summaries, with a full re-summary every SUMMARY_FULL_EVERY runs
+SUMMARY_INCREMENTAL = os.getenv("SUMMARY_INCREMENTAL", "true").lower() in ("true", "1", "yes")
+SUMMARY_FULL_EVERY = int(os.getenv("SUMMARY_FULL_EVERY", "4"))
+
+# Content-driven scheduling (``interval`` becomes the maximum gap between summaries)
+SUMMARY_ADAPTIVE = os.getenv("SUMMARY_ADAPTIVE", "true").lower() in ("true", "1", "yes")
+SUMMARY_MIN_INTERVAL = float(os.getenv("SUMMARY_MIN_INTERVAL", "60"))
+SUMMARY_MIN_NEW_LINES = int(os.getenv("SUMMARY_MIN_NEW_LINES", "3"))
+SUMMARY_CONTENT_TRIGGER_CHARS = int(os.getenv("SUMMARY_CONTENT_TRIGGER_CHARS", "1500"))
+SUMMARY_JITTER = float(os.getenv("SUMMARY_JITTER", "0.1"))
+SUMMARY_POLL_INTERVAL = 5.0
+
+# Output cap for a fused summary + recommendation call (summary 800 + recommendation 600)
+FUSED_MAX_TOKENS = 1400
+
+# The key that ends the summary fields of a fused response (not an escaped quote inside a string)
+_RECOMMENDATION_KEY_RE = re.compile(r'(?<!\\)"recommendation"\s*:')
+
 
 @dataclass
 class SummaryResult:
@@ -34,6 +70,7 @@ class SummaryResult:
     timestamp: float = 0.0
     latency_ms: float = 0.0
     error: Optional[str] = None
+    incremental: bool = False  # built from the transcript delta + previous summary
 
 
 class SummaryEngine:
@@ -50,11 +87,34 @@ class SummaryEngine:
         model: str,
         on_summary: Optional[Callable[[SummaryResult], None]] = None,
         interval: float = DEFAULT_SUMMARY_INTERVAL,
+        token_budget: Optional[TokenBudget] = None,
+        gatekeeper: Optional[Gatekeeper] = None,
+        incremental: bool = SUMMARY_INCREMENTAL,
+        full_every: int = SUMMARY_FULL_EVERY,
+        adaptive: bool = SUMMARY_ADAPTIVE,
+        min_interval: float = SUMMARY_MIN_INTERVAL,
+        min_new_lines: int = SUMMARY_MIN_NEW_LINES,
+        content_trigger_chars: int = SUMMARY_CONTENT_TRIGGER_CHARS,
+        jitter: float = SUMMARY_JITTER,
+        poll_interval: float = SUMMARY_POLL_INTERVAL,
+        compressor: Optional[TranscriptCompressor] = None,
     ) -> None:
         self.client = client
         self.model = model
         self.on_summary = on_summary
         self.interval = interval
+        self.token_budget = token_budget or TokenBudget()
+        self.gatekeeper = gatekeeper
+        self.incremental = incremental
+        self.full_every = max(1, full_every)
+        self.adaptive = adaptive
+        self.min_interval = min_interval
+        self.min_new_lines = min_new_lines
+        self.content_trigger_chars = content_trigger_chars
+        self.jitter = jitter
+        self.poll_interval = poll_interval
+        # Extractive compression of long transcripts before they reach the prompt
+        self.compressor = compressor or (TranscriptCompressor() if TRANSCRIPT_COMPRESSION else None)
 
         # Transcript accumulator (bounded to prevent unbounded memory growth)
         self._transcript_lines: list[str] = []
@@ -63,7 +123,23 @@ class SummaryEngine:
 
         # Current summary state
         self.current_summary: Optional[SummaryResult] = None
+        self.summary_version = 0  # bumped on every successful summary (cache key for recommendations)
         self._previous_summary_text: str = ""
+        self._previous_structured: Optional[dict] = None
+
+        # Delta tracking: lines ever added vs. lines covered by the last successful summary
+        self._lines_added = 0
+        self._summarized_lines = 0
+        self._chars_added = 0
+        self._summarized_chars = 0
+        self._incremental_since_full = 0
+
+        # Adaptive scheduling state
+        self._current_max_interval = self._jittered(self.interval)
+        self._last_stage: Optional[str] = None
+        self._stage_changed = False
+        self.runs_by_reason: Counter = Counter()
+        self.skipped_runs = 0
 
         # Timer
         self._timer: Optional[threading.Timer] = None
@@ -75,7 +151,13 @@ class SummaryEngine:
         self._running = True
         self._last_summary_time = time.time()
         self._schedule_next()
-        logger.info(f"SummaryEngine started (interval={self.interval}s)")
+        if self.adaptive:
+            logger.info(
+                f"SummaryEngine started (adaptive: {self.min_interval:.0f}-{self._current_max_interval:.0f}s, "
+                f"early after {self.content_trigger_chars} new chars or a stage change)"
+            )
+        else:
+            logger.info(f"SummaryEngine started (interval={self.interval}s)")
 
     def stop(self) -> None:
         """Stop the summary timer."""
@@ -83,12 +165,30 @@ class SummaryEngine:
         if self._timer:
             self._timer.cancel()
             self._timer = None
-        logger.info("SummaryEngine stopped")
+        if self.runs_by_reason or self.skipped_runs:
+            logger.info(f"SummaryEngine stopped (runs={dict(self.runs_by_reason)}, skipped={self.skipped_runs})")
+        else:
+            logger.info("SummaryEngine stopped")
+
+    def note_stage(self, stage: Optional[str]) -> None:
+        """Tell the scheduler the tracked call stage (a stage_hint); a change makes a summary due early.
+
+        Fed from the keyword stage tracker, not the LLM's free-text script
+        location, so rewording between analyses is not a stage change.
+        """
+        if not stage or stage == "unknown":
+            return
+        with self._lock:
+            if self._last_stage is not None and stage != self._last_stage:
+                self._stage_changed = True
+            self._last_stage = stage
 
     def add_transcript(self, text: str) -> None:
         """Add a transcript line to the accumulator (bounded)."""
         with self._lock:
             self._transcript_lines.append(text.strip())
+            self._lines_added += 1
+            self._chars_added += len(text.strip())
             # Trim oldest lines to prevent unbounded growth in long calls
             if len(self._transcript_lines) > self._max_transcript_lines:
                 self._transcript_lines = self._transcript_lines[-self._max_transcript_lines:]
@@ -98,25 +198,36 @@ class SummaryEngine:
         with self._lock:
             return "\n".join(self._transcript_lines)
 
+    def get_transcript_delta(self) -> tuple[str, int]:
+        """Transcript added since the last successful summary, and the line count it runs up to."""
+        with self._lock:
+            new_lines = min(self._lines_added - self._summarized_lines, len(self._transcript_lines))
+            lines = self._transcript_lines[-new_lines:] if new_lines > 0 else []
+            return "\n".join(lines), self._lines_added
+
     def refresh(self) -> None:
         """Force an immediate summary generation (manual trigger)."""
         logger.info("SummaryEngine: Manual refresh triggered")
         self._generate_summary()
 
     def time_until_next(self) -> float:
-        """Seconds until the next automatic summary."""
+        """Seconds until the next automatic summary at the latest."""
         elapsed = time.time() - self._last_summary_time
-        return max(0, self.interval - elapsed)
+        return max(0, self._current_max_interval - elapsed)
 
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1 + random.uniform(-self.jitter, self.jitter)) if self.jitter > 0 else seconds
+
     def _schedule_next(self) -> None:
-        """Schedule the next automatic summary."""
+        """Schedule the next automatic summary (adaptive: the next poll)."""
         if not self._running:
             return
-        self._timer = threading.Timer(self.interval, self._on_timer)
+        delay = self._jittered(self.poll_interval) if self.adaptive else self.interval
+        self._timer = threading.Timer(delay, self._on_timer)
         self._timer.daemon = True
         self._timer.start()
 
@@ -124,19 +235,138 @@ class SummaryEngine:
         """Timer callback."""
         if not self._running:
             return
-        self._generate_summary()
+        if not self.adaptive:
+            self._generate_summary()
+        else:
+            reason = self._due_reason()
+            if reason:
+                logger.info(f"SummaryEngine: summary due ({reason})")
+                self.runs_by_reason[reason] += 1
+                attempted_at = time.time()
+                self._generate_summary()
+                if self._last_summary_time < attempted_at:
+                    # Failed or deferred: back off for min_interval instead of retrying every poll
+                    self._start_window()
         self._schedule_next()
 
+    def _due_reason(self) -> Optional[str]:
+        """Why a summary is due now ("stage_change", "content", "max_interval"), or None."""
+        elapsed = time.time() - self._last_summary_time
+        if elapsed < self.min_interval:
+            return None
+        with self._lock:
+            new_lines = self._lines_added - self._summarized_lines
+            new_chars = self._chars_added - self._summarized_chars
+            stage_changed = self._stage_changed
+
+        if stage_changed and new_lines > 0:
+            return "stage_change"
+        if new_chars >= self.content_trigger_chars:
+            return "content"
+        if elapsed >= self._current_max_interval:
+            if new_lines >= self.min_new_lines:
+                return "max_interval"
+            # Too little was said to be worth a call; start a new window
+            self.skipped_runs += 1
+            logger.info(f"SummaryEngine: skipped summary ({new_lines} new lines < {self.min_new_lines})")
+            self._start_window()
+        return None
+
+    def _start_window(self) -> None:
+        self._last_summary_time = time.time()
+        self._current_max_interval = self._jittered(self.interval)
+        with self._lock:
+            self._stage_changed = False
+
+    def _use_incremental(self) -> bool:
+        return (
+            self.incremental
+            and self._previous_structured is not None
+            and self._incremental_since_full < self.full_every - 1
+        )
+
+    def _select_transcript(self) -> Optional[tuple[bool, str, int, int]]:
+        """Pick what to summarize: ``(incremental, transcript, covered_lines, covered_chars)``, or None."""
+        incremental = self._use_incremental()
+        if incremental:
+            transcript, covered_lines = self.get_transcript_delta()
+            with self._lock:
+                covered_chars = self._chars_added
+            if not transcript.strip():
+                logger.info("SummaryEngine: No new transcript since the last summary")
+                return None
+        else:
+            with self._lock:
+                transcript, covered_lines = "\n".join(self._transcript_lines), self._lines_added
+                covered_chars = self._chars_added
+            if not transcript.strip():
+                logger.info("SummaryEngine: No transcript to summarize")
+                return None
+        return incremental, transcript, covered_lines, covered_chars
+
+    def _prepare_transcript(self, transcript: str) -> tuple[str, Optional[CompressionResult]]:
+        """Compress, then budget-trim, the transcript going into the prompt."""
+        compression = None
+        if self.compressor is not None:
+            compression = self.compressor.compress(transcript, max_tokens=self.token_budget.summary_transcript)
+            transcript = compression.text
+        # Keep the most recent part of the call within the summary token budget
+        return self.token_budget.fit_summary_transcript(transcript), compression
+
+    def _apply_summary(
+        self, data: dict, incremental: bool, covered_lines: int, covered_chars: int, start_time: float
+    ) -> SummaryResult:
+        """Store a parsed summary as the current one and start the next scheduling window."""
+        result = SummaryResult(
+            summary=data.get("summary", ""),
+            key_points=data.get("key_points", []),
+            pain_indicators=data.get("pain_indicators", []),
+            stage_hint=data.get("stage_hint", "unknown"),
+            archetype_hint=data.get("archetype_hint", "unknown"),
+            timestamp=time.time(),
+            latency_ms=(time.time() - start_time) * 1000,
+            incremental=incremental,
+        )
+
+        self.current_summary = result
+        self.summary_version += 1
+        self._previous_summary_text = result.summary
+        self._previous_structured = {
+            "summary": result.summary,
+            "key_points": result.key_points,
+            "pain_indicators": result.pain_indicators,
+            "stage_hint": result.stage_hint,
+            "archetype_hint": result.archetype_hint,
+        }
+        self._summarized_lines = covered_lines
+        self._summarized_chars = covered_chars
+        self._incremental_since_full = self._incremental_since_full + 1 if incremental else 0
+        self._start_window()
+        return result
+
+    def _log_compression(self, compression: Optional[CompressionResult]) -> None:
+        if compression is not None and compression.ratio < 1.0:
+            logger.info(
+                f"SummaryEngine: Transcript compressed {compression.original_tokens} → "
+                f"{compression.compressed_tokens} tokens ({compression.ratio:.0%}) in {compression.elapsed_ms:.1f}ms"
+            )
+
     def _generate_summary(self) -> None:
-        """Generate a summary from the accumulated transcript."""
-        transcript = self.get_full_transcript()
-        if not transcript.strip():
-            logger.info("SummaryEngine: No transcript to summarize")
+        """Generate a summary from the transcript delta (incremental) or the whole transcript."""
+        selected = self._select_transcript()
+        if selected is None:
             return
+        incremental, transcript, covered_lines, covered_chars = selected
 
         start_time = time.time()
         try:
-            prompt = get_summary_prompt(transcript, self._previous_summary_text)
+            transcript, compression = self._prepare_transcript(transcript)
+            if incremental:
+                prompt = get_incremental_summary_prompt(transcript, self._previous_structured)
+            else:
+                prompt = get_summary_prompt(transcript, self._previous_summary_text)
+            if self.gatekeeper:
+                self.gatekeeper.acquire(Priority.SUMMARY, estimate_tokens(prompt) + 800)
 
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -150,34 +380,27 @@ class SummaryEngine:
             )
 
             content = response.choices[0].message.content or ""
+            data = json.loads(_strip_markdown(content))
+            result = self._apply_summary(data, incremental, covered_lines, covered_chars, start_time)
 
-            # Clean markdown
-            if "```json" in content:
-                content = content.split("```json")[1]
-            if "```" in content:
-                content = content.split("```")[0]
+            logger.info(
+                f"SummaryEngine: {'Incremental' if incremental else 'Full'} summary generated in "
+                f"{result.latency_ms:.0f}ms (~{estimate_tokens(prompt)} prompt tokens, "
+                f"stage={result.stage_hint}, points={len(result.key_points)})"
+            )
+            self._log_compression(compression)
 
-            data = json.loads(content.strip())
+            if self.on_summary:
+                self.on_summary(result)
 
+        except RateLimitExceeded as e:
+            # Shed in favour of live coaching; the next timer tick retries.
+            logger.warning(f"SummaryEngine: Summary deferred: {e}")
             result = SummaryResult(
-                summary=data.get("summary", ""),
-                key_points=data.get("key_points", []),
-                pain_indicators=data.get("pain_indicators", []),
-                stage_hint=data.get("stage_hint", "unknown"),
-                archetype_hint=data.get("archetype_hint", "unknown"),
                 timestamp=time.time(),
                 latency_ms=(time.time() - start_time) * 1000,
+                error="Provider is busy — summary deferred, try again shortly.",
             )
-
-            self.current_summary = result
-            self._previous_summary_text = result.summary
-            self._last_summary_time = time.time()
-
-            logger.info(
-                f"SummaryEngine: Summary generated in {result.latency_ms:.0f}ms "
-                f"(stage={result.stage_hint}, points={len(result.key_points)})"
-            )
-
             if self.on_summary:
                 self.on_summary(result)
 
@@ -201,3 +424,114 @@ class SummaryEngine:
             )
             if self.on_summary:
                 self.on_summary(result)
+
+    def refresh_and_recommend(
+        self,
+        stage: Optional[str] = None,
+        rag_sections: Optional[list[str]] = None,
+        priority: Priority = Priority.RECOMMENDATION,
+    ) -> Optional[dict]:
+        """
+        Update the summary and generate stage recommendations in one streamed LLM call.
+
+        Replaces the ``refresh()`` then ``StreamingAnalyzer.recommend()`` round
+        trips. The response is parsed as it streams: once the summary fields are
+        complete the summary is applied and ``on_summary`` fires, while the
+        recommendation is still being generated.
+
+        Args:
+            stage: Blueprint stage for the questions (default: the current summary's stage_hint).
+            rag_sections: Playbook sections for the recommendation part of the prompt.
+            priority: Gatekeeper priority (user-initiated by default).
+
+        Returns:
+            The recommendation (``stage``, ``questions``, ``reasoning``), or None when there
+            is no new transcript to summarize (use the current summary with ``recommend()``).
+            Provider, rate-limit and JSON errors propagate to the caller.
+        """
+        selected = self._select_transcript()
+        if selected is None:
+            return None
+        incremental, transcript, covered_lines, covered_chars = selected
+        if stage is None:
+            stage = self.current_summary.stage_hint if self.current_summary else "discovery"
+
+        start_time = time.time()
+        transcript, compression = self._prepare_transcript(transcript)
+        prompt = get_fused_summary_recommendation_prompt(
+            transcript,
+            stage,
+            rag_sections or [],
+            previous_summary=self._previous_structured if incremental else None,
+        )
+        if self.gatekeeper:
+            self.gatekeeper.acquire(priority, estimate_tokens(prompt) + FUSED_MAX_TOKENS)
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": "Generate the conversation summary and recommendations now."},
+            ],
+            max_tokens=FUSED_MAX_TOKENS,
+            temperature=0.1,
+            timeout=45,
+            stream=True,
+        )
+
+        chunks: list[str] = []
+        result: Optional[SummaryResult] = None
+        prefix_checked = False
+        for chunk in response:
+            if not (chunk.choices and chunk.choices[0].delta.content):
+                continue
+            chunks.append(chunk.choices[0].delta.content)
+            if result is None and not prefix_checked:
+                accumulated = "".join(chunks)
+                if _RECOMMENDATION_KEY_RE.search(accumulated):
+                    prefix_checked = True
+                    data = _summary_prefix(accumulated)
+                    if data is not None:
+                        result = self._apply_summary(data, incremental, covered_lines, covered_chars, start_time)
+                        if self.on_summary:
+                            self.on_summary(result)
+
+        data = json.loads(_strip_markdown("".join(chunks)))
+        if result is None:
+            result = self._apply_summary(data, incremental, covered_lines, covered_chars, start_time)
+            if self.on_summary:
+                self.on_summary(result)
+
+        recommendation = data.get("recommendation")
+        if not isinstance(recommendation, dict):
+            raise json.JSONDecodeError("Fused response has no recommendation object", "".join(chunks), 0)
+
+        logger.info(
+            f"SummaryEngine: Fused summary+recommendation in {(time.time() - start_time) * 1000:.0f}ms "
+            f"(summary ready at {result.latency_ms:.0f}ms, ~{estimate_tokens(prompt)} prompt tokens, stage={stage})"
+        )
+        self._log_compression(compression)
+        return recommendation
+
+
+def _strip_markdown(content: str) -> str:
+    """Strip a ```json fence around a model response."""
+    if "```json" in content:
+        content = content.split("```json")[1]
+    if "```" in content:
+        content = content.split("```")[0]
+    return content.strip()
+
+
+def _summary_prefix(text: str) -> Optional[dict]:
+    """Parse the summary fields of a fused response that has streamed up to ``"recommendation":``."""
+    match = _RECOMMENDATION_KEY_RE.search(text)
+    start = text.find("{")
+    if match is None or start < 0 or start > match.start():
+        return None
+    head = text[start : match.start()].rstrip().rstrip(",")
+    try:
+        data = json.loads(head + "}")
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) and "summary" in data else None
@@ -0,0 +1,192 @@
+"""
+Token budgeting for prompt assembly.
+
+Estimates prompt size in tokens and trims transcript-derived sections to
+per-section budgets, so prompt length (and with it prefill latency) stays
+bounded and predictable per provider. Trimming always drops the OLDEST
+transcript text first; retrieved playbook sections are kept in relevance
+order until the section budget is spent.
+
+Token counts use tiktoken when TOKEN_ESTIMATOR=tiktoken and the package is
+installed. Otherwise a ~4 chars/token heuristic is used, which is fast and
+close enough for budgeting English transcripts.
+"""
+
+import logging
+import math
+import os
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Heuristic ratio for English text with OpenAI-style BPE tokenizers.
+_CHARS_PER_TOKEN = 4.0
+
+TOKEN_ESTIMATOR = os.getenv("TOKEN_ESTIMATOR", "heuristic").lower()
+
+
+@lru_cache(maxsize=1)
+def _get_encoder():
+    """Load (once) the local tokenizer, or None to use the heuristic."""
+    if TOKEN_ESTIMATOR != "tiktoken":
+        return None
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, using heuristic token estimates: {e}")
+        return None
+
+
+@lru_cache(maxsize=2048)
+def _encoded_length(text: str) -> int:
+    encoder = _get_encoder()
+    if encoder is None:
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in ``text``."""
+    if not text:
+        return 0
+    return _encoded_length(text)
+
+
+def estimate_messages_tokens(messages: list[dict]) -> int:
+    """Estimate tokens for a chat completion message list (incl. per-message overhead)."""
+    return sum(estimate_tokens(str(m.get("content", ""))) + 4 for m in messages)
+
+
+def trim_oldest(text: str, max_tokens: int) -> str:
+    """Trim ``text`` from the start so it fits ``max_tokens``.
+
+    Cuts on a line boundary when possible (transcripts are line-per-turn),
+    otherwise on a word boundary, so the kept tail never starts mid-word.
+    """
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    keep_chars = int(max_tokens * _CHARS_PER_TOKEN)
+    while True:
+        tail = text[-keep_chars:]
+        newline = tail.find("\n")
+        if 0 <= newline < len(tail) // 2:
+            tail = tail[newline + 1 :]
+        else:
+            space = tail.find(" ")
+            if 0 <= space < len(tail) // 2:
+                tail = tail[space + 1 :]
+        if estimate_tokens(tail) <= max_tokens or keep_chars <= 1:
+            return tail.strip()
+        keep_chars = int(keep_chars * 0.9)
+
+
+def trim_newest(text: str, max_tokens: int) -> str:
+    """Truncate ``text`` at the end so it fits ``max_tokens`` (for reference docs)."""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    keep_chars = int(max_tokens * _CHARS_PER_TOKEN)
+    while True:
+        head = text[:keep_chars]
+        space = head.rfind(" ")
+        if space > len(head) // 2:
+            head = head[:space]
+        if estimate_tokens(head) <= max_tokens or keep_chars <= 1:
+            return head.rstrip()
+        keep_chars = int(keep_chars * 0.9)
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    """Per-section token budgets for one provider."""
+
+    system_prompt: int = 3500
+    rag_sections: int = 1200
+    context: int = 600
+    active: int = 400
+    summary_transcript: int = 8000
+    recommendation_context: int = 1500
+
+    def fit_active(self, active_text: str) -> str:
+        """Bound the latest utterance, keeping its most recent words."""
+        return trim_oldest(active_text, self.active)
+
+    def fit_context(self, context_text: str) -> str:
+        """Bound the rolling conversation context, dropping the oldest text first."""
+        return trim_oldest(context_text, self.context)
+
+    def fit_summary_transcript(self, transcript: str) -> str:
+        """Bound the accumulated transcript sent to the summarizer."""
+        return trim_oldest(transcript, self.summary_transcript)
+
+    def fit_recommendation_context(self, context_text: str) -> str:
+        """Bound the transcript handed to recommendation retrieval."""
+        return trim_oldest(context_text, self.recommendation_context)
+
+    def fit_sections(self, sections: list[str], static_prompt_tokens: int = 0) -> list[str]:
+        """Keep retrieved sections in relevance order until the budget is spent.
+
+        The available budget is the smaller of ``rag_sections`` and what is left
+        of ``system_prompt`` after the static part of the prompt. The first
+        section that does not fit is truncated instead of dropped when at least
+        a meaningful slice of it still fits.
+        """
+        available = self.rag_sections
+        if static_prompt_tokens:
+            available = min(available, self.system_prompt - static_prompt_tokens)
+
+        kept: list[str] = []
+        for section in sections:
+            cost = estimate_tokens(section)
+            if cost <= available:
+                kept.append(section)
+                available -= cost
+                continue
+            if available >= 64:
+                kept.append(trim_newest(section, available))
+            break
+        return kept
+
+
+# Local models run on a shared GPU box, so keep their prompts tighter.
+_PROVIDER_BUDGETS: dict[str, TokenBudget] = {
+    "local": TokenBudget(
+        system_prompt=3000,
+        rag_sections=800,
+        context=400,
+        active=300,
+        summary_transcript=3000,
+        recommendation_context=800,
+    ),
+    "modal": TokenBudget(summary_transcript=6000),
+}
+
+
+def get_token_budget(provider: Optional[str] = None) -> TokenBudget:
+    """Return the token budget for ``provider`` (defaults to LLM_PROVIDER).
+
+    Any field can be overridden with a ``TOKEN_BUDGET_<FIELD>`` env var,
+    e.g. ``TOKEN_BUDGET_CONTEXT=800``.
+    """
+    if provider is None:
+        provider = os.getenv("LLM_PROVIDER", "local")
+    budget = _PROVIDER_BUDGETS.get(provider.lower(), TokenBudget())
+
+    overrides = {}
+    for f in fields(TokenBudget):
+        value = os.getenv(f"TOKEN_BUDGET_{f.name.upper()}")
+        if value:
+            try:
+                overrides[f.name] = int(value)
+            except ValueError:
+                logger.warning(f"Ignoring invalid TOKEN_BUDGET_{f.name.upper()}={value!r}")
+    return replace(budget, **overrides) if overrides else budget
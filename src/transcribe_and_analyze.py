@@ -9,7 +9,6 @@ Usage:
 import sys
 import os
 from pathlib import Path
-from openai import OpenAI
 
 
 # Load environment variables from .env file
@@ -140,11 +139,13 @@ def analyze_objections(transcript: str, api_key: str = None) -> dict:
         base_url = "https://openrouter.ai/api/v1"  # default
         model = "meta-llama/llama-3.3-70b-instruct:free"
 
-    # Initialize OpenAI client
-    client = OpenAI(
-        base_url=base_url,
-        api_key=api_key,
-    )
+    # Shared pooled client (imported here so the .env loaded above is seen by its settings)
+    src_dir = str(Path(__file__).parent)
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from realtime.http_clients import get_openai_client
+
+    client = get_openai_client(base_url=base_url, api_key=api_key)
 
     # Construct analysis prompt
     prompt = f"""You are a sales expert analyzing a conversation for objections.
@@ -2,8 +2,7 @@ import json
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
-
+from src.realtime.http_clients import get_openai_client
 from src.realtime.prompts import get_script_guidance_prompt, load_script
 from src.validation.db import ValidationDB
 
@@ -24,7 +23,7 @@ class AnalysisResult:
 class ScriptTester:
     def __init__(self, db_path: str = "validation.db", base_url: str = DEFAULT_BASE_URL, model: str = DEFAULT_MODEL):
         self.db = ValidationDB(db_path)
-        self.client = OpenAI(base_url=base_url, api_key="dummy")
+        self.client = get_openai_client(base_url=base_url, api_key="dummy")
         self.model = model
         self.script_content = load_script()
 
@@ -10,11 +10,12 @@ import json
 import logging
 import os
 import sys
+import threading
 import time
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from urllib.parse import urlparse
 
 import websockets
@@ -37,11 +38,22 @@ from src.realtime.analysis_orchestrator import (
     AnalysisOrchestrator,
     AnalysisResult,
     AnalysisStreamChunk,
+    FastPathSuggestion,
     StreamingAnalyzer,
+    first_suggestion_stats,
+    query_embedding_cache_stats,
+    start_rag_pipeline,
 )
 from src.realtime.buffer_manager import DualBufferManager
+from src.realtime.degradation import get_degradation_controller
+from src.realtime.gatekeeper import Priority, RateLimitExceeded, gatekeeper_snapshots, get_gatekeeper
+from src.realtime.http_clients import close_clients, warm_connection
 from src.realtime.llm_provider import get_llm_config
+from src.realtime.novelty_gate import NoveltyGate
+from src.realtime.provider_router import get_provider_router
+from src.realtime.recommendation_cache import RecommendationPrecomputer
 from src.realtime.summary_engine import SummaryEngine, SummaryResult
+from src.realtime.token_budget import get_token_budget
 from src.realtime.vad_transcriber import VadTranscriber
 
 try:
@@ -73,9 +85,22 @@ except ImportError:
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     await startup_integrity_check()
+    # Chunks, embedding stores and model are built once here and shared by every session
+    start_rag_pipeline()
+    degradation = get_degradation_controller()
+    listener = None
+    if degradation is not None:
+        loop = asyncio.get_running_loop()
+
+        def listener(event: dict) -> None:
+            asyncio.run_coroutine_threadsafe(manager.broadcast({"type": "degradation", **event}), loop)
+
+        degradation.add_listener(listener)
     try:
         yield
     finally:
+        if listener is not None:
+            degradation.remove_listener(listener)
         await shutdown_connection_cleanup()
 
 
@@ -125,6 +150,16 @@ TRANSCRIPTION_ENGINE = os.getenv("TRANSCRIPTION_ENGINE", "vad")  # "vad" or "whi
 
 # LLM configuration — loaded from src.realtime.llm_provider
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "local")
+LLM_WARM_CONNECTIONS = os.getenv("LLM_WARM_CONNECTIONS", "true").lower() in ("true", "1", "yes")
+LLM_SESSION_WARMUP = os.getenv("LLM_SESSION_WARMUP", "true").lower() in ("true", "1", "yes")
+NOVELTY_GATE = os.getenv("NOVELTY_GATE", "true").lower() in ("true", "1", "yes")
+NOVELTY_MIN_CONTENT_WORDS = int(os.getenv("NOVELTY_MIN_CONTENT_WORDS", "2"))
+OBJECTION_FAST_PATH = os.getenv("OBJECTION_FAST_PATH", "true").lower() in ("true", "1", "yes")
+RECOMMEND_PRECOMPUTE = os.getenv("RECOMMEND_PRECOMPUTE", "true").lower() in ("true", "1", "yes")
+RECOMMEND_PRECOMPUTE_PER_MINUTE = int(os.getenv("RECOMMEND_PRECOMPUTE_PER_MINUTE", "2"))
+RECOMMEND_PRECOMPUTE_STALE_LINES = int(os.getenv("RECOMMEND_PRECOMPUTE_STALE_LINES", "6"))
+# Answer "recommend" with one fused summary+recommendation call when the summary is behind the transcript
+RECOMMEND_FUSED = os.getenv("RECOMMEND_FUSED", "false").lower() in ("true", "1", "yes")
 knowledge_base_integrity_status: Optional[dict[str, Any]] = None
 
 
@@ -142,11 +177,37 @@ async def startup_integrity_check() -> None:
     global knowledge_base_integrity_status
     knowledge_base_integrity_status = run_startup_integrity_check()
     start_connection_cleanup_task()
+    start_llm_connection_warmup()
 
 
 async def shutdown_connection_cleanup() -> None:
     """Stop background cleanup tasks when the app lifecycle ends."""
     await stop_connection_cleanup_task()
+    close_clients()
+
+
+def start_llm_connection_warmup() -> Optional[threading.Thread]:
+    """Open the pooled LLM connection in the background so the first call skips TCP+TLS setup."""
+    if not LLM_WARM_CONNECTIONS:
+        return None
+    try:
+        llm_cfg = get_llm_config()
+    except ValueError as e:
+        logger.info(f"Skipping LLM connection warmup: {e}")
+        return None
+
+    thread = threading.Thread(target=warm_connection, args=(llm_cfg.base_url,), daemon=True)
+    thread.start()
+    return thread
+
+
+def start_session_warmup(analyzer: Any) -> Optional[threading.Thread]:
+    """Warm the session's LLM path in the background (connection + cached system-prompt prefix)."""
+    if not LLM_SESSION_WARMUP or not hasattr(analyzer, "warmup"):
+        return None
+    thread = threading.Thread(target=analyzer.warmup, daemon=True)
+    thread.start()
+    return thread
 
 
 # Global state for broadcasting
@@ -343,6 +404,58 @@ def _create_vexa_transcript_bridge(
     return on_transcript
 
 
+def _build_novelty_gate() -> Optional[NoveltyGate]:
+    """Per-session gate that defers low-information analysis triggers."""
+    if not NOVELTY_GATE:
+        return None
+    return NoveltyGate(min_content_words=NOVELTY_MIN_CONTENT_WORDS)
+
+
+def _speech_timed_submit(orchestrator: AnalysisOrchestrator, buffer_manager: DualBufferManager):
+    """Buffer trigger callback that anchors the analysis deadline to when the speech started."""
+
+    def on_analysis_ready(active_text: str, context_text: str) -> None:
+        orchestrator.submit_analysis(active_text, context_text, speech_time=buffer_manager.active_started_at)
+
+    return on_analysis_ready
+
+
+def _stage_tracking(
+    analyzer: StreamingAnalyzer,
+    send: Callable[[dict], None],
+    on_stage: Optional[Callable[[str], None]] = None,
+):
+    """Buffer new-segment callback: keep the call stage tracked and push each stage change to the UI.
+
+    ``on_stage`` receives the new stage as a summary stage_hint (summary scheduler, recommendation precomputer).
+    """
+    last_stage: Optional[str] = None
+
+    def on_new_segment(text: str) -> None:
+        nonlocal last_stage
+        tracked = analyzer.observe_segment(text)
+        if tracked is None or tracked["stage"] == last_stage:
+            return
+        last_stage = tracked["stage"]
+        send({"type": "stage", **tracked})
+        if on_stage is not None and tracked.get("stage_hint"):
+            on_stage(tracked["stage_hint"])
+
+    return on_new_segment
+
+
+def _fast_suggestion_message(suggestion: FastPathSuggestion) -> dict:
+    """Payload for a zero-LLM objection rebuttal (replaced by the LLM analysis when it lands)."""
+    return {
+        "type": "fast_suggestion",
+        "objection": suggestion.objection,
+        "suggestion": suggestion.suggestion,
+        "chunk_id": suggestion.chunk_id,
+        "confidence": suggestion.confidence,
+        "latency": suggestion.latency_ms,
+    }
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for readiness probes."""
@@ -363,6 +476,45 @@ async def health_check():
     }
 
 
+@app.get("/api/llm/router")
+async def llm_router_status():
+    """Return provider routing health, latency EWMAs and recent routing decisions."""
+    router = get_provider_router()
+    if router is None:
+        return {"enabled": False}
+    return {"enabled": True, **router.snapshot()}
+
+
+@app.get("/api/llm/rate-limits")
+async def llm_rate_limits():
+    """Return per-provider rate-limit headroom and admitted/shed counts by priority."""
+    return {"gatekeepers": gatekeeper_snapshots()}
+
+
+@app.get("/api/llm/warmup")
+async def llm_warmup_stats():
+    """Return time to first suggestion per session, for sessions with and without a completed warmup."""
+    return {"enabled": LLM_SESSION_WARMUP, "first_suggestion": first_suggestion_stats()}
+
+
+@app.get("/api/llm/degradation")
+async def llm_degradation_status():
+    """Return the live-analysis degradation level, TTFT EWMA and recent level transitions."""
+    controller = get_degradation_controller()
+    if controller is None:
+        return {"enabled": False}
+    return {"enabled": True, **controller.snapshot()}
+
+
+@app.get("/api/rag/embedding-cache")
+async def rag_embedding_cache_status():
+    """Return query-embedding cache size, hit rate and embedding time saved across all sessions."""
+    stats = query_embedding_cache_stats()
+    if stats is None:
+        return {"enabled": False}
+    return {"enabled": stats["max_entries"] > 0, **stats}
+
+
 @app.get("/api/vexa/status")
 async def vexa_status():
     """Return the active Vexa meeting bridge status."""
@@ -408,14 +560,20 @@ async def join_vexa_meeting(request: Request):
 
     try:
         llm_cfg = get_llm_config()
+        token_budget = get_token_budget(getattr(llm_cfg, "provider", None))
+        gatekeeper = get_gatekeeper(getattr(llm_cfg, "provider", None))
         analyzer = StreamingAnalyzer(
             api_key=llm_cfg.api_key,
             base_url=llm_cfg.base_url,
             model=llm_cfg.model,
             fallback_model=getattr(llm_cfg, "fallback_model", None),
+            token_budget=token_budget,
+            router=get_provider_router(),
+            gatekeeper=gatekeeper,
         )
     except ValueError as e:
         return JSONResponse(status_code=503, content={"status": "error", "error": f"LLM configuration error: {e}"})
+    start_session_warmup(analyzer)
 
     def on_summary_result(result: SummaryResult):
         data = {
@@ -440,6 +598,7 @@ async def join_vexa_meeting(request: Request):
             "suggestion": result.state.suggestion,
             "latency": result.latency_ms,
             "error": result.error,
+            "late": result.late,
         }
         asyncio.run_coroutine_threadsafe(manager.broadcast(data), loop)
 
@@ -452,6 +611,7 @@ async def join_vexa_meeting(request: Request):
             "latency": chunk.latency_ms,
             "sequence": chunk.sequence,
             "model": chunk.model,
+            "late": chunk.late,
         }
         asyncio.run_coroutine_threadsafe(manager.broadcast(data), loop)
 
@@ -460,9 +620,29 @@ async def join_vexa_meeting(request: Request):
         model=llm_cfg.model,
         on_summary=on_summary_result,
         interval=300,
+        token_budget=token_budget,
+        gatekeeper=gatekeeper,
+    )
+
+    def on_fast_path(suggestion: FastPathSuggestion):
+        asyncio.run_coroutine_threadsafe(manager.broadcast(_fast_suggestion_message(suggestion)), loop)
+
+    orchestrator = AnalysisOrchestrator(
+        analyzer=analyzer,
+        on_result=on_analysis_result,
+        on_partial=on_analysis_partial,
+        on_fast_path=on_fast_path if OBJECTION_FAST_PATH else None,
+        novelty_gate=_build_novelty_gate(),
+        degradation=get_degradation_controller(),
+    )
+    buffer_manager = DualBufferManager()
+    buffer_manager.on_analysis_ready = _speech_timed_submit(orchestrator, buffer_manager)
+    buffer_manager.on_segment_completed = orchestrator.prefetch_retrieval
+    buffer_manager.on_new_segment = _stage_tracking(
+        analyzer,
+        lambda data: asyncio.run_coroutine_threadsafe(manager.broadcast(data), loop),
+        on_stage=summary_engine.note_stage,
     )
-    orchestrator = AnalysisOrchestrator(analyzer=analyzer, on_result=on_analysis_result, on_partial=on_analysis_partial)
-    buffer_manager = DualBufferManager(on_analysis_ready=orchestrator.submit_analysis)
 
     client = VexaClient(VexaConfig())
     _create_vexa_transcript_bridge(
@@ -549,16 +729,22 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
     # Initialize LLM components
     try:
         llm_cfg = get_llm_config()
+        token_budget = get_token_budget(getattr(llm_cfg, "provider", None))
+        gatekeeper = get_gatekeeper(getattr(llm_cfg, "provider", None))
         analyzer = StreamingAnalyzer(
             api_key=llm_cfg.api_key,
             base_url=llm_cfg.base_url,
             model=llm_cfg.model,
             fallback_model=getattr(llm_cfg, "fallback_model", None),
+            token_budget=token_budget,
+            router=get_provider_router(),
+            gatekeeper=gatekeeper,
         )
     except ValueError as e:
         logger.error(f"LLM configuration error: {e}")
         await websocket.close(code=1011, reason=str(e))
         return
+    start_session_warmup(analyzer)
 
     # Initialize SummaryEngine for rolling conversation summaries
     def on_summary_result(result: SummaryResult):
@@ -577,6 +763,10 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
             f"Summary generated: stage={result.stage_hint}, "
             f"points={len(result.key_points)}, latency={result.latency_ms:.0f}ms"
         )
+        if precomputer and not result.error:
+            precomputer.update_summary(
+                summary_engine.summary_version, result.summary, result.key_points, result.stage_hint
+            )
 
         async def _send():
             try:
@@ -595,8 +785,27 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
         model=llm_cfg.model,
         on_summary=on_summary_result,
         interval=300,  # 5 minutes
+        token_budget=token_budget,
+        gatekeeper=gatekeeper,
     )
 
+    # Speculative recommendations: precomputed per (summary version, stage) so "recommend" is instant
+    precomputer: Optional[RecommendationPrecomputer] = None
+    if RECOMMEND_PRECOMPUTE:
+        precomputer = RecommendationPrecomputer(
+            recommend_fn=lambda summary, key_points, stage, transcript: analyzer.recommend(
+                summary, key_points, stage, transcript, priority=Priority.SUMMARY
+            ),
+            get_transcript=summary_engine.get_full_transcript,
+            max_per_minute=RECOMMEND_PRECOMPUTE_PER_MINUTE,
+            stale_after_lines=RECOMMEND_PRECOMPUTE_STALE_LINES,
+        )
+
+    def record_transcript(text: str) -> None:
+        summary_engine.add_transcript(text)
+        if precomputer:
+            precomputer.note_transcript()
+
     def on_analysis_result(result: AnalysisResult):
         data = {
             "type": "analysis",
@@ -605,6 +814,7 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
             "suggestion": result.state.suggestion,
             "latency": result.latency_ms,
             "error": result.error,
+            "late": result.late,
         }
 
         async def _send():
@@ -624,6 +834,7 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
             "latency": chunk.latency_ms,
             "sequence": chunk.sequence,
             "model": chunk.model,
+            "late": chunk.late,
         }
 
         async def _send():
@@ -635,20 +846,108 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
 
         asyncio.run_coroutine_threadsafe(_send(), loop)
 
+    def on_fast_path(suggestion: FastPathSuggestion):
+        data = _fast_suggestion_message(suggestion)
+
+        async def _send():
+            try:
+                await websocket.send_json(data)
+                await manager.broadcast(data)
+            except Exception as e:
+                logger.error(f"Failed to send fast suggestion: {e}")
+
+        asyncio.run_coroutine_threadsafe(_send(), loop)
+
     orchestrator = AnalysisOrchestrator(
         analyzer=analyzer,
         on_result=on_analysis_result,
         on_partial=on_analysis_partial,
+        on_fast_path=on_fast_path if OBJECTION_FAST_PATH else None,
+        novelty_gate=_build_novelty_gate(),
+        degradation=get_degradation_controller(),
     )
-    buffer_manager = DualBufferManager(on_analysis_ready=orchestrator.submit_analysis)
+    buffer_manager = DualBufferManager()
+    buffer_manager.on_analysis_ready = _speech_timed_submit(orchestrator, buffer_manager)
+    buffer_manager.on_segment_completed = orchestrator.prefetch_retrieval
+
+    def send_stage(data: dict) -> None:
+        async def _send():
+            try:
+                await websocket.send_json(data)
+                await manager.broadcast(data)
+            except Exception as e:
+                logger.error(f"Failed to send stage: {e}")
+
+        asyncio.run_coroutine_threadsafe(_send(), loop)
+
+    def on_stage(stage_hint: str) -> None:
+        # A tracked stage change makes a summary due early and precomputes recommendations for it
+        summary_engine.note_stage(stage_hint)
+        if precomputer:
+            precomputer.update_stage(stage_hint)
+
+    buffer_manager.on_new_segment = _stage_tracking(analyzer, send_stage, on_stage=on_stage)
     orchestrator.start()
 
+    def recommend_stage(summary: SummaryResult) -> str:
+        """The stage recommendations are keyed on: the live tracked stage, else the summary's hint."""
+        return (precomputer.stage if precomputer else None) or summary.stage_hint
+
+    async def fused_recommend() -> bool:
+        """Refresh the summary and recommend in one LLM call; False if there was nothing new to summarize."""
+        previous = summary_engine.current_summary
+        transcript = summary_engine.get_full_transcript()
+        try:
+            rag_sections = await asyncio.to_thread(
+                analyzer.recommendation_sections,
+                previous.summary if previous and previous.summary else transcript[-1000:],
+                transcript,
+            )
+            # The summary is sent through on_summary_result as soon as it has streamed in
+            rec_data = await asyncio.to_thread(summary_engine.refresh_and_recommend, rag_sections=rag_sections)
+            if rec_data is None:
+                return False
+            msg = {
+                "type": "recommendation",
+                "stage": rec_data.get("stage", summary_engine.current_summary.stage_hint),
+                "questions": rec_data.get("questions", []),
+                "reasoning": rec_data.get("reasoning", ""),
+                "precomputed": False,
+                "fused": True,
+            }
+            await websocket.send_json(msg)
+            await manager.broadcast(msg)
+        except RateLimitExceeded as e:
+            logger.warning(f"Fused recommend deferred: {e}")
+            await websocket.send_json(
+                {"type": "recommendation", "error": "Provider is busy — try again in a few seconds."}
+            )
+        except json.JSONDecodeError as e:
+            logger.error(f"Fused recommend JSON parse error: {e}")
+            await websocket.send_json({"type": "recommendation", "error": f"Failed to parse recommendation: {e}"})
+        except Exception as e:
+            logger.error(f"Fused recommend error: {e}", exc_info=True)
+            await websocket.send_json({"type": "recommendation", "error": str(e)})
+        return True
+
     async def handle_command(cmd_data: dict):
         """Handle text commands from the frontend."""
         command = cmd_data.get("command")
 
+        if command == "refresh_and_recommend":
+            if await fused_recommend():
+                return
+            command = "recommend"  # nothing new since the last summary: recommend from it
+
         if command == "recommend":
             summary = summary_engine.current_summary
+            if RECOMMEND_FUSED and summary_engine.get_transcript_delta()[0].strip():
+                cached = None
+                if precomputer and summary and summary.summary:
+                    cached = precomputer.get(summary_engine.summary_version, recommend_stage(summary))
+                if cached is None and await fused_recommend():
+                    return
+                summary = summary_engine.current_summary
             if not summary or not summary.summary:
                 await websocket.send_json(
                     {
@@ -659,22 +958,40 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
                 return
 
             try:
-                result_json = await asyncio.to_thread(
-                    analyzer.recommend,
-                    summary.summary,
-                    summary.key_points,
-                    summary.stage_hint,
-                    summary_engine.get_full_transcript(),
-                )
+                summary_version = summary_engine.summary_version
+                stage = recommend_stage(summary)
+                cached = precomputer.get(summary_version, stage) if precomputer else None
+                if cached:
+                    result_json = cached.content
+                else:
+                    start_time = time.time()
+                    result_json = await asyncio.to_thread(
+                        analyzer.recommend,
+                        summary.summary,
+                        summary.key_points,
+                        stage,
+                        summary_engine.get_full_transcript(),
+                    )
+                    if precomputer:
+                        precomputer.store(summary_version, stage, result_json, (time.time() - start_time) * 1000)
                 rec_data = json.loads(result_json)
                 msg = {
                     "type": "recommendation",
-                    "stage": rec_data.get("stage", summary.stage_hint),
+                    "stage": rec_data.get("stage", stage),
                     "questions": rec_data.get("questions", []),
                     "reasoning": rec_data.get("reasoning", ""),
+                    "precomputed": cached is not None,
                 }
                 await websocket.send_json(msg)
                 await manager.broadcast(msg)
+            except RateLimitExceeded as e:
+                logger.warning(f"Recommend deferred: {e}")
+                await websocket.send_json(
+                    {
+                        "type": "recommendation",
+                        "error": "Provider is busy — try again in a few seconds.",
+                    }
+                )
             except json.JSONDecodeError as e:
                 logger.error(f"Recommend JSON parse error: {e}")
                 await websocket.send_json(
@@ -762,7 +1079,7 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
                         await manager.broadcast(msg_data)
 
                         # Feed to summary engine
-                        summary_engine.add_transcript(seg["text"])
+                        record_transcript(seg["text"])
                         buffer_manager.on_transcript_chunk(
                             seg["text"],
                             [
@@ -803,7 +1120,7 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
                     try:
                         await websocket.send_json(msg_data)
                         await manager.broadcast(msg_data)
-                        summary_engine.add_transcript(seg["text"])
+                        record_transcript(seg["text"])
                         buffer_manager.on_transcript_chunk(
                             seg["text"],
                             [
@@ -820,6 +1137,8 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
             except Exception as e:
                 logger.warning(f"Flush error (non-fatal): {e}")
             summary_engine.stop()
+            if precomputer:
+                precomputer.shutdown()
             orchestrator.shutdown()
 
     else:
@@ -864,6 +1183,8 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
                     except RuntimeError:
                         pass
                     summary_engine.stop()
+                    if precomputer:
+                        precomputer.shutdown()
                     orchestrator.shutdown()
                     return
 
@@ -938,7 +1259,7 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
 
                             if segments:
                                 full_text = " ".join(s["text"] for s in segments if s["text"])
-                                summary_engine.add_transcript(full_text)
+                                record_transcript(full_text)
                                 buffer_manager.on_transcript_chunk(full_text, segments)
 
                     except websockets.exceptions.ConnectionClosed:
@@ -989,6 +1310,8 @@ async def websocket_endpoint(websocket: WebSocket, role: str = "recorder"):
                 pass
         finally:
             summary_engine.stop()
+            if precomputer:
+                precomputer.shutdown()
             orchestrator.shutdown()
 
 
@@ -1064,12 +1387,18 @@ async def dual_audio_endpoint(websocket: WebSocket):
     # Initialize components for analysis (optional)
     try:
         llm_cfg = get_llm_config()
+        token_budget = get_token_budget(getattr(llm_cfg, "provider", None))
+        gatekeeper = get_gatekeeper(getattr(llm_cfg, "provider", None))
         analyzer = StreamingAnalyzer(
             api_key=llm_cfg.api_key,
             base_url=llm_cfg.base_url,
             model=llm_cfg.model,
             fallback_model=getattr(llm_cfg, "fallback_model", None),
+            token_budget=token_budget,
+            router=get_provider_router(),
+            gatekeeper=gatekeeper,
         )
+        start_session_warmup(analyzer)
     except ValueError as e:
         logger.warning(f"LLM not configured: {e}")
         analyzer = None
@@ -1087,6 +1416,7 @@ async def dual_audio_endpoint(websocket: WebSocket):
                 "suggestion": result.state.suggestion,
                 "latency": result.latency_ms,
                 "error": result.error,
+                "late": result.late,
             }
             asyncio.run_coroutine_threadsafe(websocket.send_json(data), loop)
             asyncio.run_coroutine_threadsafe(manager.broadcast(data), loop)
@@ -1099,17 +1429,33 @@ async def dual_audio_endpoint(websocket: WebSocket):
                 "latency": chunk.latency_ms,
                 "sequence": chunk.sequence,
                 "model": chunk.model,
+                "late": chunk.late,
             }
             asyncio.run_coroutine_threadsafe(websocket.send_json(data), loop)
             asyncio.run_coroutine_threadsafe(manager.broadcast(data), loop)
 
-        def on_analysis_ready(active_text: str, context_text: str):
-            orchestrator.submit_analysis(active_text, context_text)
+        def on_fast_path(suggestion: FastPathSuggestion):
+            data = _fast_suggestion_message(suggestion)
+            asyncio.run_coroutine_threadsafe(websocket.send_json(data), loop)
+            asyncio.run_coroutine_threadsafe(manager.broadcast(data), loop)
 
         orchestrator = AnalysisOrchestrator(
-            analyzer=analyzer, on_result=on_analysis_result, on_partial=on_analysis_partial
+            analyzer=analyzer,
+            on_result=on_analysis_result,
+            on_partial=on_analysis_partial,
+            on_fast_path=on_fast_path if OBJECTION_FAST_PATH else None,
+            novelty_gate=_build_novelty_gate(),
+            degradation=get_degradation_controller(),
         )
-        buffer_manager = DualBufferManager(on_analysis_ready=on_analysis_ready, on_state_analysis_ready=lambda x: None)
+        buffer_manager = DualBufferManager(on_state_analysis_ready=lambda x: None)
+        buffer_manager.on_analysis_ready = _speech_timed_submit(orchestrator, buffer_manager)
+        buffer_manager.on_segment_completed = orchestrator.prefetch_retrieval
+
+        def send_stage(data: dict) -> None:
+            asyncio.run_coroutine_threadsafe(websocket.send_json(data), loop)
+            asyncio.run_coroutine_threadsafe(manager.broadcast(data), loop)
+
+        buffer_manager.on_new_segment = _stage_tracking(analyzer, send_stage)
         orchestrator.start()
 
     try:
@@ -284,6 +284,15 @@ class AudioClient {
             case 'analysis_delta':
                 this.handleAnalysisDelta(data);
                 break;
+            case 'fast_suggestion':
+                this.handleFastSuggestion(data);
+                break;
+            case 'degradation':
+                this.handleDegradation(data);
+                break;
+            case 'stage':
+                this.handleStage(data);
+                break;
             case 'error':
                 console.error("Server Error:", data.error || data.message);
                 break;
@@ -332,6 +341,7 @@ class AudioClient {
         if (data.stage_hint && data.stage_hint !== 'unknown') {
             this.summaryStage.textContent = `Stage: ${data.stage_hint}`;
             this.summaryStage.className = `summary-badge stage-${data.stage_hint}`;
+            this.summaryStage.title = '';
         }
         if (data.archetype_hint && data.archetype_hint !== 'unknown') {
             this.summaryArchetype.textContent = `Archetype: ${data.archetype_hint.replace('_', ' ')}`;
@@ -436,7 +446,8 @@ class AudioClient {
 
     handleAnalysis(data) {
         // Legacy: constant analysis results (script_location, key_points, suggestion)
-        if (data.key_points && data.key_points.length > 0) {
+        // Late results (past their deadline) are kept for the record but not shown as current
+        if (!data.late && data.key_points && data.key_points.length > 0) {
             this.keyPointsList.innerHTML = data.key_points
                 .map(p => `<li>${this.escapeHtml(p)}</li>`)
                 .join('');
@@ -446,9 +457,11 @@ class AudioClient {
 
         const entry = this.streamingAnalysisEntry || document.createElement('div');
         entry.classList.add('recommendation-entry');
+        entry.classList.remove('fast-path');
+        entry.classList.toggle('late', !!data.late);
         const now = new Date();
         const timeStr = now.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit', second: '2-digit' });
-        const latencyText = data.latency ? ` &middot; ${Math.round(data.latency)}ms` : '';
+        const latencyText = (data.latency ? ` &middot; ${Math.round(data.latency)}ms` : '') + (data.late ? ' &middot; late' : '');
         const location = data.script_location || 'Live coaching';
         const body = data.error ? data.error : data.suggestion;
 
@@ -471,7 +484,10 @@ class AudioClient {
     handleAnalysisDelta(data) {
         const entry = this.streamingAnalysisEntry || document.createElement('div');
         entry.classList.add('recommendation-entry', 'streaming');
-        const latencyText = data.latency ? ` &middot; ${Math.round(data.latency)}ms` : '';
+        entry.classList.remove('fast-path');
+        // Deltas past the deadline stream into a late-styled entry, not as the current suggestion
+        entry.classList.toggle('late', !!data.late);
+        const latencyText = (data.latency ? ` &middot; ${Math.round(data.latency)}ms` : '') + (data.late ? ' &middot; late' : '');
 
         entry.innerHTML = `
             <div class="recommendation-header">
@@ -489,6 +505,45 @@ class AudioClient {
         this.streamingAnalysisEntry = entry;
     }
 
+    handleFastSuggestion(data) {
+        // Script rebuttal for a clear objection; the LLM analysis replaces this entry when it streams in
+        const entry = document.createElement('div');
+        entry.classList.add('recommendation-entry', 'fast-path');
+        const latencyText = data.latency ? ` &middot; ${Math.round(data.latency)}ms` : '';
+
+        entry.innerHTML = `
+            <div class="recommendation-header">
+                <span class="recommendation-stage stage-discovery">${this.escapeHtml(data.objection || 'Objection')}</span>
+                <span class="recommendation-meta">script${latencyText}</span>
+            </div>
+            <div class="recommendation-reasoning">${this.escapeHtml(data.suggestion || '')}</div>
+        `;
+
+        this.recommendationContent.prepend(entry);
+        const placeholder = this.recommendationContent.querySelector('.placeholder-text');
+        if (placeholder) placeholder.remove();
+        this.streamingAnalysisEntry = entry;
+    }
+
+    handleStage(data) {
+        // Script stage tracked segment by segment on the server (between summaries), shown in the
+        // summaries' stage_hint vocabulary so both update the badge the same way
+        const stage = data.stage_hint;
+        if (!stage) return;
+        const part = data.part_number ? `Part ${data.part_number}, ` : '';
+        this.summaryStage.textContent = `Stage: ${stage}`;
+        this.summaryStage.className = `summary-badge stage-${stage}`;
+        this.summaryStage.title = `${part}keyword confidence ${Math.round((data.confidence || 0) * 100)}%`;
+    }
+
+    handleDegradation(data) {
+        // Server is shedding LLM cost under load (fallback model, no RAG, short context, suggestion-only)
+        const degraded = data.level > 0;
+        this.connectionStatus.classList.toggle('degraded', degraded);
+        this.connectionStatus.title = degraded ? `Reduced coaching quality under load: ${data.to}` : '';
+        console.info(`LLM degradation: ${data.from} -> ${data.to} (${data.reason})`);
+    }
+
     // ── Utilities ─────────────────────────────────────────────────
 
     escapeHtml(text) {
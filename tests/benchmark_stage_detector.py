@@ -0,0 +1,104 @@
+"""
+Benchmark StageDetector.detect: compiled keyword matcher vs. one substring check per keyword.
+
+Runs both on the text the retriever passes in (500-char context tail +
+active utterance), checks they score identically, and prints per-call times.
+
+    python tests/benchmark_stage_detector.py [--iterations 2000]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.stage_detector import StageDetector  # noqa: E402
+
+CALL = (
+    "Yeah so I've been in IT support for about three years now, mostly tickets and password resets. "
+    "I tried learning kubernetes on my own, set up a homelab, but it keeps breaking and I don't know "
+    "what to focus on. I've applied to jobs for months and nothing comes back. My wife is supportive "
+    "but she wants to know this is going somewhere. On a scale of 1-10 my linux is maybe a 4. "
+    "What would the next step look like? Is there a payment plan, because $3,500 is a lot of money."
+)
+
+
+class SubstringStageDetector(StageDetector):
+    """The previous implementation: ``keyword.lower() in text_lower`` for every keyword of every stage."""
+
+    def detect(self, text, current_stage=None):
+        if not text or not text.strip():
+            return (current_stage or "part_1_open", 0.0)
+        text_lower = text.lower()
+        scale_context = self._detect_scale_context(text_lower)
+        scores = {}
+        for stage_name, keywords in self.STAGE_KEYWORDS.items():
+            hits = sum(1 for keyword in keywords if keyword.lower() in text_lower)
+            if hits:
+                scores[stage_name] = min(1.0, hits / len(keywords) + (hits - 1) * 0.05)
+        if scale_context == "tech" and "part_11_temp_check" in scores:
+            scores["part_11_temp_check"] *= 0.3
+        elif scale_context == "temp" and "part_4_pain_problem" in scores:
+            scores["part_4_pain_problem"] *= 0.3
+        if self._has_scale_pattern(text_lower):
+            if scale_context == "tech":
+                scores["part_4_pain_problem"] = max(scores.get("part_4_pain_problem", 0.0), 0.5)
+            elif scale_context == "temp":
+                scores["part_11_temp_check"] = max(scores.get("part_11_temp_check", 0.0), 0.5)
+        if not scores:
+            return (current_stage or "part_1_open", 0.0)
+        best_stage = max(scores, key=lambda s: scores[s])
+        best_score = scores[best_stage]
+        if current_stage and current_stage in scores and best_score - scores[current_stage] < 0.15:
+            return (current_stage, scores[current_stage])
+        return (best_stage, best_score)
+
+
+def retrieval_texts() -> list[str]:
+    """Detector input as the retriever builds it while the call transcript grows."""
+    words = CALL.split()
+    texts = []
+    for end in range(8, len(words) + 1, 4):
+        active = " ".join(words[max(0, end - 12) : end])
+        context = " ".join(words[: max(0, end - 12)])[-500:]
+        texts.append(f"{context} {active}".strip())
+    return texts
+
+
+def time_per_call_us(detector: StageDetector, texts: list[str], iterations: int) -> float:
+    samples = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for text in texts:
+                detector.detect(text, "part_4_pain_problem")
+        samples.append((time.perf_counter() - start) * 1e6 / (iterations * len(texts)))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    texts = retrieval_texts()
+    compiled, substring = StageDetector(), SubstringStageDetector()
+    for text in texts:
+        for current in (None, "part_4_pain_problem", "objection_handling"):
+            assert compiled.detect(text, current) == substring.detect(text, current), text
+    compiled.detect("warm up the compiled matcher")
+
+    substring_us = time_per_call_us(substring, texts, args.iterations)
+    compiled_us = time_per_call_us(compiled, texts, args.iterations)
+    print(f"Texts: {len(texts)} (avg {statistics.fmean(len(t) for t in texts):.0f} chars), results identical")
+    print(f"  substring checks : {substring_us:7.1f} us/call")
+    print(f"  compiled matcher : {compiled_us:7.1f} us/call")
+    print(f"  speedup          : {substring_us / compiled_us:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
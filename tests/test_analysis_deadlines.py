@@ -0,0 +1,188 @@
+"""
+Tests for deadline-aware analysis requests.
+"""
+
+import json
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.analysis_orchestrator import COMPACT_MAX_TOKENS, AnalysisOrchestrator  # noqa: E402
+from src.realtime.buffer_manager import DualBufferManager  # noqa: E402
+
+
+class RecordingAnalyzer:
+    def __init__(self):
+        self.calls = []
+
+    def analyze_with_fallback(self, active_text, context_text="", on_chunk=None, **kwargs):
+        self.calls.append(kwargs)
+        return json.dumps({"suggestion": "Ask how long this has been going on"})
+
+
+def run_one(orchestrator: AnalysisOrchestrator, results: list) -> None:
+    orchestrator.start()
+    try:
+        for _ in range(100):
+            if results or orchestrator.queue.unfinished_tasks == 0:
+                break
+            time.sleep(0.02)
+    finally:
+        orchestrator.shutdown()
+
+
+class TestDeadlines(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = RecordingAnalyzer()
+        self.results = []
+        self.orchestrator = AnalysisOrchestrator(
+            self.analyzer,
+            on_result=self.results.append,
+            deadline_seconds=6.0,
+            min_remaining_seconds=0.75,
+            compact_below_seconds=2.5,
+        )
+
+    def test_fresh_request_gets_full_budget(self):
+        self.orchestrator.submit_analysis("We keep losing deals", "")
+        run_one(self.orchestrator, self.results)
+
+        self.assertEqual(len(self.analyzer.calls), 1)
+        self.assertEqual(self.analyzer.calls[0]["timeout"], 5.0)
+        self.assertAlmostEqual(self.analyzer.calls[0]["deadline"], time.time() + 6.0, delta=1.0)
+        self.assertFalse(self.results[0].late)
+        self.assertEqual(self.orchestrator.deadline_stats()["met"], 1)
+
+    def test_request_near_deadline_uses_compact_schema(self):
+        self.orchestrator.submit_analysis("We keep losing deals", "", speech_time=time.time() - 4.5)
+        run_one(self.orchestrator, self.results)
+
+        call = self.analyzer.calls[0]
+        self.assertTrue(call["compact"])
+        self.assertEqual(call["max_tokens"], COMPACT_MAX_TOKENS)
+        self.assertLess(call["timeout"], 1.6)
+        self.assertEqual(self.results[0].state.suggestion, "Ask how long this has been going on")
+
+    def test_expired_request_is_dropped_and_counted_as_miss(self):
+        self.orchestrator.submit_analysis("We keep losing deals", "", speech_time=time.time() - 10)
+        run_one(self.orchestrator, self.results)
+
+        self.assertEqual(self.analyzer.calls, [])
+        self.assertEqual(self.results, [])
+        stats = self.orchestrator.deadline_stats()
+        self.assertEqual((stats["dropped"], stats["miss_rate"]), (1, 1.0))
+
+    def test_result_past_deadline_is_tagged_late(self):
+        orchestrator = AnalysisOrchestrator(MagicMock(), on_result=self.results.append, deadline_seconds=6.0)
+        req = MagicMock(deadline=time.time() - 0.1)
+        self.assertTrue(orchestrator._record_deadline(req))
+        self.assertEqual(orchestrator.deadline_stats()["late"], 1)
+
+    def test_errored_request_is_not_counted_as_met(self):
+        class FailingAnalyzer(RecordingAnalyzer):
+            def analyze_with_fallback(self, active_text, context_text="", on_chunk=None, **kwargs):
+                raise ConnectionError("provider down")
+
+        orchestrator = AnalysisOrchestrator(FailingAnalyzer(), on_result=self.results.append, deadline_seconds=6.0)
+        orchestrator.submit_analysis("We keep losing deals", "")
+        run_one(orchestrator, self.results)
+
+        self.assertEqual(self.results[0].error, "provider down")
+        self.assertFalse(self.results[0].late)
+        stats = orchestrator.deadline_stats()
+        self.assertEqual((stats["met"], stats["errored"], stats["requests"]), (0, 1, 1))
+        self.assertEqual(stats["miss_rate"], 1.0)
+
+    def test_deltas_past_deadline_are_tagged_late(self):
+        class LateStreamingAnalyzer(RecordingAnalyzer):
+            def analyze_with_fallback(self, active_text, context_text="", on_chunk=None, **kwargs):
+                on_chunk("{", "{", "m")
+                time.sleep(kwargs["deadline"] - time.time() + 0.05)
+                on_chunk("}", "{}", "m")
+                return "{}"
+
+        partials = []
+        orchestrator = AnalysisOrchestrator(
+            LateStreamingAnalyzer(),
+            on_result=self.results.append,
+            on_partial=partials.append,
+            deadline_seconds=6.0,
+            min_remaining_seconds=0.75,
+        )
+        orchestrator.submit_analysis("We keep losing deals", "", speech_time=time.time() - 5.0)
+        run_one(orchestrator, self.results)
+
+        self.assertEqual([p.late for p in partials], [False, True])
+        self.assertTrue(self.results[0].late)
+
+
+class TestFallbackDeadline(unittest.TestCase):
+    def setUp(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        self.analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m", fallback_model="fast")
+        self.calls = []
+
+        def analyze(active_text, context_text="", model=None, timeout=None, **kwargs):
+            self.calls.append((model, timeout))
+            if model == "m":
+                time.sleep(0.3)
+            return "{}"
+
+        self.analyzer.analyze = analyze
+
+    def test_fallback_gets_the_remaining_budget(self):
+        deadline = time.time() + 1.0
+        self.analyzer.analyze_with_fallback("We keep losing deals", timeout=0.05, deadline=deadline)
+
+        model, timeout = self.calls[-1]
+        self.assertEqual(model, "fast")
+        self.assertLess(timeout, 1.0)
+        self.assertGreater(timeout, 0.5)
+
+    def test_no_budget_left_drops_the_request(self):
+        from src.realtime.analysis_orchestrator import DeadlineExceeded
+
+        with self.assertRaises(DeadlineExceeded):
+            self.analyzer.analyze_with_fallback("We keep losing deals", timeout=0.1, deadline=time.time() + 0.05)
+        self.assertEqual([model for model, _ in self.calls], ["m"])
+
+
+class TestCompactAnalyze(unittest.TestCase):
+    def test_compact_analyze_sends_short_prompt_and_token_cap(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+        chunk = MagicMock()
+        chunk.choices = [MagicMock(delta=MagicMock(content='{"suggestion": "Ask why now"}'))]
+        analyzer.client = MagicMock()
+        analyzer.client.chat.completions.create.return_value = iter([chunk])
+
+        analyzer.analyze("We keep losing deals", compact=True, max_tokens=COMPACT_MAX_TOKENS)
+
+        kwargs = analyzer.client.chat.completions.create.call_args.kwargs
+        self.assertEqual(kwargs["max_tokens"], COMPACT_MAX_TOKENS)
+        self.assertNotIn('"key_points"', kwargs["messages"][0]["content"])
+        self.assertIn('"suggestion"', kwargs["messages"][0]["content"])
+
+
+class TestSpeechStart(unittest.TestCase):
+    def test_buffer_records_when_active_speech_started(self):
+        manager = DualBufferManager()
+        self.assertIsNone(manager.active_started_at)
+
+        before = time.time()
+        manager.on_transcript_chunk("Hello", [{"text": "Hello", "start": 0.0, "end": 0.5, "completed": False}])
+        self.assertGreaterEqual(manager.active_started_at, before)
+
+        manager.rotate_buffers()
+        self.assertIsNone(manager.active_started_at)
+
+
+if __name__ == "__main__":
+    unittest.main()
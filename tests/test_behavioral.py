@@ -816,7 +816,7 @@ class TestAnalysisOrchestratorBehavior(unittest.TestCase):
             def __init__(self):
                 self.calls = []
 
-            def analyze_with_fallback(self, active_text, context_text="", timeout=5.0, on_chunk=None):
+            def analyze_with_fallback(self, active_text, context_text="", timeout=5.0, on_chunk=None, **kwargs):
                 self.calls.append((active_text, context_text, timeout))
                 on_chunk('{"script_location":', '{"script_location":', "fast-model")
                 on_chunk(
@@ -1061,7 +1061,12 @@ class TestContextEngineLayer2Behavior(unittest.TestCase):
                 ],
             ),
             patch("rag.store.EmbeddingStore", FakeStore),
+            patch.dict(os.environ, {"RAG_VECTOR_BACKEND": "chroma"}),
         ):
+            from rag.pipeline import reset_rag_pipeline
+
+            reset_rag_pipeline()
+            self.addCleanup(reset_rag_pipeline)
             analyzer = StreamingAnalyzer(api_key="test", base_url="http://fake", model="m")
             analyzer._init_rag()
 
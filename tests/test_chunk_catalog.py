@@ -0,0 +1,89 @@
+"""
+Tests for the indexed chunk catalog used by retrieval's deterministic branch.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.chunker import ChunkCatalog, get_adjacent_chunks, get_chunk_by_id  # noqa: E402
+from rag.retriever import ScriptRetriever  # noqa: E402
+from rag.stage_detector import StageDetector  # noqa: E402
+
+
+def chunk(chunk_id, part, chunk_type="script", source="kubecraft_script", section=None):
+    metadata = {"section": section or chunk_id, "type": chunk_type, "part_number": part, "source": source}
+    return {"id": chunk_id, "text": chunk_id, "metadata": metadata}
+
+
+CHUNKS = [
+    chunk("preamble", None, "preamble"),
+    *[chunk(f"part_{n}", n) for n in range(1, 13)],
+    chunk("objection_price", None, "objection", section="Objection: Too expensive"),
+    chunk("objection_spouse", None, "objection", section="Objection: Spouse"),
+    chunk("other_part_2", 2, source="other_client_script"),
+    chunk("methodology_objections", None, "methodology_objection", "hardly_selling_methodology", "Objection Handling"),
+]
+
+
+def scan_adjacent(chunks, part_number, window):
+    return [
+        c
+        for c in chunks
+        if c["metadata"]["part_number"] is not None
+        and part_number - window <= c["metadata"]["part_number"] <= part_number + window
+    ]
+
+
+class TestChunkCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = ChunkCatalog(CHUNKS, windows=(1, 2))
+
+    def test_indexes(self):
+        self.assertIs(get_chunk_by_id(self.catalog, "part_7"), CHUNKS[7])
+        self.assertIsNone(get_chunk_by_id(self.catalog, "missing"))
+        self.assertEqual([c["id"] for c in self.catalog.by_part[2]], ["part_2", "other_part_2"])
+        self.assertEqual([c["id"] for c in self.catalog.by_type["objection"]], ["objection_price", "objection_spouse"])
+        self.assertEqual([c["id"] for c in self.catalog.by_source["other_client_script"]], ["other_part_2"])
+        self.assertEqual(
+            [c["id"] for c in self.catalog.objection_chunks],
+            ["objection_price", "objection_spouse", "methodology_objections"],
+        )
+
+    def test_adjacency_matches_linear_scan(self):
+        for window in (0, 1, 2, 3):
+            for part in range(-1, 15):
+                self.assertEqual(self.catalog.adjacent(part, window), scan_adjacent(CHUNKS, part, window))
+                self.assertEqual(
+                    get_adjacent_chunks(self.catalog, part, window), get_adjacent_chunks(CHUNKS, part, window)
+                )
+
+    def test_chunks_without_part_metadata_are_indexed(self):
+        catalog = ChunkCatalog([{"id": "bare", "text": "bare", "metadata": {}}, CHUNKS[1]])
+        self.assertEqual(catalog.adjacent(1), [CHUNKS[1]])
+        self.assertEqual(catalog.get("bare")["text"], "bare")
+
+    def test_adjacency_by_source(self):
+        self.assertEqual([c["id"] for c in self.catalog.adjacent(3, 1, source="other_client_script")], ["other_part_2"])
+
+
+class TestRetrieverDeterministicBranch(unittest.TestCase):
+    def test_catalog_lookup_returns_what_the_scan_did(self):
+        retriever = ScriptRetriever(store=None, detector=StageDetector(), chunks=CHUNKS)
+
+        self.assertEqual([c["id"] for c in retriever._get_adjacent_chunks(1)], ["part_1", "part_2", "other_part_2"])
+        self.assertEqual(retriever._get_adjacent_chunks(12), scan_adjacent(CHUNKS, 12, 1))
+        self.assertEqual(retriever._get_adjacent_chunks(None), ChunkCatalog(CHUNKS).objection_chunks)
+
+    def test_shared_catalog_is_not_rebuilt(self):
+        catalog = ChunkCatalog(CHUNKS)
+        retriever = ScriptRetriever(store=None, detector=StageDetector(), chunks=catalog)
+        self.assertIs(retriever.catalog, catalog)
+        self.assertEqual(retriever.chunks, CHUNKS)
+
+
+if __name__ == "__main__":
+    unittest.main()
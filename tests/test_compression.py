@@ -0,0 +1,91 @@
+"""
+Tests for extractive transcript compression.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.compression import TranscriptCompressor  # noqa: E402
+
+CALL = """Rep: Hey, thanks for jumping on. How's your week going?
+Prospect: Yeah. Good, good. Mm-hmm.
+Rep: So what made you book this call?
+Prospect: Um. Okay. So I run a homelab and my Kubernetes cluster keeps falling over during upgrades.
+Prospect: Yeah, right.
+Prospect: My Kubernetes cluster keeps falling over during upgrades.
+Rep: How long has that been going on?
+Prospect: About six months. It cost me a client project last month and I lost around four thousand dollars.
+Prospect: Okay. Yeah.
+Rep: What have you tried so far?
+Prospect: I tried reading the docs and some YouTube tutorials but nothing really stuck.
+Prospect: Honestly I'm not sure I can afford a program right now."""
+
+
+class TestTranscriptCompressor(unittest.TestCase):
+    def test_short_transcript_passes_through(self):
+        text = "Rep: Hi.\nProspect: Yeah."
+        result = TranscriptCompressor(min_tokens=300).compress(text)
+        self.assertEqual(result.text, text)
+        self.assertEqual(result.ratio, 1.0)
+
+    def test_drops_filler_and_keeps_fuller_repeat(self):
+        result = TranscriptCompressor(min_tokens=0, target_ratio=1.0).compress(CALL)
+
+        self.assertNotIn("Mm-hmm", result.text)
+        self.assertNotIn("Prospect: Yeah, right.", result.text)
+        self.assertEqual(result.text.count("keeps falling over during upgrades"), 1)
+        self.assertIn("So I run a homelab and my Kubernetes cluster", result.text)
+        self.assertGreater(result.dropped_filler, 0)
+        self.assertEqual(result.dropped_duplicates, 1)
+
+    def test_exact_repeat_keeps_later_turn(self):
+        text = (
+            "Rep: What does the cluster run today?\nProspect: Home automation.\nRep: What does the cluster run today?"
+        )
+        result = TranscriptCompressor(min_tokens=0, target_ratio=1.0).compress(text)
+        self.assertEqual(result.text, "Prospect: Home automation.\nRep: What does the cluster run today?")
+
+    def test_budget_keeps_salient_sentences_in_order_with_speakers(self):
+        result = TranscriptCompressor(min_tokens=0, target_ratio=0.5).compress(CALL)
+
+        self.assertLessEqual(result.compressed_tokens, result.original_tokens * 0.5)
+        self.assertIn("not sure I can afford", result.text, "Hesitation markers are always favoured")
+        lines = result.text.splitlines()
+        self.assertTrue(all(line.split(":", 1)[0] in ("Rep", "Prospect") for line in lines))
+        kept = [CALL.find(line.split(": ", 1)[1][:20]) for line in lines]
+        self.assertEqual(kept, sorted(kept), "Original order is preserved")
+
+    def test_embedding_scoring_falls_back_to_tfidf_on_error(self):
+        embed = MagicMock(side_effect=RuntimeError("model not loaded"))
+        result = TranscriptCompressor(min_tokens=0, target_ratio=0.5, embed_fn=embed).compress(CALL)
+        self.assertLess(result.ratio, 1.0)
+
+
+class TestSummaryCompression(unittest.TestCase):
+    def test_summary_prompt_receives_compressed_transcript(self):
+        from src.realtime.summary_engine import SummaryEngine
+
+        client = MagicMock()
+        client.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content=json.dumps({"summary": "ok"})))]
+        )
+        engine = SummaryEngine(
+            client=client, model="m", compressor=TranscriptCompressor(min_tokens=0, target_ratio=0.5)
+        )
+        for line in CALL.splitlines():
+            engine.add_transcript(line)
+        engine.refresh()
+
+        prompt = client.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+        self.assertNotIn("Mm-hmm", prompt)
+        self.assertIn("afford", prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests for automatic degradation of live analysis under load.
+"""
+
+import json
+import queue
+import sys
+import time
+import unittest
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.degradation import SHORT_CONTEXT_CHARS, DegradationController  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDegradationController(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.controller = DegradationController(
+            max_queue_depth=2,
+            ttft_high_ms=2000,
+            ttft_low_ms=1000,
+            step_down_after=2,
+            recover_after_seconds=10,
+            clock=self.clock,
+        )
+
+    def test_backlog_steps_down_one_level_at_a_time(self):
+        levels = [self.controller.observe(queue_depth=3) for _ in range(4)]
+        self.assertEqual(levels, [0, 1, 1, 2])
+        self.assertEqual(self.controller.level_name, "no_rag")
+        self.assertEqual(self.controller.overrides(), {"fast_model_only": True, "use_rag": False})
+
+    def test_high_ttft_degrades_even_with_empty_queue(self):
+        self.controller.record_ttft(3500)
+        self.controller.observe(0)
+        self.assertEqual(self.controller.observe(0), 1)
+
+    def test_recovers_only_after_sustained_low_load(self):
+        for _ in range(6):
+            self.controller.observe(5)
+        self.assertEqual(self.controller.level_name, "short_context")
+        self.assertEqual(self.controller.overrides()["max_context_chars"], SHORT_CONTEXT_CHARS)
+
+        self.controller.record_ttft(500)
+        self.controller.observe(0)
+        self.clock.now = 5
+        self.assertEqual(self.controller.observe(0), 3, "No step up before the recovery window")
+        self.clock.now = 11
+        self.assertEqual(self.controller.observe(0), 2)
+
+    def test_middle_band_holds_level(self):
+        self.controller.observe(5)
+        self.controller.observe(5)
+        self.controller.record_ttft(1500)
+        self.clock.now = 100
+        for _ in range(5):
+            self.assertEqual(self.controller.observe(1), 1)
+
+    def test_transitions_are_recorded_and_pushed_to_listeners(self):
+        events = []
+        self.controller.add_listener(events.append)
+        self.controller.observe(3)
+        self.controller.observe(3)
+
+        self.assertEqual(events[0]["from"], "normal")
+        self.assertEqual(events[0]["to"], "fallback_model")
+        self.assertEqual(self.controller.snapshot()["transitions"], events)
+
+    def test_backlog_is_summed_across_registered_session_queues(self):
+        sessions = [queue.Queue(), queue.Queue()]
+        for q in sessions:
+            self.controller.register_queue(q)
+            q.put("request")
+
+        self.assertEqual(self.controller.queue_depth(), 2)
+        self.controller.observe()
+        self.assertEqual(self.controller.observe(), 1)
+
+        self.controller.unregister_queue(sessions[0])
+        self.assertEqual(self.controller.snapshot()["queue_depth"], 1)
+
+    def test_fallback_model_level_is_skipped_without_fast_model(self):
+        self.controller.observe(3)
+        self.controller.observe(3)
+
+        self.assertEqual(self.controller.overrides(fast_model=False)["use_rag"], False)
+        self.assertEqual(self.controller.overrides(level=0, fast_model=False), {})
+        self.assertNotIn("use_rag", self.controller.overrides())
+
+
+class TestOrchestratorDegradation(unittest.TestCase):
+    def test_worker_applies_overrides_for_current_level(self):
+        from src.realtime.analysis_orchestrator import AnalysisOrchestrator
+
+        calls = []
+
+        class Analyzer:
+            fast_model_available = True
+
+            def analyze_with_fallback(self, active_text, context_text="", on_chunk=None, **kwargs):
+                calls.append(kwargs)
+                return json.dumps({"suggestion": "Ask why now"})
+
+        controller = DegradationController(step_down_after=1)
+        controller.record_ttft(9000)
+        results = []
+        orchestrator = AnalysisOrchestrator(Analyzer(), on_result=results.append, degradation=controller)
+        orchestrator.submit_analysis("We keep losing deals", "")
+        orchestrator.start()
+        try:
+            for _ in range(100):
+                if results:
+                    break
+                time.sleep(0.02)
+        finally:
+            orchestrator.shutdown()
+
+        self.assertTrue(calls[0]["fast_model_only"])
+        self.assertEqual(controller.level_name, "fallback_model")
+
+
+if __name__ == "__main__":
+    unittest.main()
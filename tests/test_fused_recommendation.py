@@ -0,0 +1,102 @@
+"""
+Tests for the fused summary + recommendation call.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.prompts import get_fused_summary_recommendation_prompt  # noqa: E402
+from src.realtime.summary_engine import SummaryEngine, _summary_prefix  # noqa: E402
+
+RESPONSE = {
+    "summary": "Prospect's cluster keeps failing during upgrades.",
+    "key_points": ["Lost a client project"],
+    "pain_indicators": ["keeps falling over"],
+    "stage_hint": "problem_development",
+    "archetype_hint": "pain_buyer",
+    "recommendation": {
+        "stage": "discovery",
+        "questions": ["How long has that been going on?"],
+        "reasoning": "Level 3: duration",
+    },
+}
+
+
+def make_chunk(content):
+    chunk = MagicMock()
+    chunk.choices = [MagicMock(delta=MagicMock(content=content))]
+    return chunk
+
+
+class TestFusedPrompt(unittest.TestCase):
+    def test_schema_puts_summary_first_and_uses_stage_blueprint(self):
+        prompt = get_fused_summary_recommendation_prompt("Prospect: It keeps failing.", "pitch", ["PLAYBOOK"])
+        schema = prompt[prompt.rindex("OUTPUT FORMAT") :]
+
+        self.assertLess(schema.index('"summary":'), schema.index('"recommendation":'))
+        self.assertIn('"stage": "pitch"', schema)
+        self.assertIn("PLAYBOOK", prompt)
+        self.assertIn("It keeps failing.", prompt)
+
+    def test_incremental_variant_includes_previous_summary(self):
+        prompt = get_fused_summary_recommendation_prompt("new", "discovery", [], {"summary": "Earlier call"})
+        self.assertIn("Earlier call", prompt)
+
+
+class TestFusedRefresh(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.client = MagicMock()
+        self.engine = SummaryEngine(
+            client=self.client, model="m", on_summary=lambda r: self.events.append(("summary", r)), compressor=None
+        )
+        self.engine.add_transcript("Prospect: My cluster keeps falling over during upgrades.")
+
+    def stream(self, text, step=12):
+        for i in range(0, len(text), step):
+            self.events.append(("chunk", i))
+            yield make_chunk(text[i : i + step])
+
+    def test_summary_is_applied_before_recommendation_finishes(self):
+        self.client.chat.completions.create.return_value = self.stream(json.dumps(RESPONSE))
+
+        recommendation = self.engine.refresh_and_recommend(rag_sections=["PLAYBOOK"])
+
+        self.assertEqual(recommendation["questions"], ["How long has that been going on?"])
+        kinds = [kind for kind, _ in self.events]
+        self.assertEqual(kinds.count("summary"), 1)
+        self.assertIn("chunk", kinds[kinds.index("summary") + 1 :], "Summary fired while still streaming")
+        self.assertEqual(self.engine.current_summary.stage_hint, "problem_development")
+        self.assertEqual(self.engine.summary_version, 1)
+        self.assertTrue(self.client.chat.completions.create.call_args.kwargs["stream"])
+
+    def test_nothing_new_returns_none_without_llm_call(self):
+        self.client.chat.completions.create.return_value = self.stream(json.dumps(RESPONSE))
+        self.engine.refresh_and_recommend()
+        self.client.chat.completions.create.reset_mock()
+
+        self.assertIsNone(self.engine.refresh_and_recommend())
+        self.client.chat.completions.create.assert_not_called()
+
+    def test_missing_recommendation_raises_after_summary_applied(self):
+        partial = {k: v for k, v in RESPONSE.items() if k != "recommendation"}
+        self.client.chat.completions.create.return_value = self.stream(json.dumps(partial))
+
+        with self.assertRaises(json.JSONDecodeError):
+            self.engine.refresh_and_recommend()
+        self.assertEqual(self.engine.summary_version, 1)
+
+    def test_prefix_ignores_quoted_key_inside_summary_text(self):
+        text = '{"summary": "He asked for a \\"recommendation\\": soon", "key_points": [], "recommendation": {'
+        self.assertEqual(_summary_prefix(text)["key_points"], [])
+        self.assertIsNone(_summary_prefix('{"summary": "He asked for a \\"recommendation\\": soon'))
+
+
+if __name__ == "__main__":
+    unittest.main()
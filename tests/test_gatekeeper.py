@@ -0,0 +1,111 @@
+"""
+Tests for the priority-aware LLM rate limiter.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.gatekeeper import (  # noqa: E402
+    Gatekeeper,
+    Priority,
+    RateLimitExceeded,
+    get_gatekeeper,
+    reset_gatekeepers,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestGatekeeper(unittest.TestCase):
+    def test_batch_is_shed_while_live_keeps_reserved_headroom(self):
+        clock = FakeClock()
+        gate = Gatekeeper("github", requests_per_minute=4, clock=clock)
+
+        gate.acquire(Priority.BATCH, max_wait=0)
+        gate.acquire(Priority.BATCH, max_wait=0)
+        with self.assertRaises(RateLimitExceeded):
+            gate.acquire(Priority.BATCH, max_wait=0)
+
+        # The half of the bucket batch work may not touch is still there for live coaching.
+        gate.acquire(Priority.LIVE, max_wait=0)
+        gate.acquire(Priority.LIVE, max_wait=0)
+        with self.assertRaises(RateLimitExceeded):
+            gate.acquire(Priority.LIVE, max_wait=0)
+
+        snapshot = gate.snapshot()
+        self.assertEqual(snapshot["admitted"]["live"], 2)
+        self.assertEqual(snapshot["shed"]["batch"], 1)
+
+    def test_bucket_refills_over_time(self):
+        clock = FakeClock()
+        gate = Gatekeeper("github", requests_per_minute=60, tokens_per_minute=1000, clock=clock)
+
+        gate.acquire(Priority.LIVE, tokens=1000, max_wait=0)
+        with self.assertRaises(RateLimitExceeded):
+            gate.acquire(Priority.LIVE, tokens=100, max_wait=0)
+
+        clock.now += 6  # 6s refills 100 tokens
+        gate.acquire(Priority.LIVE, tokens=100, max_wait=0)
+
+    def test_usage_correction_returns_unused_tokens(self):
+        clock = FakeClock()
+        gate = Gatekeeper("github", tokens_per_minute=1000, clock=clock)
+        gate.acquire(Priority.LIVE, tokens=1000, max_wait=0)
+        gate.record_usage(estimated_tokens=1000, actual_tokens=400)
+
+        gate.acquire(Priority.LIVE, tokens=500, max_wait=0)
+
+    def test_unlimited_provider_never_waits(self):
+        gate = Gatekeeper("local")
+        for _ in range(100):
+            self.assertEqual(gate.acquire(Priority.BATCH, tokens=10_000, max_wait=0), 0.0)
+
+
+class TestGatekeeperRegistry(unittest.TestCase):
+    def setUp(self):
+        reset_gatekeepers()
+
+    def tearDown(self):
+        reset_gatekeepers()
+
+    def test_limits_from_env_per_provider(self):
+        with patch.dict(os.environ, {"LLM_RATE_LIMIT_OPENAI_RPM": "120", "LLM_RATE_LIMIT_TPM": "50000"}):
+            gate = get_gatekeeper("openai")
+
+        self.assertIs(gate, get_gatekeeper("openai"))
+        self.assertEqual(gate.snapshot()["requests_per_minute"], 120)
+        self.assertEqual(gate.snapshot()["tokens_per_minute"], 50000)
+
+
+class TestSummaryShedding(unittest.TestCase):
+    def test_shed_summary_reports_deferral_without_calling_llm(self):
+        from src.realtime.summary_engine import SummaryEngine
+
+        gate = MagicMock()
+        gate.acquire.side_effect = RateLimitExceeded("busy")
+        results = []
+        client = MagicMock()
+        engine = SummaryEngine(client=client, model="m", on_summary=results.append, gatekeeper=gate)
+        engine.add_transcript("Prospect: We keep losing deals.")
+
+        engine.refresh()
+
+        client.chat.completions.create.assert_not_called()
+        self.assertIn("deferred", results[0].error)
+        self.assertEqual(gate.acquire.call_args.args[0], Priority.SUMMARY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Tests for the process-wide pooled LLM client factory.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime import http_clients  # noqa: E402
+
+
+class TestClientFactory(unittest.TestCase):
+    def setUp(self):
+        http_clients.close_clients()
+
+    def tearDown(self):
+        http_clients.close_clients()
+
+    def test_same_endpoint_and_key_reuse_one_client(self):
+        first = http_clients.get_openai_client("http://fake/v1", "key")
+        second = http_clients.get_openai_client("http://fake/v1/", "key")
+        self.assertIs(first, second)
+
+    def test_distinct_keys_share_one_connection_pool(self):
+        a = http_clients.get_openai_client("http://fake/v1", "key-a")
+        b = http_clients.get_openai_client("http://other/v1", "key-b")
+
+        self.assertIsNot(a, b)
+        self.assertIs(a._client, http_clients.get_http_client())
+        self.assertIs(b._client, http_clients.get_http_client())
+
+    def test_analyzers_share_cached_client(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        first = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+        second = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+        self.assertIs(first.client, second.client)
+
+
+class TestConnectionWarmup(unittest.TestCase):
+    def test_warm_connection_reports_elapsed_time(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(404)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch.object(http_clients, "get_http_client", return_value=client):
+            elapsed = http_clients.warm_connection("http://fake/v1")
+
+        self.assertIsNotNone(elapsed)
+        self.assertEqual(requests[0].method, "HEAD")
+
+    def test_warm_connection_is_non_fatal(self):
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch.object(http_clients, "get_http_client", return_value=client):
+            self.assertIsNone(http_clients.warm_connection("http://fake/v1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
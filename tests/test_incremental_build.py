@@ -0,0 +1,140 @@
+"""
+Tests for the manifest-driven incremental RAG build.
+"""
+
+import contextlib
+import functools
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.build import _open_store, _sync_collection, chunk_fingerprint, load_manifest  # noqa: E402
+from rag.embeddings import reset_query_embedding_cache  # noqa: E402
+from rag.numpy_store import NumpyEmbeddingStore  # noqa: E402
+
+
+def bag_of_words(texts):
+    vectors = np.zeros((len(texts), 256), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.lower().split():
+            vectors[row, zlib.crc32(word.encode()) % 256] += 1.0
+    return vectors
+
+
+class CountingEmbedder:
+    """bag_of_words that records which texts it was asked to embed."""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return bag_of_words(texts)
+
+
+def chunks(*texts):
+    return [
+        {"id": f"part_{n}", "text": text, "metadata": {"type": "script", "part_number": n}}
+        for n, text in enumerate(texts, start=1)
+    ]
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        reset_query_embedding_cache()
+        self.addCleanup(reset_query_embedding_cache)
+        self.persist_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.persist_dir, True)
+        self.embedder = CountingEmbedder()
+
+    def sync(self, source, force=False):
+        store = NumpyEmbeddingStore(
+            "sales_script", self.persist_dir, embedding_fn=self.embedder, embedding_model="test-model"
+        )
+        self.embedder.texts.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            changed = _sync_collection(store, source, "sales_script", force=force, persist_dir=self.persist_dir)
+        return changed, store
+
+    def test_first_build_embeds_everything_and_writes_manifest(self):
+        source = chunks("open the call", "ask about pain", "close the deal")
+        changed, store = self.sync(source)
+
+        self.assertTrue(changed)
+        self.assertEqual(len(self.embedder.texts), 3)
+        manifest = load_manifest(self.persist_dir, "sales_script")
+        self.assertEqual(manifest["embedding_model"], "test-model")
+        self.assertEqual(manifest["chunks"]["part_2"], chunk_fingerprint(source[1]))
+
+    def test_unchanged_source_embeds_nothing(self):
+        source = chunks("open the call", "ask about pain")
+        self.sync(source)
+        changed, store = self.sync(source)
+
+        self.assertFalse(changed)
+        self.assertEqual(self.embedder.texts, [])
+        self.assertEqual(store.count(), 2)
+
+    def test_same_count_edit_only_reembeds_the_edited_chunk(self):
+        self.sync(chunks("open the call", "ask about pain", "close the deal"))
+        changed, store = self.sync(chunks("open the call", "ask about pain and budget", "close the deal"))
+
+        self.assertTrue(changed)
+        self.assertEqual(self.embedder.texts, ["ask about pain and budget"])
+        self.assertEqual(store.query("budget", top_k=1)[0]["text"], "ask about pain and budget")
+
+    def test_metadata_change_counts_as_a_change(self):
+        source = chunks("open the call")
+        self.sync(source)
+        source[0]["metadata"]["section"] = "Opening"
+        self.sync(source)
+        self.assertEqual(self.embedder.texts, ["open the call"])
+
+    def test_removed_ids_are_deleted(self):
+        self.sync(chunks("open the call", "ask about pain", "close the deal"))
+        changed, store = self.sync(chunks("open the call", "ask about pain"))
+
+        self.assertTrue(changed)
+        self.assertEqual(self.embedder.texts, [])
+        reopened = NumpyEmbeddingStore(
+            "sales_script", self.persist_dir, embedding_fn=bag_of_words, embedding_model="test-model"
+        )
+        self.assertEqual(sorted(r["id"] for r in reopened.query("call", top_k=5)), ["part_1", "part_2"])
+        self.assertEqual(set(load_manifest(self.persist_dir, "sales_script")["chunks"]), {"part_1", "part_2"})
+
+    def test_model_change_rebuilds_everything(self):
+        source = chunks("open the call", "ask about pain")
+        self.sync(source)
+        store_cls = functools.partial(NumpyEmbeddingStore, embedding_fn=self.embedder, embedding_model="other-model")
+        self.embedder.texts.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            store = _open_store(store_cls, "sales_script", self.persist_dir)
+            _sync_collection(store, source, "sales_script", force=False, persist_dir=self.persist_dir)
+
+        self.assertEqual(len(self.embedder.texts), 2)
+        self.assertEqual(store.count(), 2)
+        self.assertEqual(load_manifest(self.persist_dir, "sales_script")["embedding_model"], "other-model")
+
+    def test_store_without_manifest_is_rebuilt(self):
+        source = chunks("open the call", "ask about pain")
+        self.sync(source)
+        os.remove(os.path.join(self.persist_dir, "sales_script.manifest.json"))
+        changed, store = self.sync(source)
+
+        self.assertTrue(changed)
+        self.assertEqual(len(self.embedder.texts), 2)
+        self.assertEqual(store.count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for incremental (delta-based) rolling summaries.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.summary_engine import SummaryEngine  # noqa: E402
+
+SUMMARY_JSON = json.dumps(
+    {
+        "summary": "Prospect is stuck in helpdesk and wants a DevOps role.",
+        "key_points": ["Three years in helpdesk"],
+        "pain_indicators": ["stuck"],
+        "stage_hint": "problem_development",
+        "archetype_hint": "pain_buyer",
+    }
+)
+
+
+def make_engine(**kwargs) -> tuple[SummaryEngine, MagicMock]:
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content=SUMMARY_JSON))]
+    )
+    return SummaryEngine(client=client, model="m", **kwargs), client
+
+
+def sent_prompt(client: MagicMock) -> str:
+    return client.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+
+
+class TestIncrementalSummary(unittest.TestCase):
+    def test_second_summary_sends_only_the_delta_and_previous_summary(self):
+        engine, client = make_engine(incremental=True, full_every=4)
+        engine.add_transcript("Prospect: I've been in helpdesk for three years.")
+        engine.refresh()
+        self.assertIn('"full_transcript"', sent_prompt(client))
+
+        engine.add_transcript("Prospect: My manager blocked the promotion.")
+        engine.refresh()
+
+        prompt = sent_prompt(client)
+        self.assertIn('"new_transcript"', prompt)
+        self.assertIn("blocked the promotion", prompt)
+        self.assertNotIn("three years", prompt.split("<untrusted_transcript_json>")[1])
+        self.assertIn("Prospect is stuck in helpdesk", prompt)
+        self.assertTrue(engine.current_summary.incremental)
+
+    def test_no_new_lines_skips_the_llm_call(self):
+        engine, client = make_engine(incremental=True)
+        engine.add_transcript("Prospect: We keep losing deals.")
+        engine.refresh()
+        engine.refresh()
+        self.assertEqual(client.chat.completions.create.call_count, 1)
+
+    def test_periodic_full_resummary_controls_drift(self):
+        engine, client = make_engine(incremental=True, full_every=3)
+        modes = []
+        for i in range(6):
+            engine.add_transcript(f"Prospect: detail number {i} about the job search.")
+            engine.refresh()
+            modes.append(engine.current_summary.incremental)
+        self.assertEqual(modes, [False, True, True, False, True, True])
+
+    def test_prompt_size_stays_flat_through_a_long_call(self):
+        engine, client = make_engine(incremental=True, full_every=1000)
+        sizes = []
+        for block in range(12):
+            for i in range(40):
+                engine.add_transcript(f"Prospect: block {block} line {i}, still talking about Kubernetes at work.")
+            engine.refresh()
+            sizes.append(len(sent_prompt(client)))
+        self.assertLess(max(sizes[1:]) - min(sizes[1:]), 200)
+
+    def test_full_mode_is_unchanged_when_disabled(self):
+        engine, client = make_engine(incremental=False)
+        engine.add_transcript("Prospect: line one.")
+        engine.refresh()
+        engine.add_transcript("Prospect: line two.")
+        engine.refresh()
+        self.assertIn("line one", sent_prompt(client))
+        self.assertFalse(engine.current_summary.incremental)
+
+
+if __name__ == "__main__":
+    unittest.main()
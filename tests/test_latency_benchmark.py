@@ -125,7 +125,7 @@ class TestLatencyBenchmark(unittest.TestCase):
         from src.realtime.buffer_manager import BufferConfig, DualBufferManager
 
         class FastStreamingAnalyzer:
-            def analyze_with_fallback(self, active_text, context_text="", timeout=5.0, on_chunk=None):
+            def analyze_with_fallback(self, active_text, context_text="", timeout=5.0, on_chunk=None, **kwargs):
                 time.sleep(0.001)
                 on_chunk('{"script_location":', '{"script_location":', "fast-model")
                 time.sleep(0.001)
@@ -231,7 +231,7 @@ class TestLatencyBenchmark(unittest.TestCase):
             def __init__(self, *args, **kwargs):
                 self.client = SimpleNamespace()
 
-            def analyze_with_fallback(self, active_text, context_text="", timeout=5.0, on_chunk=None):
+            def analyze_with_fallback(self, active_text, context_text="", timeout=5.0, on_chunk=None, **kwargs):
                 first = '{"script_location": "Objection Handling",'
                 full = (
                     '{"script_location": "Objection Handling", '
@@ -0,0 +1,83 @@
+"""
+Tests for low-information trigger suppression.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.novelty_gate import NoveltyGate, replay_transcript  # noqa: E402
+
+
+class TestNoveltyGate(unittest.TestCase):
+    def test_backchannels_are_deferred_and_merged_into_next_trigger(self):
+        gate = NoveltyGate()
+
+        self.assertIsNone(gate.admit("Yeah."))
+        self.assertIsNone(gate.admit("Mm-hmm. Okay."))
+        merged = gate.admit("We have been struggling with Kubernetes deployments for months.")
+
+        self.assertTrue(merged.startswith("Yeah. Mm-hmm. Okay."))
+        self.assertEqual(gate.stats()["suppressed"], 2)
+
+    def test_short_objections_always_pass(self):
+        gate = NoveltyGate()
+        self.assertEqual(gate.admit("Not sure."), "Not sure.")
+        self.assertEqual(gate.admit("Too expensive."), "Too expensive.")
+
+    def test_repeat_of_last_analyzed_text_is_deferred(self):
+        gate = NoveltyGate()
+        gate.admit("I want a DevOps role with better income")
+        self.assertEqual(gate.check("better income DevOps role").reason, "repeat")
+
+    def test_no_content_words_with_zero_minimum(self):
+        gate = NoveltyGate(min_content_words=0)
+        gate.admit("I want a DevOps role with better income")
+        self.assertEqual(gate.check("Yeah. Okay.").reason, "novel")
+
+    def test_embedding_similarity_is_optional(self):
+        embed = MagicMock(side_effect=lambda text: [1.0, 0.0] if "linux" in text else [0.0, 1.0])
+        gate = NoveltyGate(embed_fn=embed, max_similarity=0.9)
+        gate.admit("I have been learning linux at night")
+
+        self.assertEqual(gate.check("my linux homelab keeps crashing badly").reason, "similar")
+        self.assertTrue(gate.check("my manager blocked the promotion").dispatch)
+
+
+class TestReplay(unittest.TestCase):
+    def test_replay_reports_suppressed_fraction(self):
+        transcript = "\n".join(
+            [
+                "Rep: How long have you been in your current role?",
+                "Prospect: Yeah.",
+                "Prospect: Okay.",
+                "Prospect: About three years doing helpdesk support tickets.",
+                "Rep: Mm-hmm.",
+                "Prospect: Right.",
+            ]
+        )
+        report = replay_transcript(transcript)
+
+        self.assertGreater(report["triggers"], 0)
+        self.assertGreater(report["suppressed"], 0)
+        self.assertEqual(report["dispatched"] + report["suppressed"], report["triggers"])
+
+
+class TestOrchestratorGate(unittest.TestCase):
+    def test_low_information_trigger_is_not_queued(self):
+        from src.realtime.analysis_orchestrator import AnalysisOrchestrator
+
+        orchestrator = AnalysisOrchestrator(analyzer=MagicMock(), on_result=MagicMock(), novelty_gate=NoveltyGate())
+        orchestrator.submit_analysis("Okay.", "")
+        self.assertTrue(orchestrator.queue.empty())
+
+        orchestrator.submit_analysis("I applied to forty jobs and heard nothing back", "")
+        self.assertEqual(orchestrator.queue.get_nowait().active_text.split()[0], "Okay.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for the in-process NumPy vector index.
+"""
+
+import sys
+import tempfile
+import time
+import unittest
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.embeddings import reset_query_embedding_cache  # noqa: E402
+from rag.numpy_store import NumpyEmbeddingStore, matches_where  # noqa: E402
+
+CHUNKS = [
+    {
+        "id": "objection_price",
+        "text": "too expensive price cost",
+        "metadata": {"type": "objection", "part_number": None},
+    },
+    {"id": "part_4_pain", "text": "pain problem stuck frustrated", "metadata": {"type": "script", "part_number": 4}},
+    {"id": "part_9_pitch", "text": "program offer homelab pitch", "metadata": {"type": "script", "part_number": 9}},
+    {"id": "part_12_close", "text": "payment start close price", "metadata": {"type": "script", "part_number": 12}},
+]
+
+
+def bag_of_words(texts):
+    """Deterministic stand-in for the sentence-transformer: hashed bag of words."""
+    vectors = np.zeros((len(texts), 512), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.lower().split():
+            vectors[row, zlib.crc32(word.encode()) % 512] += 1.0
+    return vectors
+
+
+class TestNumpyEmbeddingStore(unittest.TestCase):
+    def setUp(self):
+        reset_query_embedding_cache()
+        self.addCleanup(reset_query_embedding_cache)
+        self.store = NumpyEmbeddingStore(embedding_fn=bag_of_words)
+        self.store.add_chunks(CHUNKS)
+
+    def test_query_ranks_by_similarity_with_chroma_distance_scale(self):
+        results = self.store.query("that is too expensive", top_k=2)
+
+        self.assertEqual(results[0]["id"], "objection_price")
+        self.assertLessEqual(results[0]["distance"], results[1]["distance"])
+        self.assertTrue(all(0.0 <= r["distance"] <= 4.0 for r in results))
+        self.assertEqual(set(results[0]), {"id", "text", "metadata", "distance"})
+
+    def test_where_filter_matches_chroma_operators(self):
+        results = self.store.query("close price", top_k=3, where={"type": "script"})
+        self.assertEqual([r["id"] for r in results][0], "part_12_close")
+        self.assertNotIn("objection_price", [r["id"] for r in results])
+
+        ranged = self.store.query("price", top_k=5, where={"$and": [{"type": "script"}, {"part_number": {"$gte": 9}}]})
+        self.assertEqual({r["id"] for r in ranged}, {"part_9_pitch", "part_12_close"})
+        self.assertFalse(matches_where({"type": "script"}, {"type": {"$in": ["objection"]}}))
+        self.assertEqual(self.store.query("price", where={"type": "missing"}), [])
+
+    def test_add_replaces_existing_ids(self):
+        self.store.add_chunks([{"id": "part_9_pitch", "text": "pricing tiers", "metadata": {"type": "script"}}])
+        self.assertEqual(self.store.count(), 4)
+        self.assertEqual(self.store.query("pricing tiers", top_k=1)[0]["id"], "part_9_pitch")
+
+    def test_persists_and_loads_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as persist_dir:
+            built = NumpyEmbeddingStore(persist_dir=persist_dir, embedding_fn=bag_of_words, embedding_model="bow")
+            built.add_chunks(CHUNKS)
+
+            loaded = NumpyEmbeddingStore(persist_dir=persist_dir, embedding_fn=bag_of_words, embedding_model="bow")
+            self.assertEqual(loaded.count(), 4)
+            self.assertIsInstance(loaded._matrix, np.memmap)
+            self.assertEqual(loaded.query("stuck frustrated", top_k=1)[0]["id"], "part_4_pain")
+            self.assertEqual(loaded.query("too expensive", top_k=1)[0]["metadata"], CHUNKS[0]["metadata"])
+
+    def test_persisting_needs_a_stable_embedding_model(self):
+        with tempfile.TemporaryDirectory() as persist_dir:
+            with self.assertRaises(ValueError):
+                NumpyEmbeddingStore(persist_dir=persist_dir, embedding_fn=bag_of_words)
+
+            NumpyEmbeddingStore(persist_dir=persist_dir, embedding_fn=bag_of_words, embedding_model="bow").add_chunks(
+                CHUNKS
+            )
+            with self.assertRaisesRegex(ValueError, "was built with bow"):
+                NumpyEmbeddingStore(persist_dir=persist_dir, embedding_fn=bag_of_words, embedding_model="bow-v2")
+
+    def test_query_by_vector_is_fast(self):
+        vector = self.store.embed_query("homelab program")
+        self.store.query_by_vector(vector)
+        start = time.perf_counter()
+        for _ in range(1000):
+            self.store.query_by_vector(vector, top_k=3)
+        per_query_us = (time.perf_counter() - start) * 1e6 / 1000
+        self.assertLess(per_query_us, 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for the zero-LLM objection fast path.
+
+A clear objection whose top semantic hit is a specific objection_* chunk
+gets the script's rebuttal immediately; the LLM analysis still follows.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.chunker import extract_rebuttal  # noqa: E402
+from rag.retriever import ScriptRetriever  # noqa: E402
+from rag.stage_detector import StageDetector  # noqa: E402
+
+TOO_EXPENSIVE = {
+    "id": "objection_too_expensive",
+    "text": '#### Too Expensive\n- Say: "Totally hear you. Expensive compared to what?"\n- Then stay quiet.',
+    "metadata": {"section": "Objection: Too Expensive", "type": "objection", "source": "kubecraft_script"},
+    "distance": 0.2,
+}
+
+
+class FakeStore:
+    def __init__(self, hits):
+        self.hits = hits
+
+    def query(self, text, top_k=3, where=None):
+        return self.hits[:top_k]
+
+
+class TestExtractRebuttal(unittest.TestCase):
+    def test_prefers_quoted_line(self):
+        self.assertEqual(extract_rebuttal(TOO_EXPENSIVE["text"]), "Totally hear you. Expensive compared to what?")
+
+    def test_falls_back_to_first_content_line(self):
+        text = "#### Need Time\n**Response:** What specifically do you need to think through?"
+        self.assertEqual(extract_rebuttal(text), "What specifically do you need to think through?")
+
+
+class TestMatchObjection(unittest.TestCase):
+    def test_clear_objection_returns_script_rebuttal(self):
+        retriever = ScriptRetriever(FakeStore([TOO_EXPENSIVE]), StageDetector(), [])
+        match = retriever.match_objection("That's too expensive, I need to think about it")
+
+        self.assertEqual(match["id"], "objection_too_expensive")
+        self.assertEqual(match["objection"], "Too Expensive")
+        self.assertIn("compared to what", match["rebuttal"])
+        self.assertIsNone(retriever.last_stage, "Fast path must not disturb stage continuity")
+
+    def test_non_objection_or_generic_hit_is_ignored(self):
+        retriever = ScriptRetriever(FakeStore([TOO_EXPENSIVE]), StageDetector(), [])
+        self.assertIsNone(retriever.match_objection("What motivated you to book this call today?"))
+
+        generic = dict(TOO_EXPENSIVE, id="objection_core_principle")
+        retriever = ScriptRetriever(FakeStore([generic]), StageDetector(), [])
+        self.assertIsNone(retriever.match_objection("That's too expensive, I need to think about it"))
+
+
+class TestOrchestratorFastPath(unittest.TestCase):
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_fast_suggestion_is_sent_before_queueing_llm_analysis(self):
+        from src.realtime.analysis_orchestrator import AnalysisOrchestrator, StreamingAnalyzer
+
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+        analyzer.retriever = ScriptRetriever(FakeStore([TOO_EXPENSIVE]), StageDetector(), [])
+        fast = []
+        delivered = threading.Event()
+
+        def on_fast_path(suggestion):
+            fast.append(suggestion)
+            delivered.set()
+
+        orchestrator = AnalysisOrchestrator(analyzer=analyzer, on_result=MagicMock(), on_fast_path=on_fast_path)
+
+        orchestrator.submit_analysis("That's too expensive, I need to think about it", "")
+
+        self.assertTrue(delivered.wait(2))
+        self.assertEqual(len(fast), 1)
+        self.assertEqual(fast[0].chunk_id, "objection_too_expensive")
+        self.assertLess(fast[0].latency_ms, 1000)
+        self.assertEqual(orchestrator.queue.qsize(), 1, "LLM analysis still runs afterwards")
+        self.assertEqual(orchestrator.guidance_latency_stats()["fast_path"]["count"], 1)
+
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_matching_does_not_block_submit(self):
+        from src.realtime.analysis_orchestrator import AnalysisOrchestrator, StreamingAnalyzer
+
+        release = threading.Event()
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+        analyzer.fast_path_suggestion = lambda text: release.wait(2) and None
+        orchestrator = AnalysisOrchestrator(analyzer=analyzer, on_result=MagicMock(), on_fast_path=MagicMock())
+
+        start = time.perf_counter()
+        orchestrator.submit_analysis("That's too expensive, I need to think about it", "")
+        elapsed = time.perf_counter() - start
+        release.set()
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(orchestrator.queue.qsize(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
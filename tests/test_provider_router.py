@@ -0,0 +1,241 @@
+"""
+Tests for latency-aware provider routing and circuit breaking.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.provider_router import (  # noqa: E402
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    ProviderRouter,
+    RouteTarget,
+    build_router_from_env,
+)
+
+LOCAL = RouteTarget(provider="local", base_url="http://local/v1", api_key="not-needed", model="phi")
+CLOUD = RouteTarget(provider="gemini", base_url="http://cloud/v1", api_key="key", model="flash")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record_failure(now=100)
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure(now=101)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.available(now=105))
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure(now=100)
+
+        self.assertTrue(breaker.available(now=111))
+        breaker.on_dispatch(now=111)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.available(now=112), "Only one probe while half-open")
+
+        breaker.record_failure(now=113)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_successful_probe_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure(now=100)
+        breaker.on_dispatch(now=100)
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.consecutive_failures, 0)
+
+
+class TestProviderRouter(unittest.TestCase):
+    def test_routes_to_lowest_latency_target(self):
+        router = ProviderRouter([LOCAL, CLOUD])
+        router.record_success(LOCAL, ttft_ms=1800, tokens_per_sec=20)
+        router.record_success(CLOUD, ttft_ms=300, tokens_per_sec=80)
+
+        self.assertEqual(router.select(), CLOUD)
+
+    def test_unmeasured_targets_are_explored(self):
+        router = ProviderRouter([LOCAL, CLOUD])
+        router.record_success(LOCAL, ttft_ms=200)
+
+        self.assertEqual(router.select(), CLOUD)
+        self.assertEqual(router.snapshot()["decisions"][-1]["reason"], "explore")
+
+    def test_open_breaker_reroutes(self):
+        router = ProviderRouter([LOCAL, CLOUD], failure_threshold=2, reset_timeout=60)
+        router.record_success(LOCAL, ttft_ms=100)
+        router.record_success(CLOUD, ttft_ms=900)
+        router.record_failure(LOCAL, TimeoutError())
+        router.record_failure(LOCAL, TimeoutError())
+
+        self.assertEqual(router.select(), CLOUD)
+        snapshot = router.snapshot()
+        self.assertEqual(snapshot["targets"][0]["breaker"], OPEN)
+        self.assertEqual(snapshot["targets"][1]["ttft_histogram"]["le_1000"], 1)
+
+    def test_peek_does_not_dispatch(self):
+        router = ProviderRouter([CLOUD], failure_threshold=1, reset_timeout=0)
+        router.record_failure(CLOUD, TimeoutError())
+
+        self.assertEqual(router.peek(), CLOUD)
+        snapshot = router.snapshot()
+        self.assertEqual(snapshot["targets"][0]["breaker"], OPEN)
+        self.assertEqual(snapshot["decisions"], [])
+
+    def test_select_skips_excluded_targets(self):
+        router = ProviderRouter([LOCAL, CLOUD])
+        router.record_success(LOCAL, ttft_ms=100)
+        router.record_success(CLOUD, ttft_ms=900)
+
+        self.assertEqual(router.select(exclude={LOCAL.name}), CLOUD)
+        with self.assertRaises(ValueError):
+            router.select(exclude={LOCAL.name, CLOUD.name})
+
+    def test_build_from_env_skips_unconfigured_providers(self):
+        env = {"LLM_ROUTER_PROVIDERS": "local,gemini"}
+        with patch.dict(os.environ, env, clear=False):
+            os.environ.pop("GEMINI_API_KEY", None)
+            router = build_router_from_env()
+
+        self.assertEqual([t.provider for t in router.targets], ["local"])
+
+
+class TestAnalyzerRouting(unittest.TestCase):
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_analyze_with_fallback_records_ttft_for_routed_target(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        chunk = MagicMock()
+        chunk.choices = [MagicMock(delta=MagicMock(content='{"suggestion": "Ask"}'))]
+        routed_client = MagicMock()
+        routed_client.chat.completions.create.return_value = iter([chunk])
+
+        router = ProviderRouter([CLOUD])
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://default/v1", model="default", router=router)
+        models = []
+        with patch("src.realtime.analysis_orchestrator.get_openai_client", return_value=routed_client):
+            analyzer.analyze_with_fallback("hello", on_chunk=lambda d, a, m: models.append(m))
+
+        self.assertEqual(routed_client.chat.completions.create.call_args.kwargs["model"], "flash")
+        self.assertEqual(models, ["flash"])
+        self.assertEqual(router.snapshot()["targets"][0]["samples"], 1)
+
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_provider_errors_count_against_breaker(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        failing_client = MagicMock()
+        failing_client.chat.completions.create.side_effect = ConnectionError("down")
+        router = ProviderRouter([CLOUD], failure_threshold=1)
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://default/v1", model="default", router=router)
+
+        with patch("src.realtime.analysis_orchestrator.get_openai_client", return_value=failing_client):
+            with self.assertRaises(ConnectionError):
+                analyzer.analyze_with_fallback("hello")
+
+        self.assertEqual(router.snapshot()["targets"][0]["breaker"], OPEN)
+
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_late_primary_success_does_not_close_breaker(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        release = threading.Event()
+        finished = threading.Event()
+
+        def slow_stream():
+            release.wait(2)
+            chunk = MagicMock()
+            chunk.choices = [MagicMock(delta=MagicMock(content='{"suggestion": "Ask"}'))]
+            yield chunk
+            finished.set()
+
+        slow_client = MagicMock()
+        slow_client.chat.completions.create.side_effect = lambda **kwargs: slow_stream()
+        router = ProviderRouter([CLOUD], failure_threshold=1)
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://default/v1", model="default", router=router)
+
+        with patch("src.realtime.analysis_orchestrator.get_openai_client", return_value=slow_client):
+            with self.assertRaises(TimeoutError):
+                analyzer.analyze_with_fallback("hello", timeout=0.05)
+            release.set()
+            self.assertTrue(finished.wait(2))
+            time.sleep(0.05)
+
+        target = router.snapshot()["targets"][0]
+        self.assertEqual(target["breaker"], OPEN)
+        self.assertEqual(target["errors"], 1)
+        self.assertEqual(target["samples"], 0)
+
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_timed_out_primary_falls_back_to_next_routed_target(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        release = threading.Event()
+
+        def slow_stream():
+            release.wait(2)
+            return iter([])
+
+        chunk = MagicMock()
+        chunk.choices = [MagicMock(delta=MagicMock(content='{"suggestion": "Ask"}'))]
+        slow_client = MagicMock()
+        slow_client.chat.completions.create.side_effect = lambda **kwargs: slow_stream()
+        fast_client = MagicMock()
+        fast_client.chat.completions.create.return_value = iter([chunk])
+        clients = {LOCAL.base_url: slow_client, CLOUD.base_url: fast_client}
+
+        router = ProviderRouter([LOCAL, CLOUD], failure_threshold=1)
+        router.record_success(LOCAL, ttft_ms=100)
+        router.record_success(CLOUD, ttft_ms=900)
+        analyzer = StreamingAnalyzer(
+            api_key="k", base_url="http://default/v1", model="default", fallback_model="default-small", router=router
+        )
+        models = []
+        with patch(
+            "src.realtime.analysis_orchestrator.get_openai_client",
+            side_effect=lambda base_url, api_key: clients[base_url],
+        ):
+            result = analyzer.analyze_with_fallback("hello", timeout=0.05, on_chunk=lambda d, a, m: models.append(m))
+        release.set()
+
+        self.assertEqual(result, '{"suggestion": "Ask"}')
+        self.assertEqual(models, ["flash"])
+        local, cloud = router.snapshot()["targets"]
+        self.assertEqual(local["breaker"], OPEN)
+        self.assertEqual(cloud["samples"], 2)
+        self.assertEqual(router.snapshot()["decisions"][-1]["target"], CLOUD.name)
+
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_warmup_leaves_half_open_probe_to_live_requests(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        router = ProviderRouter([CLOUD], failure_threshold=1, reset_timeout=0)
+        router.record_failure(CLOUD, TimeoutError())
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://default/v1", model="default", router=router)
+        analyzer.gatekeeper = None
+
+        with (
+            patch("src.realtime.analysis_orchestrator.get_openai_client", return_value=MagicMock()),
+            patch("src.realtime.analysis_orchestrator.get_gatekeeper", return_value=None),
+            patch("src.realtime.analysis_orchestrator.warm_connection"),
+        ):
+            analyzer.warmup()
+
+        self.assertEqual(router.snapshot()["targets"][0]["breaker"], OPEN)
+        self.assertEqual(router.select(), CLOUD)
+        self.assertEqual(router.snapshot()["targets"][0]["breaker"], HALF_OPEN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Tests for the process-wide query-embedding cache.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.embeddings import (  # noqa: E402
+    QueryCacheStats,
+    QueryEmbeddingCache,
+    normalize_query_text,
+    reset_query_embedding_cache,
+)
+from rag.numpy_store import NumpyEmbeddingStore  # noqa: E402
+from rag.retriever import ScriptRetriever  # noqa: E402
+from rag.stage_detector import StageDetector  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return [float(len(text)), 1.0]
+
+
+class TestQueryEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60, clock=self.clock)
+        self.embed = CountingEmbedder()
+
+    def test_normalized_text_shares_one_entry(self):
+        self.assertEqual(normalize_query_text("  It's TOO   expensive!! "), "it s too expensive")
+
+        first = self.cache.get_or_embed("model", "It's too expensive.", self.embed)
+        second = self.cache.get_or_embed("model", "it's   TOO expensive", self.embed)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.embed.calls), 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (1, 1, 0.5))
+
+    def test_models_do_not_share_vectors(self):
+        self.cache.get_or_embed("model-a", "price", self.embed)
+        self.cache.get_or_embed("model-b", "price", self.embed)
+        self.assertEqual(len(self.embed.calls), 2)
+
+    def test_lru_eviction_and_ttl(self):
+        for text in ("one", "two", "one", "three"):
+            self.cache.get_or_embed("model", text, self.embed)
+        self.assertEqual(self.cache.stats()["evicted"], 1)
+
+        self.cache.get_or_embed("model", "one", self.embed)
+        self.assertEqual(self.embed.calls.count("two"), 1, "Least recently used entry was evicted")
+        self.cache.get_or_embed("model", "two", self.embed)
+        self.assertEqual(self.embed.calls.count("two"), 2)
+
+        self.clock.now = 61
+        self.cache.get_or_embed("model", "two", self.embed)
+        self.assertEqual(self.embed.calls.count("two"), 3)
+        self.assertEqual(self.cache.stats()["expired"], 1)
+
+    def test_hits_report_embedding_time_saved(self):
+        session = QueryCacheStats()
+        self.cache.get_or_embed("model", "price", self.embed, session)
+        for _ in range(3):
+            self.cache.get_or_embed("model", "Price?", self.embed, session)
+
+        stats = session.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (3, 1))
+        self.assertAlmostEqual(stats["saved_ms"], 3 * stats["embed_ms"], delta=0.2)
+
+    def test_sessions_count_only_their_own_lookups(self):
+        first, second = QueryCacheStats(), QueryCacheStats()
+        self.cache.get_or_embed("model", "price", self.embed, first)
+        self.cache.get_or_embed("model", "price", self.embed, second)
+        self.cache.get_or_embed("model", "budget", self.embed, second)
+
+        self.assertEqual((first.hits, first.misses), (0, 1))
+        self.assertEqual((second.hits, second.misses), (1, 1))
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_disabled_cache_always_embeds(self):
+        cache = QueryEmbeddingCache(max_entries=0)
+        cache.get_or_embed("model", "price", self.embed)
+        cache.get_or_embed("model", "price", self.embed)
+        self.assertEqual(len(self.embed.calls), 2)
+
+
+class TestStoresShareCache(unittest.TestCase):
+    def setUp(self):
+        reset_query_embedding_cache()
+        self.addCleanup(reset_query_embedding_cache)
+
+    def test_stores_with_the_same_model_embed_a_query_once(self):
+        calls = []
+
+        def embed(texts):
+            calls.extend(texts)
+            return [[1.0, float(len(text))] for text in texts]
+
+        chunk = {"id": "c1", "text": "price", "metadata": {"type": "objection"}}
+        script, methodology = NumpyEmbeddingStore(embedding_fn=embed), NumpyEmbeddingStore(embedding_fn=embed)
+        script.add_chunks([chunk])
+        methodology.add_chunks([chunk])
+        calls.clear()
+
+        script.query("That's too expensive.")
+        methodology.query("that's too expensive")
+        self.assertEqual(calls, ["That's too expensive."])
+
+    def test_session_retrievers_count_their_own_cache_use(self):
+        store = NumpyEmbeddingStore(embedding_fn=lambda texts: [[1.0, float(len(text))] for text in texts])
+        store.add_chunks([{"id": "part_9_pitch", "text": "price", "metadata": {"part_number": 9}}])
+        sessions = [ScriptRetriever(store, StageDetector(), []) for _ in range(2)]
+        for retriever in sessions:
+            retriever.embedding_stats = QueryCacheStats()
+
+        sessions[0].retrieve("hmm", top_k=1)
+        sessions[1].retrieve("hmm", top_k=1)
+        sessions[1].retrieve("ok then", top_k=1)
+
+        self.assertEqual((sessions[0].embedding_stats.hits, sessions[0].embedding_stats.misses), (0, 1))
+        self.assertEqual((sessions[1].embedding_stats.hits, sessions[1].embedding_stats.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the process-wide RAG pipeline shared across sessions.
+"""
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from rag import pipeline as rag_pipeline  # noqa: E402
+from rag.pipeline import RagPipeline, get_rag_pipeline, reset_rag_pipeline  # noqa: E402
+from rag.stage_detector import StageDetector  # noqa: E402
+
+
+class FakeStore:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, text, top_k=3, where=None):
+        self.queries.append(text)
+        return [{"id": "part_9_pitch", "text": "Pitch section", "metadata": {"source": "kubecraft_script"}}]
+
+    def count(self):
+        return 1
+
+
+def fake_pipeline() -> RagPipeline:
+    return RagPipeline(chunks=[], store=FakeStore(), detector=StageDetector())
+
+
+class TestSharedPipeline(unittest.TestCase):
+    def setUp(self):
+        reset_rag_pipeline()
+        self.addCleanup(reset_rag_pipeline)
+
+    def test_built_once_and_sessions_get_independent_retrievers(self):
+        with patch.object(rag_pipeline, "build_rag_pipeline", side_effect=fake_pipeline) as build:
+            first = get_rag_pipeline().session_retriever()
+            second = get_rag_pipeline().session_retriever()
+
+        build.assert_called_once()
+        self.assertIs(first.store, second.store)
+        first.retrieve("The investment is $3,500, let's get started")
+        self.assertIsNotNone(first.last_stage)
+        self.assertIsNone(second.last_stage, "Stage continuity is per session")
+
+    def test_failed_build_disables_retrieval_without_retrying(self):
+        with patch.object(rag_pipeline, "build_rag_pipeline", side_effect=RuntimeError("no chromadb")) as build:
+            self.assertIsNone(get_rag_pipeline())
+            self.assertIsNone(get_rag_pipeline())
+
+        build.assert_called_once()
+        self.assertEqual(rag_pipeline.rag_pipeline_state(), "failed")
+
+
+class TestAnalyzerSessionStart(unittest.TestCase):
+    def setUp(self):
+        reset_rag_pipeline()
+        self.addCleanup(reset_rag_pipeline)
+
+    def test_session_start_does_not_wait_for_rag_build(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        release = threading.Event()
+
+        def slow_build():
+            release.wait(5)
+            return fake_pipeline()
+
+        with (
+            patch("src.realtime.analysis_orchestrator.USE_RAG", True),
+            patch.object(rag_pipeline, "build_rag_pipeline", side_effect=slow_build),
+        ):
+            analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+            self.assertIsNone(analyzer.retriever)
+            self.assertEqual(analyzer._retrieve_context_sections("pitch", ""), [])
+
+            release.set()
+            get_rag_pipeline(timeout=5)
+            sections = analyzer._retrieve_context_sections("Can you tell me more about the program?", "")
+
+        self.assertEqual(len(sections), 1)
+        self.assertIn("Pitch section", sections[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for speculative recommendation precomputation.
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.recommendation_cache import RecommendationPrecomputer  # noqa: E402
+
+
+class RecordingRecommender:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, summary, key_points, stage, transcript):
+        self.calls.append((summary, stage, transcript))
+        return f'{{"stage": "{stage}", "questions": ["q{len(self.calls)}"]}}'
+
+
+def wait_idle(precomputer: RecommendationPrecomputer) -> None:
+    for _ in range(200):
+        if not precomputer._in_flight:
+            return
+        time.sleep(0.01)
+
+
+class TestRecommendationPrecomputer(unittest.TestCase):
+    def setUp(self):
+        self.recommender = RecordingRecommender()
+        self.precomputer = RecommendationPrecomputer(
+            recommend_fn=self.recommender,
+            get_transcript=lambda: "Prospect: we lose deals",
+            max_per_minute=5,
+            stale_after_lines=2,
+        )
+
+    def test_new_summary_is_precomputed_and_served_from_cache(self):
+        self.precomputer.update_summary(1, "Prospect is frustrated", ["pain"], "discovery")
+        wait_idle(self.precomputer)
+
+        cached = self.precomputer.get(1, "discovery")
+        self.assertIsNotNone(cached)
+        self.assertIn('"discovery"', cached.content)
+        self.assertEqual(len(self.recommender.calls), 1)
+        self.assertIsNone(self.precomputer.get(2, "discovery"), "Other summary versions miss")
+
+    def test_stage_change_precomputes_for_new_stage(self):
+        self.precomputer.update_summary(1, "Summary", [], "discovery")
+        wait_idle(self.precomputer)
+        self.precomputer.update_stage("objection_handling")
+        wait_idle(self.precomputer)
+
+        self.assertIsNotNone(self.precomputer.get(1, "objection_handling"))
+        self.assertEqual([c[1] for c in self.recommender.calls], ["discovery", "objection_handling"])
+
+    def test_newer_transcript_invalidates_and_recomputes(self):
+        self.precomputer.update_summary(1, "Summary", [], "discovery")
+        wait_idle(self.precomputer)
+        first = self.precomputer.get(1, "discovery")
+
+        for _ in range(3):
+            self.precomputer.note_transcript()
+        wait_idle(self.precomputer)
+
+        refreshed = self.precomputer.get(1, "discovery")
+        self.assertIsNotNone(refreshed)
+        self.assertNotEqual(first.content, refreshed.content)
+        self.assertEqual(len(self.recommender.calls), 2)
+
+    def test_tracked_stage_keys_later_summaries(self):
+        self.precomputer.update_stage("pitch")
+        self.precomputer.update_summary(1, "Summary", [], "discovery")
+        wait_idle(self.precomputer)
+
+        self.assertEqual(self.precomputer.stage, "pitch")
+        self.assertIsNotNone(self.precomputer.get(1, "pitch"))
+        self.assertEqual([c[1] for c in self.recommender.calls], ["pitch"])
+
+    def test_per_minute_budget_caps_speculative_calls(self):
+        precomputer = RecommendationPrecomputer(
+            recommend_fn=self.recommender, get_transcript=lambda: "", max_per_minute=1
+        )
+        precomputer.update_summary(1, "First", [], "discovery")
+        wait_idle(precomputer)
+        precomputer.update_summary(2, "Second", [], "discovery")
+        wait_idle(precomputer)
+
+        self.assertEqual(len(self.recommender.calls), 1)
+        self.assertEqual(precomputer.stats()["skipped_for_budget"], 1)
+
+    def test_on_demand_result_is_stored(self):
+        self.precomputer.store(3, "pitch", '{"questions": []}', latency_ms=900)
+        cached = self.precomputer.get(3, "pitch")
+        self.assertFalse(cached.speculative)
+
+
+class TestStageTrackingFeedsPrecomputer(unittest.TestCase):
+    def test_tracker_stage_change_precomputes_for_stage_hint(self):
+        from src.web.app import _stage_tracking
+
+        recommender = RecordingRecommender()
+        precomputer = RecommendationPrecomputer(recommend_fn=recommender, get_transcript=lambda: "", max_per_minute=5)
+        precomputer.update_summary(1, "Summary", [], "problem_development")
+        wait_idle(precomputer)
+
+        analyzer = MagicMock()
+        analyzer.observe_segment.return_value = {
+            "stage": "part_9_pitch",
+            "part_number": 9,
+            "stage_hint": "pitch",
+            "confidence": 0.8,
+        }
+        sent = []
+        on_new_segment = _stage_tracking(analyzer, sent.append, on_stage=precomputer.update_stage)
+        on_new_segment("So here is how the program works")
+        on_new_segment("It runs for twelve weeks")
+        wait_idle(precomputer)
+
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(precomputer.stage, "pitch")
+        self.assertIsNotNone(precomputer.get(1, "pitch"))
+        self.assertEqual([c[1] for c in recommender.calls], ["problem_development", "pitch"])
+
+    def test_objection_segment_precomputes_for_objection_blueprint(self):
+        from src.rag.stage_detector import StageDetector
+        from src.rag.stage_tracker import StreamingStageTracker
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+        from src.realtime.prompts import SEMANTIC_BLUEPRINTS
+        from src.web.app import _stage_tracking
+
+        recommender = RecordingRecommender()
+        precomputer = RecommendationPrecomputer(recommend_fn=recommender, get_transcript=lambda: "", max_per_minute=5)
+        precomputer.update_summary(1, "Summary", [], "pitch")
+        wait_idle(precomputer)
+
+        detector = StageDetector()
+        analyzer = StreamingAnalyzer.__new__(StreamingAnalyzer)
+        analyzer.retriever = SimpleNamespace(detector=detector, observe_segment=StreamingStageTracker(detector).observe)
+        analyzer._rag_pending = False
+        sent = []
+        on_new_segment = _stage_tracking(analyzer, sent.append, on_stage=precomputer.update_stage)
+        on_new_segment("Honestly it's too expensive, I need to talk to my wife and think about it")
+        wait_idle(precomputer)
+
+        self.assertEqual(sent[0]["stage"], "objection_handling")
+        self.assertEqual(sent[0]["stage_hint"], "objection")
+        self.assertIn("objection", SEMANTIC_BLUEPRINTS)
+        self.assertEqual(precomputer.stage, "objection")
+        self.assertIsNotNone(precomputer.get(1, "objection"))
+        self.assertEqual([c[1] for c in recommender.calls], ["pitch", "objection"])
+
+
+if __name__ == "__main__":
+    unittest.main()
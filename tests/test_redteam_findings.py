@@ -128,7 +128,7 @@ class TestAnalyzeNoneContent(unittest.TestCase):
         from src.realtime.analysis_orchestrator import StreamingAnalyzer
 
         # Create analyzer with mock client
-        with patch("src.realtime.analysis_orchestrator.OpenAI"):
+        with patch("src.realtime.analysis_orchestrator.get_openai_client"):
             analyzer = StreamingAnalyzer(
                 api_key="test-key",
                 base_url="http://localhost:8080/v1",
@@ -0,0 +1,251 @@
+"""
+Tests for speculative retrieval prefetch as transcript segments arrive.
+"""
+
+import json
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.buffer_manager import DualBufferManager  # noqa: E402
+from src.realtime.retrieval_prefetch import RetrievalPrefetcher  # noqa: E402
+
+
+class GatedRetriever:
+    """Retrieval that blocks until released, recording what it was asked for."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, active_text, context_text):
+        self.calls.append(active_text)
+        self.release.wait(2)
+        if active_text == "fails":
+            raise ConnectionError("store unavailable")
+        return [f"sections for {active_text}"]
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestRetrievalPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.retrieve = GatedRetriever()
+        self.prefetcher = RetrievalPrefetcher(self.retrieve, wait_ms=20)
+        self.addCleanup(self.prefetcher.close)
+
+    def test_nothing_prefetched_returns_none(self):
+        self.assertIsNone(self.prefetcher.sections())
+        self.assertEqual(self.prefetcher.stats()["miss"], 1)
+
+    def test_completed_prefetch_is_used(self):
+        self.prefetcher.submit("It's too expensive", "")
+        self.assertTrue(wait_for(lambda: self.prefetcher._latest is not None))
+
+        self.assertEqual(self.prefetcher.sections(), ["sections for It's too expensive"])
+        self.assertEqual(self.prefetcher.stats()["fresh"], 1)
+
+    def test_slow_newest_retrieval_falls_back_to_last_sections(self):
+        self.prefetcher.submit("first", "")
+        self.assertTrue(wait_for(lambda: self.prefetcher._latest is not None))
+        self.retrieve.release.clear()
+        self.prefetcher.submit("second", "")
+
+        start = time.perf_counter()
+        sections = self.prefetcher.sections()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.assertEqual(sections, ["sections for first"])
+        self.assertLess(elapsed_ms, 200)
+        self.assertEqual(self.prefetcher.stats()["stale"], 1)
+        self.retrieve.release.set()
+
+    def test_failed_newest_retrieval_does_not_reuse_older_sections(self):
+        self.prefetcher.submit("first", "")
+        self.assertTrue(wait_for(lambda: self.prefetcher._latest is not None))
+        self.prefetcher.submit("fails", "")
+        self.assertTrue(wait_for(lambda: self.prefetcher.stats()["failed"] == 1))
+
+        self.assertIsNone(self.prefetcher.sections())
+        self.assertEqual(self.prefetcher.stats()["miss"], 1)
+
+    def test_sections_for_another_context_are_not_used(self):
+        self.prefetcher.submit("It's too expensive", "a long earlier conversation")
+        self.assertTrue(wait_for(lambda: self.prefetcher._latest is not None))
+
+        self.assertIsNone(self.prefetcher.sections("conversation"))
+        self.assertEqual(self.prefetcher.sections("a long earlier conversation"), ["sections for It's too expensive"])
+        self.assertEqual((self.prefetcher.stats()["miss"], self.prefetcher.stats()["fresh"]), (1, 1))
+
+    def test_burst_of_segments_retrieves_latest_payload_only(self):
+        self.retrieve.release.clear()
+        self.prefetcher.submit("one", "")
+        self.assertTrue(wait_for(lambda: self.retrieve.calls == ["one"]))
+        for text in ("two", "three", "four"):
+            self.prefetcher.submit(text, "")
+        self.retrieve.release.set()
+
+        self.assertTrue(wait_for(lambda: self.prefetcher._latest and self.prefetcher._latest.active_text == "four"))
+        self.assertEqual(self.retrieve.calls, ["one", "four"])
+
+    def test_old_sections_are_not_reused(self):
+        clock = MagicMock(return_value=0.0)
+        prefetcher = RetrievalPrefetcher(self.retrieve, wait_ms=20, max_age_seconds=30, clock=clock)
+        self.addCleanup(prefetcher.close)
+        prefetcher.submit("first", "")
+        self.assertTrue(wait_for(lambda: prefetcher._latest is not None))
+
+        clock.return_value = 31.0
+        self.assertIsNone(prefetcher.sections())
+
+
+class TestBufferSegmentCallback(unittest.TestCase):
+    def test_completed_segments_are_reported_before_trigger(self):
+        events = []
+        manager = DualBufferManager(
+            on_analysis_ready=lambda active, context: events.append(("trigger", active)),
+            on_segment_completed=lambda active, context: events.append(("segment", active)),
+        )
+        manager.on_transcript_chunk("Hello", [{"text": "Hello", "start": 0.0, "end": 0.5, "completed": False}])
+        self.assertEqual(events, [])
+
+        manager.on_transcript_chunk(
+            "Hello there. Price is",
+            [
+                {"text": "Hello there.", "start": 0.0, "end": 1.0, "completed": True},
+                {"text": "Price is", "start": 1.0, "end": 1.5, "completed": False},
+            ],
+        )
+        self.assertEqual(events[0], ("segment", "Hello there. Price is"))
+
+
+class TestAnalyzerUsesPrefetch(unittest.TestCase):
+    def test_analyze_uses_prefetched_sections_instead_of_retrieving(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+        analyzer.retriever = MagicMock()
+        prefetch_retriever = analyzer.retriever.fork.return_value
+        prefetch_retriever.retrieve_with_metadata.return_value = [
+            {"text": "Handle price objections with value", "metadata": {"source": "script"}}
+        ]
+        analyzer.retrieval_prefetcher = RetrievalPrefetcher(analyzer._prefetch_retrieve)
+        self.addCleanup(analyzer.retrieval_prefetcher.close)
+
+        analyzer.prefetch_retrieval("It's too expensive", "")
+        self.assertTrue(wait_for(lambda: analyzer.retrieval_prefetcher._latest is not None))
+        self.assertEqual(prefetch_retriever.retrieve_with_metadata.call_count, 1)
+
+        chunk = MagicMock()
+        chunk.choices = [MagicMock(delta=MagicMock(content=json.dumps({"suggestion": "Ask about value"})))]
+        analyzer.client = MagicMock()
+        analyzer.client.chat.completions.create.return_value = iter([chunk])
+        analyzer.analyze("It's too expensive")
+
+        self.assertEqual(prefetch_retriever.retrieve_with_metadata.call_count, 1)
+        analyzer.retriever.retrieve_with_metadata.assert_not_called()
+        system_prompt = analyzer.client.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+        self.assertIn("Handle price objections with value", system_prompt)
+
+    def test_shortened_context_retrieves_inline(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+        analyzer.retriever = MagicMock()
+        analyzer.retriever.retrieve_with_metadata.return_value = []
+        analyzer.retriever.fork.return_value.retrieve_with_metadata.return_value = []
+        analyzer.retrieval_prefetcher = RetrievalPrefetcher(analyzer._prefetch_retrieve)
+        self.addCleanup(analyzer.retrieval_prefetcher.close)
+        context = "We talked about the team and their current setup. " * 20
+
+        analyzer.prefetch_retrieval("It's too expensive", context)
+        self.assertTrue(wait_for(lambda: analyzer.retrieval_prefetcher._latest is not None))
+        analyzer.client = MagicMock()
+        analyzer.client.chat.completions.create.return_value = iter([])
+        analyzer.analyze("It's too expensive", context, max_context_chars=200)
+
+        self.assertEqual(analyzer.retriever.retrieve_with_metadata.call_count, 1)
+        self.assertEqual(len(analyzer.retriever.retrieve_with_metadata.call_args.args[1]), 200)
+
+    def test_fallback_attempt_reuses_the_request_sections(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m", fallback_model="fast")
+        analyzer.retriever = MagicMock()
+        analyzer.retriever.retrieve_with_metadata.return_value = []
+        analyzer.retrieval_prefetcher = RetrievalPrefetcher(analyzer._prefetch_retrieve)
+        self.addCleanup(analyzer.retrieval_prefetcher.close)
+        prompts = []
+
+        def analyze(active_text, context_text="", model=None, sections=None, **kwargs):
+            prompts.append(sections)
+            if model == "m":
+                time.sleep(0.2)
+            return "{}"
+
+        analyzer.analyze = analyze
+        analyzer.analyze_with_fallback("It's too expensive", timeout=0.05)
+
+        self.assertEqual(prompts, [[], []])
+        stats = analyzer.retrieval_prefetcher.stats()
+        self.assertEqual(stats["miss"] + stats["fresh"] + stats["waited"] + stats["stale"], 1)
+        self.assertEqual(analyzer.retriever.retrieve_with_metadata.call_count, 1)
+
+
+class TestOrchestratorPrefetch(unittest.TestCase):
+    def setUp(self):
+        from src.realtime.analysis_orchestrator import AnalysisOrchestrator
+        from src.realtime.degradation import LEVELS, DegradationController
+
+        self.analyzer = MagicMock(fast_model_available=True)
+        self.controller = DegradationController()
+        self.levels = LEVELS
+        self.orchestrator = AnalysisOrchestrator(
+            self.analyzer, on_result=lambda result: None, degradation=self.controller
+        )
+
+    def test_no_prefetch_while_rag_is_degraded_off(self):
+        self.controller.level = self.levels.index("no_rag")
+        self.orchestrator.prefetch_retrieval("It's too expensive", "earlier")
+        self.analyzer.prefetch_retrieval.assert_not_called()
+
+    def test_prefetch_resumes_once_rag_is_back(self):
+        self.controller.level = self.levels.index("fallback_model")
+        self.orchestrator.prefetch_retrieval("It's too expensive", "earlier")
+        self.analyzer.prefetch_retrieval.assert_called_once_with("It's too expensive", "earlier")
+
+
+class TestPrefetchRetrieverIsolation(unittest.TestCase):
+    def test_prefetch_does_not_move_session_stage_continuity(self):
+        sys.path.insert(0, str(project_root / "src"))
+        from rag.retriever import ScriptRetriever
+        from rag.stage_detector import StageDetector
+
+        store = MagicMock()
+        store.query.return_value = []
+        session = ScriptRetriever(store, StageDetector(), [])
+        session.stage_tracker = None
+        prefetch = session.fork()
+
+        prefetch.retrieve("The investment is $3,500, let's get you started with the payment")
+        self.assertEqual(prefetch.last_stage, "part_12_close")
+        self.assertIsNone(session.last_stage)
+        self.assertIs(prefetch.store, session.store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests for embedding the retrieval query once across all sources.
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.retriever import ScriptRetriever  # noqa: E402
+from rag.stage_detector import StageDetector  # noqa: E402
+
+
+class VectorStore:
+    embedding_key = "all-MiniLM-L6-v2"
+
+    def __init__(self, source, delay=0.0):
+        self.source = source
+        self.delay = delay
+        self.embedded = []
+        self.text_queries = []
+        self.vector_queries = []
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [0.1, 0.2, 0.3]
+
+    def query(self, text, top_k=3, where=None):
+        self.text_queries.append(text)
+        return self._results()
+
+    def query_by_vector(self, vector, top_k=3, where=None):
+        time.sleep(self.delay)
+        self.vector_queries.append(vector)
+        return self._results()
+
+    def _results(self):
+        return [{"id": f"{self.source}_1", "text": self.source, "metadata": {"source": self.source}, "distance": 0.2}]
+
+
+class TextOnlyStore(VectorStore):
+    embedding_key = None
+
+
+class TestQueryVectorReuse(unittest.TestCase):
+    def test_query_is_embedded_once_for_all_sources(self):
+        script, methodology = VectorStore("kubecraft_script"), VectorStore("hardly_selling_methodology")
+        retriever = ScriptRetriever(script, StageDetector(), [], sources=[methodology])
+
+        results = retriever._safe_store_query("I feel stuck in my job search", top_k=2)
+
+        self.assertEqual(len(script.embedded) + len(methodology.embedded), 1)
+        self.assertEqual(len(script.vector_queries), 1)
+        self.assertEqual(len(methodology.vector_queries), 1)
+        self.assertEqual({r["metadata"]["source"] for r in results}, {"kubecraft_script", "hardly_selling_methodology"})
+
+    def test_source_with_other_model_is_queried_by_text(self):
+        script, legacy = VectorStore("kubecraft_script"), TextOnlyStore("legacy")
+        retriever = ScriptRetriever(script, StageDetector(), [], sources=[legacy])
+
+        retriever._safe_store_query("pricing question", top_k=2)
+
+        self.assertEqual(legacy.text_queries, ["pricing question"])
+        self.assertEqual(legacy.vector_queries, [])
+
+    def test_sources_are_queried_concurrently(self):
+        stores = [VectorStore(f"source_{i}", delay=0.2) for i in range(3)]
+        retriever = ScriptRetriever(stores[0], StageDetector(), [], sources=stores[1:])
+
+        start = time.perf_counter()
+        retriever._safe_store_query("what does it cost", top_k=3)
+        self.assertLess(time.perf_counter() - start, 0.45)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests for per-session LLM warmup.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.gatekeeper import Gatekeeper  # noqa: E402
+
+
+@patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+class TestStreamingAnalyzerWarmup(unittest.TestCase):
+    def make_analyzer(self, gatekeeper=None):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m", gatekeeper=gatekeeper)
+        analyzer.client = MagicMock()
+        return analyzer
+
+    @patch("src.realtime.analysis_orchestrator.warm_connection")
+    def test_warmup_sends_static_system_prompt_with_one_token(self, warm):
+        analyzer = self.make_analyzer()
+        self.assertIsNotNone(analyzer.warmup())
+
+        kwargs = analyzer.client.chat.completions.create.call_args.kwargs
+        self.assertEqual(kwargs["max_tokens"], 1)
+        self.assertEqual(kwargs["messages"][0]["content"], analyzer.system_prompt)
+        warm.assert_called_once_with("http://fake/v1", timeout=10.0)
+        self.assertEqual(analyzer.warmup_state, "warm")
+
+    @patch("src.realtime.analysis_orchestrator.warm_connection")
+    def test_rate_limited_provider_only_warms_connection(self, warm):
+        analyzer = self.make_analyzer(gatekeeper=Gatekeeper("github", requests_per_minute=15))
+        analyzer.warmup()
+
+        analyzer.client.chat.completions.create.assert_not_called()
+        warm.assert_called_once()
+        self.assertEqual(analyzer.warmup_state, "skipped")
+
+    @patch("src.realtime.analysis_orchestrator.warm_connection")
+    def test_failed_warmup_is_non_fatal(self, warm):
+        analyzer = self.make_analyzer()
+        analyzer.client.chat.completions.create.side_effect = RuntimeError("model loading")
+
+        self.assertIsNone(analyzer.warmup())
+        self.assertEqual(analyzer.warmup_state, "failed")
+
+
+class TestFirstSuggestionStats(unittest.TestCase):
+    def test_first_suggestion_is_split_by_warmup_state(self):
+        from src.realtime import analysis_orchestrator as module
+
+        with patch.dict(module._first_suggestion_ms, {"warm": module.deque(), "cold": module.deque()}):
+            module.record_first_suggestion(400.0, warmed=True)
+            module.record_first_suggestion(1800.0, warmed=False)
+            stats = module.first_suggestion_stats()
+
+        self.assertEqual(stats["warm"], {"sessions": 1, "p50_ms": 400.0, "avg_ms": 400.0})
+        self.assertEqual(stats["cold"]["p50_ms"], 1800.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the local script-location classifier.
+"""
+
+import json
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.prompts import get_rag_guidance_prompt, get_script_guidance_prompt  # noqa: E402
+from src.realtime.stage_classifier import StageClassifier  # noqa: E402
+
+
+def make_chunk(content):
+    chunk = MagicMock()
+    chunk.choices = [MagicMock(delta=MagicMock(content=content))]
+    return chunk
+
+
+class TestStageClassifier(unittest.TestCase):
+    def test_keyword_classification_is_labeled_and_confident(self):
+        classifier = StageClassifier(min_confidence=0.3)
+        result = classifier.classify("The investment is $3,500. Let's get started with the payment.")
+
+        self.assertEqual(result.stage, "part_12_close")
+        self.assertEqual(result.label, "Part 12: Close")
+        self.assertTrue(classifier.is_confident(result))
+
+    def test_no_signal_keeps_previous_stage_with_zero_confidence(self):
+        classifier = StageClassifier()
+        classifier.classify("The investment is $3,500. Let's get started with the payment.")
+        result = classifier.classify("Mm, okay.")
+
+        self.assertEqual(result.stage, "part_12_close")
+        self.assertEqual(result.confidence, 0.0)
+        self.assertFalse(classifier.is_confident(result))
+
+
+class TestPromptSchema(unittest.TestCase):
+    def test_known_location_drops_script_location_from_schema(self):
+        for build in (lambda loc: get_script_guidance_prompt("", loc), lambda loc: get_rag_guidance_prompt([], loc)):
+            self.assertIn('"script_location"', build(None))
+            prompt = build("Part 12: Close")
+            self.assertNotIn('"script_location"', prompt)
+            self.assertIn("SCRIPT LOCATION (given", prompt)
+            self.assertIn("Part 12: Close", prompt)
+
+
+class TestAnalyzerLocation(unittest.TestCase):
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_confident_location_is_given_and_used_for_result(self):
+        from src.realtime.analysis_orchestrator import AnalysisOrchestrator, StreamingAnalyzer
+
+        analyzer = StreamingAnalyzer(api_key="k", base_url="http://fake/v1", model="m")
+        analyzer.client = MagicMock()
+        analyzer.client.chat.completions.create.side_effect = lambda **kw: iter(
+            [make_chunk(json.dumps({"key_points": [], "suggestion": "Stay silent"}))]
+        )
+        results = []
+        orchestrator = AnalysisOrchestrator(analyzer, on_result=results.append)
+        orchestrator.start()
+        try:
+            orchestrator.submit_analysis("The investment is $3,500, let's get started", "")
+            for _ in range(100):
+                if results:
+                    break
+                time.sleep(0.02)
+        finally:
+            orchestrator.shutdown()
+
+        system_prompt = analyzer.client.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+        self.assertNotIn('"script_location"', system_prompt)
+        self.assertEqual(results[0].state.script_location, "Part 12: Close")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests that the compiled keyword matcher scores stages exactly like per-keyword substring checks.
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.stage_detector import _SCALE_KEY, StageDetector  # noqa: E402
+
+SAMPLES = [
+    "Hey John, nice to meet you! How are you doing today?",
+    "On a scale of 1-10, how would you rate your linux skills?",
+    "How are you feeling about everything? Scale of 1-10?",
+    "The investment is $3,500. Let's get started.",
+    "Are you ready and willing to get started now? I'm already ready.",
+    "Let me break down step by step how the Homelab OS and JobMagnet OS work.",
+    "I need to talk to my wife about this first, it's a lot of money.",
+    "Tell me more about that.",
+    "",
+]
+
+
+def substring_stage_hits(text: str) -> dict[str, int]:
+    """The original scoring loop: one ``keyword in text`` check per keyword."""
+    text_lower = text.lower()
+    hits = {
+        stage: sum(keyword.lower() in text_lower for keyword in keywords)
+        for stage, keywords in StageDetector.STAGE_KEYWORDS.items()
+    }
+    hits[_SCALE_KEY] = sum(pattern in text_lower for pattern in StageDetector._SCALE_PATTERNS)
+    return {stage: count for stage, count in hits.items() if count}
+
+
+def random_transcripts(count: int, seed: int = 7) -> list[str]:
+    """Keyword fragments glued together with filler, so keywords overlap and nest in odd ways."""
+    rng = random.Random(seed)
+    keywords = [kw for kws in StageDetector.STAGE_KEYWORDS.values() for kw in kws] + StageDetector._SCALE_PATTERNS
+    filler = ["so", "um", "already", "the", "and", "I", "price", "you", "", " "]
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 40)):
+            word = rng.choice(keywords) if rng.random() < 0.4 else rng.choice(filler)
+            if rng.random() < 0.2:
+                word = word[rng.randint(0, len(word)) :]
+            parts.append(word.upper() if rng.random() < 0.1 else word)
+        texts.append(rng.choice([" ", "", ", "]).join(parts))
+    return texts
+
+
+class TestCompiledKeywordMatcher(unittest.TestCase):
+    def setUp(self):
+        self.detector = StageDetector()
+
+    def test_hits_match_substring_checks(self):
+        matcher = self.detector._keyword_matcher()
+        for text in SAMPLES + random_transcripts(500):
+            self.assertEqual(
+                {stage: count for stage, count in matcher.stage_hits(text.lower()).items() if count},
+                substring_stage_hits(text),
+                text,
+            )
+
+    def test_nested_keywords_all_count(self):
+        hits = self.detector._keyword_matcher().stage_hits("we are ready and willing, let's get started")
+        # "ready and willing", "ready", "willing" / "let's get started", "get started"
+        self.assertEqual(hits["part_7_now_tiedown"], 3)
+        self.assertEqual(hits["part_12_close"], 2)
+
+    def test_detect_results_unchanged(self):
+        expected = {
+            "On a scale of 1-10, how would you rate your linux skills?": "part_4_pain_problem",
+            "How are you feeling about everything? Scale of 1-10?": "part_11_temp_check",
+            "The investment is $3,500. Let's get started.": "part_12_close",
+            "That sounds too expensive, I need to think about it.": "objection_handling",
+        }
+        for text, stage in expected.items():
+            self.assertEqual(self.detector.detect(text)[0], stage)
+        self.assertEqual(
+            self.detector.detect("How long have you been dealing with this?", "part_3_why_here")[0],
+            "part_4_pain_problem",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
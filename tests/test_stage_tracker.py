@@ -0,0 +1,141 @@
+"""
+Tests for streaming stage tracking over a sliding transcript window.
+"""
+
+import random
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from rag.retriever import ScriptRetriever  # noqa: E402
+from rag.stage_detector import StageDetector  # noqa: E402
+from rag.stage_tracker import StreamingStageTracker  # noqa: E402
+
+CALL = [
+    "Hey John, nice to meet you!",
+    "How are you doing today?",
+    "What's your current role?",
+    "How long have you been there, and how is kubernetes going?",
+    "On a scale of 1-10 how are your linux skills?",
+    "The investment is $3,500.",
+    "Let's get started with the payment.",
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStreamingStageTracker(unittest.TestCase):
+    def setUp(self):
+        self.detector = StageDetector()
+
+    def test_matches_detect_on_the_window_text(self):
+        rng = random.Random(5)
+        words = " ".join(CALL * 6).split()
+        tracker = StreamingStageTracker(self.detector, window_chars=120)
+        transcript = ""
+        current = None
+        i = 0
+        while i < len(words):
+            segment = " ".join(words[i : i + rng.randint(1, 7)])
+            i += len(segment.split())
+            transcript = f"{transcript} {segment}".strip()
+            current = self.detector.detect(transcript[-120:], current_stage=current)[0]
+            self.assertEqual(tracker.observe(segment)[0], current, transcript[-120:])
+
+    def test_keyword_split_across_segments_is_found(self):
+        tracker = StreamingStageTracker(self.detector)
+        tracker.observe("Hey, nice to")
+        stage, confidence = tracker.observe("meet you")
+        self.assertEqual(stage, "part_1_open")
+        self.assertGreater(confidence, 0)
+
+    def test_hits_expire_by_characters_and_time(self):
+        tracker = StreamingStageTracker(self.detector, window_chars=40)
+        tracker.observe("The investment is $3,500.")
+        tracker.observe("x" * 60)
+        self.assertEqual(tracker.current(), ("part_12_close", 0.0))
+
+        clock = FakeClock()
+        timed = StreamingStageTracker(self.detector, window_seconds=30, clock=clock)
+        timed.observe("The investment is $3,500.")
+        self.assertGreater(timed.current()[1], 0)
+        clock.now = 31
+        self.assertEqual(timed.current()[1], 0.0)
+
+    def test_continuity_bias_is_kept(self):
+        tracker = StreamingStageTracker(self.detector)
+        tracker.observe("Tell me more, what made you book this call?")
+        self.assertEqual(tracker.stage, "part_3_why_here")
+        # A weak part 4 signal is not enough to leave part 3 while part 3 keywords are in the window
+        self.assertEqual(tracker.observe("How long?")[0], "part_3_why_here")
+
+    def test_pending_text_counts_like_the_active_text_did(self):
+        tracker = StreamingStageTracker(self.detector)
+        for segment in ("Sure, sounds good.", "How long have you been there?"):
+            tracker.observe(segment)
+        tracked = tracker.current()
+        pending = "Honestly it's too expensive, I need to talk to my wife and think about it"
+
+        window = "Sure, sounds good. How long have you been there?"
+        expected = self.detector.detect(window + "\n" + pending, current_stage=tracked[0])
+        self.assertEqual(tracker.current(pending=pending), expected)
+        self.assertEqual(expected[0], "objection_handling")
+        self.assertEqual(tracker.current(), tracked, "Pending text does not enter the window")
+
+    def test_observe_waits_for_a_read_in_progress(self):
+        tracker = StreamingStageTracker(self.detector)
+        observed = threading.Event()
+
+        with tracker._lock:  # a read on the worker thread
+            thread = threading.Thread(target=lambda: (tracker.observe("The investment is $3,500."), observed.set()))
+            thread.start()
+            self.assertFalse(observed.wait(0.05))
+        self.assertTrue(observed.wait(1))
+        thread.join()
+        self.assertEqual(tracker.current()[0], "part_12_close")
+
+
+class FakeStore:
+    def query(self, text, top_k=3, where=None):
+        return []
+
+
+class TestRetrieverUsesTracker(unittest.TestCase):
+    def test_retrieval_reads_tracked_stage_without_rescanning(self):
+        chunks = [{"id": "part_12_close", "text": "Close", "metadata": {"type": "script", "part_number": 12}}]
+        detector = StageDetector()
+        retriever = ScriptRetriever(FakeStore(), detector, chunks)
+        for segment in ("The investment is $3,500.", "Let's get started with the payment."):
+            retriever.observe_segment(segment)
+
+        calls = []
+        detector.detect = lambda *args, **kwargs: calls.append(args)
+        results = retriever.retrieve_with_metadata("Okay.", "unrelated context")
+
+        self.assertEqual(calls, [])
+        self.assertEqual(retriever.last_stage, "part_12_close")
+        self.assertEqual([r["id"] for r in results], ["part_12_close"])
+
+    def test_incomplete_objection_in_active_text_counts(self):
+        retriever = ScriptRetriever(FakeStore(), StageDetector(), [])
+        retriever.observe_segment("Sure, sounds good.")
+
+        retriever.retrieve_with_metadata(
+            "Sure, sounds good. Honestly it's too expensive, I need to talk to my wife", ""
+        )
+        self.assertEqual(retriever.last_stage, "objection_handling")
+        self.assertEqual(retriever.stage_tracker.current()[1], 0.0, "The incomplete segment is not observed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for content-driven summary scheduling.
+"""
+
+import json
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.summary_engine import SummaryEngine  # noqa: E402
+
+
+def make_engine(**kwargs) -> SummaryEngine:
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content=json.dumps({"summary": "ok", "stage_hint": "pitch"})))]
+    )
+    options = dict(interval=300, min_interval=60, min_new_lines=3, content_trigger_chars=200, jitter=0.0, adaptive=True)
+    options.update(kwargs)
+    engine = SummaryEngine(client=client, model="m", **options)
+    engine._running = True
+    engine._schedule_next = lambda: None
+    return engine
+
+
+def age(engine: SummaryEngine, seconds: float) -> None:
+    engine._last_summary_time = time.time() - seconds
+
+
+class TestAdaptiveSummaryScheduling(unittest.TestCase):
+    def test_nothing_runs_before_min_interval(self):
+        engine = make_engine()
+        age(engine, 30)
+        engine.add_transcript("x" * 500)
+        self.assertIsNone(engine._due_reason())
+
+    def test_content_volume_fires_early(self):
+        engine = make_engine()
+        age(engine, 90)
+        engine.add_transcript("Prospect: " + "we keep losing deployments to config drift " * 6)
+        engine._on_timer()
+
+        self.assertEqual(engine.runs_by_reason["content"], 1)
+        self.assertEqual(engine.summary_version, 1)
+
+    def test_stage_change_fires_early(self):
+        engine = make_engine()
+        engine.note_stage("problem_development")
+        engine.add_transcript("Rep: Let me walk you through the program.")
+        age(engine, 90)
+        self.assertIsNone(engine._due_reason())
+
+        engine.note_stage("pitch")
+        self.assertEqual(engine._due_reason(), "stage_change")
+
+    def test_tracked_stage_drives_stage_change(self):
+        from src.web.app import _stage_tracking
+
+        engine = make_engine()
+        analyzer = MagicMock()
+        analyzer.observe_segment.side_effect = [
+            {"stage": "part_9_pitch", "part_number": 9, "stage_hint": "pitch", "confidence": 0.7},
+            {"stage": "part_10_shut_up", "part_number": 10, "stage_hint": "pitch", "confidence": 0.6},
+        ]
+        on_new_segment = _stage_tracking(analyzer, lambda message: None, on_stage=engine.note_stage)
+        engine.add_transcript("Rep: Let me walk you through the program.")
+        age(engine, 90)
+
+        on_new_segment("Let me walk you through the program")
+        on_new_segment("So what do you think")
+        self.assertIsNone(engine._due_reason(), "Parts with the same stage_hint are not a stage change")
+
+        engine.note_stage("close")
+        self.assertEqual(engine._due_reason(), "stage_change")
+
+    def test_max_interval_skips_when_too_few_new_lines(self):
+        engine = make_engine()
+        engine.add_transcript("Prospect: Yeah.")
+        age(engine, 301)
+        engine._on_timer()
+
+        self.assertEqual(engine.skipped_runs, 1)
+        self.assertEqual(engine.summary_version, 0)
+        self.assertGreater(engine.time_until_next(), 290, "A skipped run starts a new window")
+
+    def test_max_interval_runs_with_enough_lines(self):
+        engine = make_engine()
+        for line in ("Prospect: One.", "Prospect: Two.", "Prospect: Three."):
+            engine.add_transcript(line)
+        age(engine, 301)
+        self.assertEqual(engine._due_reason(), "max_interval")
+
+    def test_jitter_spreads_max_interval_across_sessions(self):
+        intervals = {round(make_engine(jitter=0.1)._current_max_interval, 3) for _ in range(20)}
+        self.assertGreater(len(intervals), 1)
+        self.assertTrue(all(270 <= i <= 330 for i in intervals))
+
+
+if __name__ == "__main__":
+    unittest.main()
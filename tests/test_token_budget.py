@@ -0,0 +1,88 @@
+"""
+Tests for token-budgeted prompt assembly.
+
+Prompt size must stay bounded per provider: transcript context is trimmed
+oldest-first, retrieved sections are kept in relevance order within budget.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.realtime.token_budget import (  # noqa: E402
+    TokenBudget,
+    estimate_tokens,
+    get_token_budget,
+    trim_oldest,
+)
+
+
+class TestTokenEstimation(unittest.TestCase):
+    def test_estimate_scales_with_length(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertLess(estimate_tokens("short"), estimate_tokens("a much longer sentence " * 20))
+
+    def test_trim_oldest_keeps_most_recent_lines(self):
+        transcript = "\n".join(f"line {i} with some words in it" for i in range(200))
+        trimmed = trim_oldest(transcript, 50)
+
+        self.assertLessEqual(estimate_tokens(trimmed), 50)
+        self.assertTrue(trimmed.endswith("line 199 with some words in it"))
+        self.assertNotIn("line 0 ", trimmed)
+        self.assertTrue(trimmed.startswith("line "), "Cut must land on a line boundary")
+
+    def test_text_within_budget_is_unchanged(self):
+        self.assertEqual(trim_oldest("hello there", 100), "hello there")
+
+
+class TestTokenBudget(unittest.TestCase):
+    def test_fit_sections_keeps_relevance_order_within_budget(self):
+        budget = TokenBudget(rag_sections=300)
+        sections = ["first " * 100, "second " * 100, "third " * 100]
+
+        kept = budget.fit_sections(sections)
+
+        self.assertTrue(kept[0].startswith("first"))
+        self.assertLessEqual(sum(estimate_tokens(s) for s in kept), 300)
+        self.assertFalse(any(s.startswith("third") for s in kept))
+
+    def test_fit_sections_respects_system_prompt_headroom(self):
+        budget = TokenBudget(system_prompt=1000, rag_sections=800)
+        kept = budget.fit_sections(["word " * 400], static_prompt_tokens=950)
+        self.assertEqual(kept, [], "No room left after the static prompt")
+
+    def test_provider_budget_with_env_override(self):
+        self.assertLess(get_token_budget("local").context, get_token_budget("openai").context)
+        with patch.dict(os.environ, {"TOKEN_BUDGET_CONTEXT": "123"}):
+            self.assertEqual(get_token_budget("openai").context, 123)
+
+
+class TestAnalyzerUsesBudget(unittest.TestCase):
+    @patch.dict(os.environ, {"USE_RAG": "false"}, clear=False)
+    def test_analyze_trims_oldest_context(self):
+        from src.realtime.analysis_orchestrator import StreamingAnalyzer
+
+        chunk = MagicMock()
+        chunk.choices = [MagicMock(delta=MagicMock(content='{"suggestion": "Ask"}'))]
+        analyzer = StreamingAnalyzer(
+            api_key="test", base_url="http://fake", model="m", token_budget=TokenBudget(context=40)
+        )
+        analyzer.client = MagicMock()
+        analyzer.client.chat.completions.create.return_value = iter([chunk])
+
+        context = " ".join(f"OLD{i}" for i in range(500)) + " most recent context"
+        analyzer.analyze("latest words", context)
+
+        user_message = analyzer.client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        self.assertIn("most recent context", user_message)
+        self.assertNotIn("OLD0 ", user_message)
+        self.assertIn("latest words", user_message)
+
+
+if __name__ == "__main__":
+    unittest.main()